@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  BenchProfiles.py
+#
+#  Synthetic profiles shared by the benchmarks. Needs neither FreeCAD nor the
+#  workbench modules, so that every benchmark can import it headless.
+#
+###################################################################################
+
+import math
+
+def nacaPoints(nbpts, thickness = 0.12, camber = 0.02, camberpos = 0.4):
+	''' NACA 4 digits coordinates in Selig order, cosine spaced '''
+	half = int(nbpts / 2) + 1
+	upper = []
+	lower = []
+	for i in range(half):
+		x = (1 - math.cos(math.pi * i / (half - 1))) / 2
+		yt = 5 * thickness * (0.2969 * math.sqrt(x) - 0.1260 * x - 0.3516 * x**2 + 0.2843 * x**3 - 0.1015 * x**4)
+		if x < camberpos:
+			yc = camber / camberpos**2 * (2 * camberpos * x - x**2)
+		else:
+			yc = camber / (1 - camberpos)**2 * (1 - 2 * camberpos + 2 * camberpos * x - x**2)
+		upper.append((x, yc + yt))
+		lower.append((x, yc - yt))
+	return upper[::-1] + lower[1:]
+
+def writeProfile(filename, pts, name = "SYNTHETIC"):
+	afile = open(filename, 'w')
+	afile.write(name + "\n")
+	for x, y in pts:
+		afile.write("  %.6f  %.6f\n" % (x, y))
+	afile.close()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  ParserBench.py
+#
+#  Benchmark of the airfoil .dat parser against the former regex getPoints
+#  Run it from a shell with: freecadcmd Benchmarks/ParserBench.py
+#  (python Benchmarks/ParserBench.py runs it on the Stubs stand-in)
+#  or from the FreeCAD python console, with Benchmarks in sys.path:
+#      import ParserBench; ParserBench.run()
+#
+###################################################################################
+
+import os, sys, re, time, tempfile, shutil
+
+__dir__ = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(__dir__))
+
+try:
+	import FreeCAD
+	StandIn = False
+except ImportError:
+	import Stubs
+	Stubs.install(True)
+	import FreeCAD
+	StandIn = True
+import WingLib
+from BenchProfiles import nacaPoints, writeProfile
+
+def legacyGetPoints(filename):
+	''' getPoints as it was before the one pass parser, kept as reference '''
+	regex = re.compile(r'^\s*(?P<xval>(\-|\d*)\.\d+(E\-?\d+)?)\,?\s*(?P<yval>\-?\s*\d*\.\d+(E\-?\d+)?)\s*$')
+	afile = open(filename,'r')
+	afile.readline().strip()
+	coords=[]
+	for lin in afile:
+		curdat = regex.match(lin)
+		if curdat != None:
+			x = float(curdat.group("xval"))
+			y = float(curdat.group("yval"))
+			coords.append(FreeCAD.Vector(x,y,0))
+	afile.close()
+	return coords
+
+def makeProfileSet(directory, nbfiles = 200, nbpts = 400):
+	files = []
+	for i in range(nbfiles):
+		filename = os.path.join(directory, "naca_%04d.dat" % i)
+		writeProfile(filename, nacaPoints(nbpts, 0.06 + 0.10 * i / nbfiles), "NACA synthetic %d" % i)
+		files.append(filename)
+	return files
+
+def timeit(func, files, repeat = 3):
+	best = None
+	for r in range(repeat):
+		t0 = time.time()
+		for f in files:
+			func(f)
+		dt = time.time() - t0
+		if best is None or dt < best:
+			best = dt
+	return best
+
+def run(nbfiles = 200, nbpts = 400):
+	directory = tempfile.mkdtemp(prefix = "wingbench")
+	try:
+		files = makeProfileSet(directory, nbfiles, nbpts)
+		# both parsers must agree before comparing their speed
+		for f in files[:5]:
+			ref = legacyGetPoints(f)
+			new = WingLib.getPoints(f)
+			assert len(ref) == len(new)
+			assert max((a.sub(b)).Length for a, b in zip(ref, new)) < 1e-12
+		results = [("legacy regex getPoints", timeit(legacyGetPoints, files)),
+					("readProfile (array only)", timeit(WingLib.readProfile, files)),
+					("getPoints (array + vectors)", timeit(WingLib.getPoints, files))]
+		ref = results[0][1]
+		WingLib.userMsg("%d profiles of %d points" % (nbfiles, nbpts))
+		for name, dt in results:
+			WingLib.userMsg("  %-30s %8.1f ms  x%.1f" % (name, dt * 1000, ref / dt))
+		return results
+	finally:
+		shutil.rmtree(directory)
+
+if __name__ == "__main__":
+	if StandIn: FreeCAD.Console.Echo = True
+	run()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  ResampleBench.py
+#
+#  Loft and slice times of a wing built from the points of the file against
+#  the same wing built from resampled profiles and from BSpline profiles
+#  Run it from a shell with: freecadcmd Benchmarks/ResampleBench.py
+#  (python Benchmarks/ResampleBench.py runs it on the Stubs stand-in)
+#  or from the FreeCAD python console, with Benchmarks in sys.path:
+#      import ResampleBench; ResampleBench.run()
+#
+###################################################################################
+
+import os, sys, time
+
+__dir__ = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(__dir__))
+
+import numpy
+try:
+	import FreeCAD
+	StandIn = False
+except ImportError:
+	import Stubs
+	Stubs.install(True)
+	import FreeCAD
+	StandIn = True
+import Part
+import WingLib
+from BenchProfiles import nacaPoints
+
+def makeWire(coords, scale, offset, wtype = "Polygon", tolerance = 0.0):
+	points = [FreeCAD.Vector(x * scale, y * scale, 0).add(offset) for x, y in coords]
+	if wtype == "Polygon":
+		return Part.makePolygon(points, True), 0.0
+	wire, error = WingLib.makeProfileBSpline(points, tolerance * scale, wtype == "PeriodicBSpline")
+	return wire, error / scale
+
+def loftTimes(rwire, twire, repeat = 3):
+	''' Best times of the loft between root and tip wires, and of 10 slices of that loft '''
+	tloft = tslice = None
+	for r in range(repeat):
+		t0 = time.time()
+		loft = Part.makeLoft([rwire, twire], True, False)
+		dt = time.time() - t0
+		tloft = dt if tloft is None or dt < tloft else tloft
+		t0 = time.time()
+		for i in range(10):
+			loft.slice(FreeCAD.Vector(0, 0, 1), 25.0 + 45.0 * i)
+		dt = time.time() - t0
+		tslice = dt if tslice is None or dt < tslice else tslice
+	return tloft, tslice
+
+def run(nbpts = 400, tolerance = 0.0002):
+	root = numpy.round(numpy.array(nacaPoints(nbpts, 0.12, 0.02)), 6)
+	tip = numpy.round(numpy.array(nacaPoints(nbpts, 0.09, 0.0)), 6)
+	cases = [("file points", root, tip, "Polygon")]
+	for spacing in WingLib.ResampleSpacings:
+		r = WingLib.resampleProfile(root, 0, tolerance, spacing)
+		t = WingLib.resampleProfile(tip, len(r), 0, spacing)
+		cases.append((spacing.lower() + " resampled", r, t, "Polygon"))
+	cases.append(("bspline", root, tip, "BSpline"))
+	results = []
+	WingLib.userMsg("Wing of %d points profiles, resampling and fit tolerance %g of chord" % (len(root), tolerance))
+	for name, r, t, wtype in cases:
+		rwire, err = makeWire(r, 300, FreeCAD.Vector(0, 0, 0), wtype, tolerance)
+		twire = makeWire(t, 150, FreeCAD.Vector(50, 0, 500), wtype, tolerance)[0]
+		if wtype == "Polygon":
+			err = WingLib.chordError(root, r)
+		tloft, tslice = loftTimes(rwire, twire)
+		results.append((name, len(rwire.Edges), err, tloft, tslice))
+		WingLib.userMsg("  %-20s %4d edges  error %.2e  loft %8.1f ms  10 slices %8.1f ms  x%.1f" % (name, len(rwire.Edges), err, tloft * 1000, tslice * 1000, results[0][3] / tloft))
+	return results
+
+if __name__ == "__main__":
+	if StandIn: FreeCAD.Console.Echo = True
+	run()
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  WingBench.py
+#
+#  Benchmark suite of the WingLib functions and the feature recompute paths,
+#  on generated profiles of 50 to 2000 points. Results are written to a JSON file
+#  that can be compared with the one of another revision:
+#      freecadcmd Benchmarks/WingBench.py
+#      python Benchmarks/WingBench.py --output new.json --compare old.json --threshold 0.15
+#  Without FreeCAD, the Stubs stand-in is used: its times are the ones of its pure
+#  Python geometry, not of OCC, so results are only compared with a baseline of the
+#  same FreeCAD version, or of the stand-in, unless --force.
+#  From the FreeCAD python console, with Benchmarks in sys.path:
+#      import WingBench; WingBench.run()
+#
+###################################################################################
+
+import os, sys, time, json, platform, tempfile, shutil, subprocess
+
+__dir__ = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(__dir__))
+
+try:
+	import FreeCAD
+	StandIn = False
+except ImportError:
+	import Stubs
+	Stubs.install(True)
+	import FreeCAD
+	StandIn = True
+import numpy
+import Draft
+import WingCore, WingLib, WingLog, Wing
+from BenchProfiles import nacaPoints, writeProfile
+
+PointCounts = [50, 200, 800, 2000]
+Threshold = 0.10   # relative slow down reported as a regression
+MinTime = 0.2   # minimal time of each measure, in seconds
+
+def timeCall(func, setup = None, repeat = 5, mintime = MinTime):
+	''' Best and median time of one call of func, over repeat measures of enough calls to last mintime.
+	setup is called before each call, out of the measure. '''
+	number = 1
+	while True:
+		t = 0.0
+		for i in range(number):
+			if setup: setup()
+			t0 = time.time()
+			func()
+			t += time.time() - t0
+		if t >= mintime / repeat or number >= 100000:
+			break
+		number *= 10 if t == 0 else max(2, min(10, int(mintime / repeat / t) + 1))
+	times = [t / number]
+	for r in range(repeat - 1):
+		t = 0.0
+		for i in range(number):
+			if setup: setup()
+			t0 = time.time()
+			func()
+			t += time.time() - t0
+		times.append(t / number)
+	times.sort()
+	return {"best" : times[0], "median" : times[len(times) // 2], "number" : number}
+
+class WrapSettings:
+	''' Settings of WrapLeadingEdge read by calculateWrapPoints '''
+	Inward = True
+	Thickness = 1.5
+	Join = "Miter"
+
+def makeProfileWire(coords, scale, z):
+	points = [FreeCAD.Vector(x * scale, y * scale, z) for x, y in coords]
+	wire = Draft.makeWire(points, True, False)
+	FreeCAD.ActiveDocument.recompute()
+	return wire
+
+def loopyPoints(wire, thickness):
+	''' Leading edge wrap offset vertex by vertex along the curve vectors, with loops at the nose '''
+	data = WingLib.wireData(wire)
+	le = data.leadingEdge()
+	half = max(10, int(len(data) / 20))
+	base = data.points[le - half:le + half + 1]
+	offset = base + WingCore.normalizedRows(data.curves("Previous")[le - half:le + half + 1]) * thickness
+	return [WingLib.toVector(p) for p in numpy.concatenate((base, offset[::-1]))]
+
+def benchCases(doc, directory, nbpts):
+	''' Return the list of (name, func, setup) of the cases for profiles of nbpts points '''
+	root = nacaPoints(nbpts, 0.12, 0.02)
+	tip = nacaPoints(nbpts, 0.09, 0.0)
+	filename = os.path.join(directory, "bench%d.dat" % nbpts)
+	writeProfile(filename, root)
+	rwire = makeProfileWire(root, 300, 0)
+	twire = makeProfileWire(tip, 200, 500)
+	nb = len(root)
+	le = WingLib.wireData(rwire).leadingEdge()
+	values = list(numpy.linspace(0.5, nb - 1.5, 100))
+	cases = []
+
+	def getPoints():
+		WingCore.profileCache.clear()
+		WingLib.getPoints(filename)
+	cases.append(("getPoints", getPoints, None))
+	cases.append(("getPoints cached", lambda: WingLib.getPoints(filename), None))
+	cases.append(("DiscretizedPoint x100", lambda: [WingLib.DiscretizedPoint(rwire, v) for v in values], None))
+	cases.append(("cutWire", lambda: WingLib.cutWire(rwire, nb / 4 + 0.3, 3 * nb / 4 + 0.6, "Both"), None))
+
+	wrap = Wing.WrapLeadingEdge.__new__(Wing.WrapLeadingEdge)
+	start, end = le - nb / 20 - 0.5, le + nb / 20 + 0.5
+	cases.append(("calculateWrapPoints", lambda: wrap.calculateWrapPoints(WrapSettings, rwire, start, end), None))
+
+	loops = Draft.makeWire(loopyPoints(rwire, 12.0), True, False)
+	points = loops.Points
+	def resetLoops():
+		loops.Points = points
+	cases.append(("DeleteLoop", lambda: WingLib.DeleteLoop(loops), resetLoops))
+
+	ledge = doc.addObject("App::FeaturePython", "LeadingEdge")
+	Wing.LeadingEdge(ledge)
+	ledge.RootWire = rwire
+	ledge.TipWire = twire
+	ledge.RootStartPoint = le - nb / 10
+	ledge.RootEndPoint = le + nb / 10
+	ledge.TipStartPoint = le - nb / 10
+	cases.append(("calculateTipEndPoint", lambda: ledge.Proxy.calculateTipEndPoint(ledge), None))
+
+	rod = doc.addObject("App::FeaturePython", "Rod")
+	Wing.Rod(rod)
+	rod.CoordSystem = doc.addObject("Part::Cylinder", "RodCylinder")
+	rod.RootWire = rwire
+	rod.TipWire = twire
+	rod.RootPoint = le + nb / 5 + 0.5
+	rod.TipPoint = le + nb / 5 + 0.5
+	cases.append(("Rod.updatePosition", lambda: rod.Proxy.updatePosition(rod), None))
+	return cases
+
+def revision():
+	try:
+		return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd = __dir__, stderr = subprocess.STDOUT).decode().strip()
+	except (OSError, subprocess.CalledProcessError):
+		return ""
+
+def measure(counts = PointCounts, mintime = MinTime):
+	''' Run all the cases for each point count, return the results dictionary '''
+	level = WingLog.setLevel(WingLog.Warning)   # console messages would be measured too
+	directory = tempfile.mkdtemp(prefix = "wingbench")
+	results = {}
+	try:
+		for nbpts in counts:
+			doc = FreeCAD.newDocument("WingBench%d" % nbpts)
+			for name, func, setup in benchCases(doc, directory, nbpts):
+				key = "%s/%d" % (name, nbpts)
+				results[key] = timeCall(func, setup, mintime = mintime)
+				results[key].update({"case" : name, "points" : nbpts})
+			FreeCAD.closeDocument(doc.Name)
+	finally:
+		shutil.rmtree(directory)
+		WingLog.setLevel(level)
+	version = "stand-in" if StandIn else ".".join(FreeCAD.Version()[:3])
+	meta = {"revision" : revision(), "date" : time.strftime("%Y-%m-%d %H:%M:%S"), "python" : platform.python_version(),
+			"numpy" : numpy.__version__, "freecad" : version, "machine" : platform.machine(), "system" : platform.system()}
+	return {"meta" : meta, "results" : results}
+
+def compare(baseline, current, threshold = Threshold, force = False):
+	''' Report lines of the cases of current against baseline, and the number of regressions:
+	cases slower than baseline by more than threshold, on their best times.
+	Results of another FreeCAD version, or of the stand-in against FreeCAD, time different geometry
+	code: they aren't compared unless force, the number of regressions is None then. '''
+	lines = []
+	versions = (baseline["meta"].get("freecad"), current["meta"].get("freecad"))
+	if versions[0] != versions[1]:
+		lines.append("Baseline measured with FreeCAD %s, current with FreeCAD %s" % versions)
+		if not force:
+			lines.append("Results not compared, use --force to compare them anyway")
+			return lines, None
+	lines.append("%-28s %6s %12s %12s %8s" % ("case", "points", "baseline ms", "current ms", "ratio"))
+	regressions = 0
+	base = baseline["results"]
+	for key in sorted(current["results"], key = lambda k: (current["results"][k]["case"], current["results"][k]["points"])):
+		cur = current["results"][key]
+		if key not in base:
+			lines.append("%-28s %6d %12s %12.3f %8s" % (cur["case"], cur["points"], "-", cur["best"] * 1000, "new"))
+			continue
+		ratio = cur["best"] / base[key]["best"] if base[key]["best"] > 0 else 1.0
+		flag = ""
+		if ratio > 1 + threshold:
+			flag = "  REGRESSION"
+			regressions += 1
+		elif ratio < 1 - threshold:
+			flag = "  faster"
+		lines.append("%-28s %6d %12.3f %12.3f %8.2f%s" % (cur["case"], cur["points"], base[key]["best"] * 1000, cur["best"] * 1000, ratio, flag))
+	lines.append("%d regression(s) over %d%%, baseline %s, current %s" % (regressions, threshold * 100, baseline["meta"].get("revision", ""), current["meta"].get("revision", "")))
+	return lines, regressions
+
+def report(results):
+	lines = ["%-28s %6s %12s %12s" % ("case", "points", "best ms", "median ms")]
+	for key in sorted(results["results"], key = lambda k: (results["results"][k]["case"], results["results"][k]["points"])):
+		r = results["results"][key]
+		lines.append("%-28s %6d %12.3f %12.3f" % (r["case"], r["points"], r["best"] * 1000, r["median"] * 1000))
+	return lines
+
+def run(output = None, baseline = None, threshold = Threshold, counts = PointCounts, mintime = MinTime, force = False):
+	''' Measure, print the report, write the results to output and compare them with the baseline file.
+	Return the results and the number of regressions, None if the baseline couldn't be compared. '''
+	results = measure(counts, mintime)
+	for line in report(results):
+		WingLib.userMsg(line)
+	if output:
+		afile = open(output, "w")
+		try:
+			json.dump(results, afile, indent = 1, sort_keys = True)
+		finally:
+			afile.close()
+		WingLib.userMsg("Results written to " + output)
+	regressions = 0
+	if baseline:
+		afile = open(baseline, "r")
+		try:
+			base = json.load(afile)
+		finally:
+			afile.close()
+		lines, regressions = compare(base, results, threshold, force)
+		for line in lines:
+			WingLib.userMsg(line)
+	return results, regressions
+
+def main(args):
+	import argparse
+	parser = argparse.ArgumentParser(description = "Wing workbench benchmarks")
+	parser.add_argument("--output", default = "wingbench.json", help = "JSON file of the results")
+	parser.add_argument("--compare", default = None, help = "JSON file of the baseline results")
+	parser.add_argument("--threshold", type = float, default = Threshold, help = "relative slow down reported as a regression")
+	parser.add_argument("--points", default = ",".join(str(n) for n in PointCounts), help = "comma separated point counts of the profiles")
+	parser.add_argument("--mintime", type = float, default = MinTime, help = "minimal time of each measure in seconds")
+	parser.add_argument("--force", action = "store_true", help = "compare with a baseline of another FreeCAD version or of the stand-in")
+	opts = parser.parse_args(args)
+	if StandIn: FreeCAD.Console.Echo = True
+	counts = [int(n) for n in opts.points.split(",")]
+	results, regressions = run(opts.output, opts.compare, opts.threshold, counts, opts.mintime, opts.force)
+	if regressions is None:
+		return 2
+	return 1 if regressions > 0 else 0
+
+if __name__ == "__main__":
+	# freecadcmd passes its own arguments, only the ones after the script name are read
+	args = sys.argv[sys.argv.index(__file__) + 1:] if __file__ in sys.argv else sys.argv[1:]
+	sys.exit(main(args))
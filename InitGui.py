@@ -78,6 +78,7 @@ class _CommandWing():
 if FreeCAD.GuiUp:
 	FreeCADGui.addCommand('Wing_ImportProfil',_CommandWing("Profile",'ImportProfile-icon.svg',"Wing.createProfile()","Wing"))
 	FreeCADGui.addCommand('Wing_Wing',_CommandWing("Wing",'Aile-icon.svg',"Wing.createWing()","Wing"))
+	FreeCADGui.addCommand('Wing_StationWing',_CommandWing("StationWing",'Aile-icon.svg',"Wing.createStationWing()","Wing"))
 	FreeCADGui.addCommand('Wing_CoordSys',_CommandWing("Axis",'WF_Axes.svg',"Wing.createCoordSys()","Wing"))
 #	FreeCADGui.addCommand('Wing_Nervures',_CommandWing("Nervures",'Nervures-icon.svg',"Nervures.createNervures()","Nervures"))
 	FreeCADGui.addCommand('Wing_Rod',_CommandWing("Rod",'Rod-icon.svg',"Wing.createRod()","Wing"))
@@ -99,9 +100,9 @@ class WingWorkbench(Workbench):
 
 	def Initialize(self):
 		"This function is executed when FreeCAD starts"
-		self.appendToolbar("Wing", ["Wing_ImportProfil", "Wing_Wing", "Wing_CoordSys", "Wing_Rod",
+		self.appendToolbar("Wing", ["Wing_ImportProfil", "Wing_Wing", "Wing_StationWing", "Wing_CoordSys", "Wing_Rod",
 							"Wing_WrapLeadingEdge", 'Wing_LeadingEdge', "Wing_CutWire", "Wing_Section", 'WingDialog', "SectionsDialog", "RecomputeSelection"])
-		self.appendMenu("Wing", ["Wing_ImportProfil", "Wing_Wing", "Wing_CoordSys", "Wing_Rod",
+		self.appendMenu("Wing", ["Wing_ImportProfil", "Wing_Wing", "Wing_StationWing", "Wing_CoordSys", "Wing_Rod",
 							"Wing_WrapLeadingEdge", 'Wing_LeadingEdge', "Wing_CutWire", "Wing_Section", 'WingDialog', "SectionsDialog", "RecomputeSelection"])
 		Log ("Loading Wing module done")
 
@@ -0,0 +1,66 @@
+'''Draft wires and points of the FreeCAD stand-in'''
+
+import FreeCAD, Part
+from FreeCAD import Vector
+
+
+class _Wire:
+	'''Proxy of the Draft wire: the shape is built from Points on recompute'''
+
+	def __init__(self, obj):
+		obj.addProperty("App::PropertyVectorList", "Points", "Draft", "The vertices of the wire")
+		obj.addProperty("App::PropertyBool", "Closed", "Draft", "If the wire is closed or not")
+		obj.addProperty("App::PropertyBool", "MakeFace", "Draft", "Create a face if this object is closed")
+		obj.addProperty("App::PropertyVector", "Start", "Draft", "The start point of this line")
+		obj.addProperty("App::PropertyVector", "End", "Draft", "The end point of this line")
+		obj.Proxy = self
+		self.Type = "Wire"
+
+	def execute(self, obj):
+		plm = obj.Placement
+		if len(obj.Points) > 1:
+			obj.Shape = Part.makePolygon(obj.Points, obj.Closed)
+		obj.Placement = plm
+		obj.purgeTouched()
+
+	def onChanged(self, obj, prop):
+		if prop == "Points" and len(obj.Points) > 0:
+			# Start and End follow the points without triggering a change
+			obj._props["Start"] = obj.Points[0]
+			obj._props["End"] = obj.Points[-1]
+
+
+class _Point:
+
+	def __init__(self, obj, x = 0, y = 0, z = 0):
+		obj.addProperty("App::PropertyDistance", "X", "Draft", "X Location").X = x
+		obj.addProperty("App::PropertyDistance", "Y", "Draft", "Y Location").Y = y
+		obj.addProperty("App::PropertyDistance", "Z", "Draft", "Z Location").Z = z
+		obj.Proxy = self
+		self.Type = "Point"
+
+	def execute(self, obj):
+		obj.Shape = Part.Vertex(Vector(obj.X, obj.Y, obj.Z))
+
+
+def makeWire(pointslist, closed = False, placement = None, face = None, support = None):
+	if hasattr(pointslist, "Vertexes"):
+		closed = pointslist.isClosed()
+		pointslist = [v.Point for v in pointslist.Vertexes]
+	obj = FreeCAD.ActiveDocument.addObject("Part::Part2DObjectPython", "DWire")
+	_Wire(obj)
+	obj.Points = pointslist
+	obj.Closed = closed
+	if placement:
+		obj.Placement = placement
+	obj.Proxy.execute(obj)
+	return obj
+
+
+def makePoint(X = 0, Y = 0, Z = 0, color = None, name = "Point", point_size = 5):
+	if isinstance(X, Vector):
+		X, Y, Z = X.x, X.y, X.z
+	obj = FreeCAD.ActiveDocument.addObject("Part::FeaturePython", name)
+	_Point(obj, X, Y, Z)
+	obj.Proxy.execute(obj)
+	return obj
@@ -0,0 +1,486 @@
+'''Minimal stand-in of the FreeCAD application module.
+
+Only the subset used by the Wing workbench is emulated: Vector, Rotation,
+Placement, Matrix, Console, parameters and a document holding python
+feature objects with addProperty / onChanged / execute.
+'''
+
+import math
+
+GuiUp = False
+_config = {"UserHomePath": "/tmp", "UserAppData": "/tmp"}
+
+
+def ConfigGet(name):
+	return _config.get(name, "")
+
+
+class _Console:
+
+	def __init__(self):
+		self.Echo = False
+		self.Messages = []
+
+	def _print(self, kind, message):
+		self.Messages.append((kind, message))
+		if self.Echo:
+			print(message.rstrip("\n"))
+
+	def PrintMessage(self, message):
+		self._print("Message", message)
+
+	def PrintWarning(self, message):
+		self._print("Warning", message)
+
+	def PrintError(self, message):
+		self._print("Error", message)
+
+	def PrintLog(self, message):
+		self._print("Log", message)
+
+Console = _Console()
+
+
+class _ParameterGroup:
+
+	def __init__(self):
+		self._values = {}
+		self._groups = {}
+
+	def GetGroup(self, name):
+		return self._groups.setdefault(name, _ParameterGroup())
+
+	def _get(self, name, default):
+		return self._values.get(name, default)
+
+	def _set(self, name, value):
+		self._values[name] = value
+
+	def GetBool(self, name, default = False):
+		return self._get(name, default)
+
+	def GetInt(self, name, default = 0):
+		return self._get(name, default)
+
+	def GetFloat(self, name, default = 0.0):
+		return self._get(name, default)
+
+	def GetString(self, name, default = ""):
+		return self._get(name, default)
+
+	SetBool = SetInt = SetFloat = SetString = _set
+
+_parameters = {}
+
+
+def ParamGet(path):
+	return _parameters.setdefault(path, _ParameterGroup())
+
+
+#############################
+# Vector, Rotation, Placement, Matrix
+#############################
+
+class Vector(object):
+
+	__slots__ = ("x", "y", "z")
+
+	def __init__(self, x = 0.0, y = 0.0, z = 0.0):
+		if isinstance(x, (Vector, tuple, list)):
+			x, y, z = x[0], x[1], x[2]
+		self.x = float(x)
+		self.y = float(y)
+		self.z = float(z)
+
+	def __getitem__(self, i):
+		return (self.x, self.y, self.z)[i]
+
+	def __setitem__(self, i, value):
+		setattr(self, "xyz"[i], float(value))
+
+	def __len__(self):
+		return 3
+
+	def __iter__(self):
+		return iter((self.x, self.y, self.z))
+
+	def __repr__(self):
+		return "Vector (%s, %s, %s)" % (self.x, self.y, self.z)
+
+	__str__ = __repr__
+
+	def __format__(self, spec):
+		return repr(self)
+
+	def __eq__(self, other):
+		if not isinstance(other, Vector):
+			return False
+		eps = 2.220446049250313e-16
+		return abs(self.x - other.x) <= eps and abs(self.y - other.y) <= eps and abs(self.z - other.z) <= eps
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	__hash__ = None
+
+	def __add__(self, other):
+		return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+	def __sub__(self, other):
+		return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+	def __neg__(self):
+		return Vector(-self.x, -self.y, -self.z)
+
+	def __mul__(self, other):
+		if isinstance(other, Vector):
+			return self.dot(other)
+		return Vector(self.x * other, self.y * other, self.z * other)
+
+	__rmul__ = __mul__
+
+	def __truediv__(self, other):
+		return Vector(self.x / other, self.y / other, self.z / other)
+
+	__div__ = __truediv__
+
+	def add(self, other):
+		return self.__add__(other)
+
+	def sub(self, other):
+		return self.__sub__(other)
+
+	def negative(self):
+		return self.__neg__()
+
+	def multiply(self, factor):
+		self.x *= factor
+		self.y *= factor
+		self.z *= factor
+		return self
+
+	def scale(self, x, y, z):
+		self.x *= x
+		self.y *= y
+		self.z *= z
+		return self
+
+	def dot(self, other):
+		return self.x * other.x + self.y * other.y + self.z * other.z
+
+	def cross(self, other):
+		return Vector(self.y * other.z - self.z * other.y,
+					self.z * other.x - self.x * other.z,
+					self.x * other.y - self.y * other.x)
+
+	def _getLength(self):
+		return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+	def _setLength(self, value):
+		length = self._getLength()
+		if length > 0:
+			self.multiply(value / length)
+
+	Length = property(_getLength, _setLength)
+
+	def normalize(self):
+		length = self._getLength()
+		if length > 0:
+			self.multiply(1.0 / length)
+		return self
+
+	def distanceToPoint(self, other):
+		return (self - other).Length
+
+	def getAngle(self, other):
+		den = self.Length * other.Length
+		if den == 0:
+			return 0.0
+		return math.acos(max(-1.0, min(1.0, self.dot(other) / den)))
+
+	def projectToPlane(self, base, normal):
+		n = Vector(normal).normalize()
+		d = (self - base).dot(n)
+		self.x -= d * n.x
+		self.y -= d * n.y
+		self.z -= d * n.z
+		return self
+
+	def isEqual(self, other, tol):
+		return (self - other).Length <= tol
+
+
+class Matrix(object):
+
+	def __init__(self, *args):
+		if len(args) == 16:
+			vals = [float(a) for a in args]
+			self.A = [vals[0:4], vals[4:8], vals[8:12], vals[12:16]]
+		elif len(args) == 1 and isinstance(args[0], Matrix):
+			self.A = [list(r) for r in args[0].A]
+		else:
+			self.A = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+	def scale(self, x, y = None, z = None):
+		if isinstance(x, Vector):
+			x, y, z = x.x, x.y, x.z
+		elif y is None:
+			y = z = x
+		s = (x, y, z)
+		for i in range(3):
+			for j in range(4):
+				self.A[i][j] *= s[i]
+		return self
+
+	def move(self, v):
+		self.A[0][3] += v.x
+		self.A[1][3] += v.y
+		self.A[2][3] += v.z
+		return self
+
+	def multiply(self, other):
+		if isinstance(other, Vector):
+			return self.multVec(other)
+		m = Matrix()
+		m.A = [[sum(self.A[i][k] * other.A[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+		return m
+
+	def multVec(self, v):
+		a = self.A
+		return Vector(a[0][0] * v.x + a[0][1] * v.y + a[0][2] * v.z + a[0][3],
+					a[1][0] * v.x + a[1][1] * v.y + a[1][2] * v.z + a[1][3],
+					a[2][0] * v.x + a[2][1] * v.y + a[2][2] * v.z + a[2][3])
+
+	def inverse(self):
+		# affine inverse of the 3x3 part and translation
+		a = self.A
+		m = [[a[i][j] for j in range(3)] for i in range(3)]
+		det = (m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
+			- m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+			+ m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0]))
+		inv = [[0.0] * 3 for i in range(3)]
+		for i in range(3):
+			for j in range(3):
+				r = [k for k in range(3) if k != j]
+				c = [k for k in range(3) if k != i]
+				minor = m[r[0]][c[0]] * m[r[1]][c[1]] - m[r[0]][c[1]] * m[r[1]][c[0]]
+				inv[i][j] = (-1) ** (i + j) * minor / det
+		res = Matrix()
+		for i in range(3):
+			res.A[i][:3] = inv[i]
+			res.A[i][3] = -sum(inv[i][k] * a[k][3] for k in range(3))
+		return res
+
+	def __mul__(self, other):
+		return self.multiply(other)
+
+
+class Rotation(object):
+	'''Rotation stored as a unit quaternion (x, y, z, w)'''
+
+	def __init__(self, *args):
+		self.Q = (0.0, 0.0, 0.0, 1.0)
+		if len(args) == 1 and isinstance(args[0], Rotation):
+			self.Q = args[0].Q
+		elif len(args) == 2 and isinstance(args[0], Vector) and isinstance(args[1], Vector):
+			self._fromTwoVectors(args[0], args[1])
+		elif len(args) == 2 and isinstance(args[0], Vector):
+			self._fromAxisAngle(args[0], math.radians(float(args[1])))
+		elif len(args) == 4:
+			self.Q = self._normalized(tuple(float(a) for a in args))
+		elif len(args) == 3:
+			# yaw, pitch, roll in degrees
+			r = Rotation(Vector(0, 0, 1), args[0]).multiply(Rotation(Vector(0, 1, 0), args[1])).multiply(Rotation(Vector(1, 0, 0), args[2]))
+			self.Q = r.Q
+
+	@staticmethod
+	def _normalized(q):
+		n = math.sqrt(sum(c * c for c in q))
+		if n == 0:
+			return (0.0, 0.0, 0.0, 1.0)
+		return tuple(c / n for c in q)
+
+	def _fromAxisAngle(self, axis, angle):
+		a = Vector(axis)
+		if a.Length == 0:
+			self.Q = (0.0, 0.0, 0.0, 1.0)
+			return
+		a.normalize()
+		s = math.sin(angle / 2)
+		self.Q = (a.x * s, a.y * s, a.z * s, math.cos(angle / 2))
+
+	def _fromTwoVectors(self, v1, v2):
+		a = Vector(v1).normalize()
+		b = Vector(v2).normalize()
+		if a.Length == 0 or b.Length == 0:
+			return
+		d = max(-1.0, min(1.0, a.dot(b)))
+		if d > 1 - 1e-15:
+			return
+		if d < -1 + 1e-15:
+			axis = a.cross(Vector(1, 0, 0))
+			if axis.Length < 1e-7:
+				axis = a.cross(Vector(0, 1, 0))
+			self._fromAxisAngle(axis, math.pi)
+			return
+		self._fromAxisAngle(a.cross(b), math.acos(d))
+
+	@property
+	def Axis(self):
+		x, y, z, w = self.Q
+		s = math.sqrt(max(0.0, 1 - w * w))
+		if s < 1e-15:
+			return Vector(0, 0, 1)
+		return Vector(x / s, y / s, z / s)
+
+	@property
+	def Angle(self):
+		return 2 * math.acos(max(-1.0, min(1.0, self.Q[3])))
+
+	def multiply(self, other):
+		x1, y1, z1, w1 = self.Q
+		x2, y2, z2, w2 = other.Q
+		r = Rotation()
+		r.Q = self._normalized((w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+								w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+								w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+								w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2))
+		return r
+
+	def inverted(self):
+		x, y, z, w = self.Q
+		r = Rotation()
+		r.Q = (-x, -y, -z, w)
+		return r
+
+	def multVec(self, v):
+		x, y, z, w = self.Q
+		u = Vector(x, y, z)
+		t = u.cross(v).multiply(2)
+		return v + t * w + u.cross(t)
+
+	def toMatrix(self):
+		ex = self.multVec(Vector(1, 0, 0))
+		ey = self.multVec(Vector(0, 1, 0))
+		ez = self.multVec(Vector(0, 0, 1))
+		return Matrix(ex.x, ey.x, ez.x, 0, ex.y, ey.y, ez.y, 0, ex.z, ey.z, ez.z, 0, 0, 0, 0, 1)
+
+	def isNull(self):
+		return self.Angle == 0
+
+	def __eq__(self, other):
+		return isinstance(other, Rotation) and all(abs(a - b) < 1e-12 for a, b in zip(self.Q, other.Q))
+
+	def __repr__(self):
+		return "Rotation (%s, %s, %s, %s)" % self.Q
+
+	__format__ = lambda self, spec: repr(self)
+
+
+class Placement(object):
+
+	def __init__(self, *args):
+		self.Base = Vector()
+		self.Rotation = Rotation()
+		if len(args) == 1 and isinstance(args[0], Placement):
+			self.Base = Vector(args[0].Base)
+			self.Rotation = Rotation(args[0].Rotation)
+		elif len(args) >= 2:
+			self.Base = Vector(args[0])
+			self.Rotation = Rotation(args[1])
+			if len(args) == 3:
+				# rotation around the center args[2]
+				center = Vector(args[2])
+				self.Base = self.Base + center - self.Rotation.multVec(center)
+
+	def __setattr__(self, name, value):
+		if name == "Base":
+			value = Vector(value)
+		elif name == "Rotation":
+			value = Rotation(value)
+		object.__setattr__(self, name, value)
+
+	def multiply(self, other):
+		return Placement(self.Base + self.Rotation.multVec(other.Base), self.Rotation.multiply(other.Rotation))
+
+	def multVec(self, v):
+		return self.Rotation.multVec(v) + self.Base
+
+	def inverse(self):
+		rinv = self.Rotation.inverted()
+		return Placement(rinv.multVec(self.Base).multiply(-1), rinv)
+
+	def move(self, v):
+		self.Base = self.Base + v
+
+	def copy(self):
+		return Placement(self)
+
+	def isIdentity(self):
+		return self.Base.Length == 0 and self.Rotation.Angle == 0
+
+	def toMatrix(self):
+		m = self.Rotation.toMatrix()
+		m.A[0][3], m.A[1][3], m.A[2][3] = self.Base.x, self.Base.y, self.Base.z
+		return m
+
+	def __eq__(self, other):
+		return isinstance(other, Placement) and self.Base == other.Base and self.Rotation == other.Rotation
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __repr__(self):
+		return "Placement [Pos=%r, Rot=%r]" % (self.Base, self.Rotation)
+
+	__format__ = lambda self, spec: repr(self)
+
+
+from FreeCADDocument import Document, DocumentObject
+
+ActiveDocument = None
+_documents = {}
+_observers = []
+
+
+def newDocument(name = "Unnamed"):
+	global ActiveDocument
+	doc = Document(name)
+	_documents[name] = doc
+	ActiveDocument = doc
+	return doc
+
+
+def closeDocument(name):
+	global ActiveDocument
+	doc = _documents.pop(name, None)
+	if doc is ActiveDocument:
+		ActiveDocument = None
+	if doc is not None:
+		_notify("slotDeletedDocument", doc)
+
+
+def setActiveDocument(name):
+	global ActiveDocument
+	ActiveDocument = _documents[name]
+
+
+def listDocuments():
+	return dict(_documents)
+
+
+def addDocumentObserver(observer):
+	if observer not in _observers:
+		_observers.append(observer)
+
+
+def removeDocumentObserver(observer):
+	if observer in _observers:
+		_observers.remove(observer)
+
+
+def _notify(slot, *args):
+	for observer in list(_observers):
+		method = getattr(observer, slot, None)
+		if method is not None:
+			method(*args)
@@ -0,0 +1,348 @@
+'''Document and document objects of the FreeCAD stand-in.
+
+Properties are declared with addProperty and stored by value: reading a
+Vector, Placement or list property returns a copy, like FreeCAD does.
+Assigning a property touches the object and calls Proxy.onChanged, and
+Document.recompute executes the touched objects, counting the calls, and
+Document.Changes logs the property changes to measure onChanged cascades.
+'''
+
+import copy
+
+import FreeCAD
+
+_defaults = {
+	"App::PropertyFloat": 0.0,
+	"App::PropertyLength": 0.0,
+	"App::PropertyDistance": 0.0,
+	"App::PropertyAngle": 0.0,
+	"App::PropertyPercent": 0,
+	"App::PropertyInteger": 0,
+	"App::PropertyBool": False,
+	"App::PropertyString": "",
+	"App::PropertyFile": "",
+	"App::PropertyFileIncluded": "",
+	"App::PropertyLink": None,
+	"App::PropertyLinkList": [],
+	"App::PropertyVectorList": [],
+	"App::PropertyFloatList": [],
+	"App::PropertyIntegerList": [],
+	"App::PropertyStringList": [],
+	"App::PropertyPythonObject": None,
+	"Part::PropertyPartShape": None,
+}
+
+_floatTypes = ("App::PropertyFloat", "App::PropertyLength", "App::PropertyDistance", "App::PropertyAngle")
+
+
+class ViewObject(object):
+	'''Attribute bag standing for the view provider'''
+
+	def __init__(self, obj):
+		self.__dict__["Object"] = obj
+		self.__dict__["Proxy"] = None
+		self.__dict__["Visibility"] = True
+
+	def addDisplayMode(self, node, name):
+		pass
+
+	def addProperty(self, ptype, name, group = "", doc = "", mode = 0, readonly = False, hidden = False):
+		self.__dict__[name] = copy.copy(_defaults.get(ptype))
+		return self
+
+
+class DocumentObject(object):
+
+	_builtinProperties = ("Label", "Placement")
+
+	def __init__(self, doc, typeId, name):
+		d = self.__dict__
+		d["Document"] = doc
+		d["TypeId"] = typeId
+		d["Name"] = name
+		d["_props"] = {}
+		d["_types"] = {}
+		d["_enums"] = {}
+		d["_modes"] = {}
+		d["_status"] = {}
+		d["_order"] = []
+		d["State"] = []
+		d["ViewObject"] = ViewObject(self)
+		d["Proxy"] = None
+		d["_shape"] = None
+		self.addProperty("App::PropertyString", "Label")
+		self._props["Label"] = name
+		if typeId.startswith("Part::") or typeId.startswith("PartDesign::"):
+			self.addProperty("App::PropertyPlacement", "Placement")
+			self._props["Placement"] = FreeCAD.Placement()
+
+	# properties ###################################
+
+	def addProperty(self, ptype, name, group = "", doc = "", mode = 0, readonly = False, hidden = False):
+		if ptype == "App::PropertyPlacement":
+			value = FreeCAD.Placement()
+		elif ptype == "App::PropertyVector":
+			value = FreeCAD.Vector()
+		elif ptype == "App::PropertyEnumeration":
+			value = None
+			self._enums[name] = []
+		else:
+			value = copy.copy(_defaults.get(ptype))
+		self._types[name] = ptype
+		self._props[name] = value
+		if name not in self._order:
+			self._order.append(name)
+		return self
+
+	@property
+	def PropertiesList(self):
+		return list(self._order)
+
+	def getTypeIdOfProperty(self, name):
+		return self._types.get(name, "")
+
+	def getPropertyByName(self, name):
+		return getattr(self, name)
+
+	def getEnumerationsOfProperty(self, name):
+		return list(self._enums.get(name, []))
+
+	def setEditorMode(self, name, mode):
+		names = {1 : ["ReadOnly"], 2 : ["Hidden"], 3 : ["ReadOnly", "Hidden"]}
+		self._modes[name] = list(mode) if isinstance(mode, (list, tuple)) else names.get(mode, [])
+
+	def getEditorMode(self, name):
+		return list(self._modes.get(name, []))
+
+	def setPropertyStatus(self, name, status):
+		current = self._status.setdefault(name, [])
+		for s in status if isinstance(status, (list, tuple)) else [status]:
+			if s.startswith("-"):
+				if s[1:] in current: current.remove(s[1:])
+			elif s not in current:
+				current.append(s)
+
+	def getPropertyStatus(self, name):
+		return list(self._status.get(name, []))
+
+	def removeProperty(self, name):
+		self._props.pop(name, None)
+		self._types.pop(name, None)
+		if name in self._order:
+			self._order.remove(name)
+
+	def __getattr__(self, name):
+		props = self.__dict__["_props"]
+		if name == "Shape":
+			return self.__dict__["_shape"]
+		if name in props:
+			value = props[name]
+			ptype = self._types[name]
+			if ptype in ("App::PropertyVector", "App::PropertyPlacement"):
+				return copy.deepcopy(value)
+			if ptype == "App::PropertyVectorList":
+				return [FreeCAD.Vector(v) for v in value]
+			if isinstance(value, list):
+				return list(value)
+			return value
+		raise AttributeError("'%s' object has no attribute '%s'" % (self.TypeId, name))
+
+	def __setattr__(self, name, value):
+		if name == "Proxy":
+			self.__dict__["Proxy"] = value
+			self._changed("Proxy")
+			return
+		if name == "Shape":
+			self.__dict__["_shape"] = value
+			if value is not None and "Placement" in self._props:
+				self._props["Placement"] = value.Placement
+			return
+		if name not in self._props:
+			self.__dict__[name] = value
+			return
+		ptype = self._types[name]
+		if ptype == "App::PropertyEnumeration":
+			if isinstance(value, (list, tuple)):
+				self._enums[name] = list(value)
+				value = value[0] if len(value) > 0 else None
+			elif value not in self._enums[name]:
+				raise ValueError("'%s' is not part of the enumeration" % value)
+		elif ptype in _floatTypes:
+			value = float(value)
+		elif ptype in ("App::PropertyInteger", "App::PropertyPercent"):
+			value = int(value)
+		elif ptype == "App::PropertyVector":
+			value = FreeCAD.Vector(value)
+		elif ptype == "App::PropertyPlacement":
+			value = FreeCAD.Placement(value)
+		elif ptype == "App::PropertyVectorList":
+			value = [FreeCAD.Vector(v) for v in value]
+		elif ptype in ("App::PropertyFloatList", "App::PropertyIntegerList", "App::PropertyStringList", "App::PropertyLinkList"):
+			value = list(value)
+		self._props[name] = value
+		if name == "Placement" and self.__dict__["_shape"] is not None:
+			self.__dict__["_shape"].Placement = value
+		self.touch()
+		self._changed(name)
+
+	def _changed(self, name):
+		self.Document.ChangeCount += 1
+		self.Document.Changes.append((self.Name, name))
+		onChanged = getattr(self.__dict__["Proxy"], "onChanged", None)
+		if onChanged is not None:
+			onChanged(self, name)
+		if hasattr(self, "_builtinChanged"):
+			self._builtinChanged(name)
+		FreeCAD._notify("slotChangedObject", self, name)
+
+	# links and state ##############################
+
+	def _links(self):
+		res = []
+		for name, ptype in self._types.items():
+			value = self._props.get(name)
+			if ptype == "App::PropertyLink" and value is not None:
+				res.append(value)
+			elif ptype == "App::PropertyLinkList":
+				res.extend(v for v in value if v is not None)
+		return res
+
+	@property
+	def OutList(self):
+		res = []
+		for o in self._links():
+			if o not in res and o.Name in self.Document._objects:
+				res.append(o)
+		return res
+
+	@property
+	def InList(self):
+		return [o for o in self.Document.Objects if self in o._links()]
+
+	def touch(self):
+		if "Touched" not in self.State:
+			self.State.append("Touched")
+
+	def purgeTouched(self):
+		if "Touched" in self.State:
+			self.State.remove("Touched")
+
+	def isValid(self):
+		return self.Name in self.Document._objects
+
+	def recompute(self):
+		self.Document._execute(self)
+		return True
+
+	def __repr__(self):
+		return "<%s object %s>" % (self.TypeId, self.Name)
+
+
+class Document(object):
+
+	def __init__(self, name):
+		self.Name = name
+		self._objects = {}
+		self._order = []
+		self.RecomputeCount = 0
+		self.ExecuteCount = 0
+		self.ChangeCount = 0
+		self.Changes = []   # (object name, property name) of every property change, in order
+		self.Transactions = []
+
+	def resetCounters(self):
+		self.RecomputeCount = self.ExecuteCount = self.ChangeCount = 0
+		self.Changes = []
+
+	@property
+	def Objects(self):
+		return [self._objects[n] for n in self._order]
+
+	def _uniqueName(self, name):
+		if name not in self._objects:
+			return name
+		i = 1
+		while "%s%03d" % (name, i) in self._objects:
+			i += 1
+		return "%s%03d" % (name, i)
+
+	def addObject(self, typeId, name = None):
+		import Part
+		name = self._uniqueName(name or typeId.split("::")[-1])
+		cls = Part.builtinFeatures.get(typeId, DocumentObject)
+		obj = cls(self, typeId, name)
+		self._objects[name] = obj
+		self._order.append(name)
+		return obj
+
+	def removeObject(self, name):
+		obj = self._objects.get(name)
+		if obj is not None:
+			FreeCAD._notify("slotDeletedObject", obj)
+			del self._objects[name]
+			self._order.remove(name)
+			for o in self.Objects:
+				for pname, ptype in list(o._types.items()):
+					if ptype == "App::PropertyLink" and o._props.get(pname) is obj:
+						o._props[pname] = None
+					elif ptype == "App::PropertyLinkList" and obj in o._props.get(pname):
+						o._props[pname] = [v for v in o._props[pname] if v is not obj]
+
+	def __getattr__(self, name):
+		objects = self.__dict__.get("_objects", {})
+		if name in objects:
+			return objects[name]
+		raise AttributeError(name)
+
+	def getObject(self, name):
+		return self._objects.get(name)
+
+	def getObjectsByLabel(self, label):
+		return [o for o in self.Objects if o.Label == label]
+
+	def _execute(self, obj):
+		self.ExecuteCount += 1
+		if hasattr(obj, "_builtinExecute"):
+			obj._builtinExecute()
+		execute = getattr(obj.__dict__["Proxy"], "execute", None)
+		if execute is not None:
+			execute(obj)
+		obj.purgeTouched()
+
+	def _sorted(self, objs):
+		'''Dependencies first'''
+		done = []
+		def visit(o, stack):
+			if o in done or o in stack:
+				return
+			for dep in o.OutList:
+				visit(dep, stack + [o])
+			done.append(o)
+		for o in objs:
+			visit(o, [])
+		return done
+
+	def recompute(self):
+		self.RecomputeCount += 1
+		touched = [o for o in self.Objects if "Touched" in o.State]
+		# objects depending on a touched object are recomputed as well
+		changed = True
+		while changed:
+			changed = False
+			for o in self.Objects:
+				if o not in touched and any(dep in touched for dep in o.OutList):
+					touched.append(o)
+					changed = True
+		for o in self._sorted(touched):
+			if o.isValid():
+				self._execute(o)
+		return len(touched)
+
+	def openTransaction(self, name = ""):
+		self.Transactions.append(name)
+
+	def commitTransaction(self):
+		pass
+
+	def abortTransaction(self):
+		pass
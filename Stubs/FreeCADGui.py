@@ -0,0 +1,64 @@
+'''GUI side of the FreeCAD stand-in: selection, commands, no widgets'''
+
+import FreeCAD
+
+ActiveDocument = None
+_commands = {}
+_workbenches = []
+
+
+class _Selection:
+
+	def __init__(self):
+		self._sel = []
+
+	def addSelection(self, obj):
+		self._sel.append(_SelectionObject(obj))
+
+	def clearSelection(self):
+		self._sel = []
+
+	def getSelection(self):
+		return [s.Object for s in self._sel]
+
+	def getSelectionEx(self):
+		return list(self._sel)
+
+
+class _SelectionObject:
+
+	def __init__(self, obj):
+		self.Object = obj
+		self.ObjectName = obj.Name
+		self.TypeName = obj.TypeId
+		self.SubObjects = []
+
+Selection = _Selection()
+
+
+def addCommand(name, command):
+	_commands[name] = command
+
+
+def runCommand(name):
+	_commands[name].Activated()
+
+
+def doCommand(code):
+	exec(code, globals())
+
+
+def addWorkbench(wb):
+	_workbenches.append(wb)
+
+
+def SendMsgToActiveView(msg):
+	pass
+
+
+def getMainWindow():
+	return None
+
+
+def updateGui():
+	pass
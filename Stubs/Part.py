@@ -0,0 +1,738 @@
+'''Polyline geometry standing in for the Part module.
+
+Shapes keep their geometry in local coordinates plus a Placement, like an
+OCC location, so that moving a shape is cheap and sub-shapes are returned
+in global coordinates. Curves are straight segments, circles and a
+piecewise linear "BSpline" interpolating its poles.
+'''
+
+import math, itertools
+
+import FreeCAD
+from FreeCAD import Vector, Placement
+from FreeCADDocument import DocumentObject
+
+_tshapeIds = itertools.count(1)
+
+
+#############################
+# Curves
+#############################
+
+class LineSegment(object):
+
+	def __init__(self, p1 = None, p2 = None):
+		self.StartPoint = Vector(p1 or Vector())
+		self.EndPoint = Vector(p2 or Vector(1, 0, 0))
+
+	@property
+	def FirstParameter(self):
+		return 0.0
+
+	@property
+	def LastParameter(self):
+		return (self.EndPoint - self.StartPoint).Length
+
+	def _dir(self):
+		return (self.EndPoint - self.StartPoint).normalize()
+
+	def value(self, u):
+		return self.StartPoint + self._dir().multiply(u)
+
+	def tangent(self, u):
+		return (self._dir(),)
+
+	def parameter(self, p):
+		return (p - self.StartPoint).dot(self._dir())
+
+	def transformed(self, plm):
+		return LineSegment(plm.multVec(self.StartPoint), plm.multVec(self.EndPoint))
+
+	def toShape(self):
+		return Edge(self)
+
+
+class Circle(object):
+
+	def __init__(self, center = None, normal = None, radius = 1.0):
+		self.Center = Vector(center or Vector())
+		self.Axis = Vector(normal or Vector(0, 0, 1)).normalize()
+		self.Radius = float(radius)
+		ref = Vector(1, 0, 0) if abs(self.Axis.x) < 0.9 else Vector(0, 1, 0)
+		self.XAxis = self.Axis.cross(ref).cross(self.Axis).normalize()
+
+	FirstParameter = 0.0
+	LastParameter = 2 * math.pi
+
+	def value(self, u):
+		y = self.Axis.cross(self.XAxis)
+		return self.Center + self.XAxis * (self.Radius * math.cos(u)) + y * (self.Radius * math.sin(u))
+
+	def tangent(self, u):
+		y = self.Axis.cross(self.XAxis)
+		return ((self.XAxis * (-math.sin(u)) + y * math.cos(u)).normalize(),)
+
+	def parameter(self, p):
+		d = p - self.Center
+		y = self.Axis.cross(self.XAxis)
+		return math.atan2(d.dot(y), d.dot(self.XAxis)) % (2 * math.pi)
+
+	def transformed(self, plm):
+		c = Circle(plm.multVec(self.Center), plm.Rotation.multVec(self.Axis), self.Radius)
+		c.XAxis = plm.Rotation.multVec(self.XAxis)
+		return c
+
+	def toShape(self):
+		return Edge(self)
+
+
+class BSplineCurve(object):
+	'''Piecewise linear curve through its poles, parameterized on [0, 1]'''
+
+	def __init__(self):
+		self._pts = [Vector(0, 0, 0), Vector(1, 0, 0)]
+		self._periodic = False
+
+	def _setPoints(self, pts, periodic = False):
+		self._pts = [Vector(p) for p in pts]
+		if periodic:
+			self._pts.append(Vector(self._pts[0]))
+		self._periodic = periodic
+		self._cum = [0.0]
+		for a, b in zip(self._pts[:-1], self._pts[1:]):
+			self._cum.append(self._cum[-1] + (b - a).Length)
+
+	def interpolate(self, Points = None, PeriodicFlag = False, **kwargs):
+		self._setPoints(Points, PeriodicFlag)
+
+	def approximate(self, Points = None, Tolerance = 1e-3, **kwargs):
+		self._setPoints(Points)
+
+	def getPoles(self):
+		return [Vector(p) for p in self._pts]
+
+	@property
+	def NbPoles(self):
+		return len(self._pts)
+
+	def isPeriodic(self):
+		return self._periodic
+
+	FirstParameter = 0.0
+	LastParameter = 1.0
+
+	def _locate(self, u):
+		s = min(max(u, 0.0), 1.0) * self._cum[-1]
+		for i in range(1, len(self._cum)):
+			if s <= self._cum[i] or i == len(self._cum) - 1:
+				seg = self._cum[i] - self._cum[i - 1]
+				t = (s - self._cum[i - 1]) / seg if seg > 0 else 0.0
+				return i - 1, t
+		return 0, 0.0
+
+	def value(self, u):
+		i, t = self._locate(u)
+		a, b = self._pts[i], self._pts[i + 1]
+		return a + (b - a) * t
+
+	def tangent(self, u):
+		i, t = self._locate(u)
+		return ((self._pts[i + 1] - self._pts[i]).normalize(),)
+
+	def parameter(self, p):
+		best, bestd = 0.0, None
+		for i in range(len(self._pts) - 1):
+			a, b = self._pts[i], self._pts[i + 1]
+			ab = b - a
+			l2 = ab.dot(ab)
+			t = 0.0 if l2 == 0 else max(0.0, min(1.0, (p - a).dot(ab) / l2))
+			d = (a + ab * t - p).Length
+			if bestd is None or d < bestd:
+				bestd = d
+				best = (self._cum[i] + t * math.sqrt(l2)) / self._cum[-1]
+		return best
+
+	def transformed(self, plm):
+		c = BSplineCurve()
+		c._setPoints([plm.multVec(p) for p in self._pts])
+		c._periodic = self._periodic
+		return c
+
+	def toShape(self):
+		return Edge(self)
+
+
+#############################
+# Shapes
+#############################
+
+class BoundBox(object):
+
+	def __init__(self, pts):
+		xs = [p.x for p in pts] or [0.0]
+		ys = [p.y for p in pts] or [0.0]
+		zs = [p.z for p in pts] or [0.0]
+		self.XMin, self.XMax = min(xs), max(xs)
+		self.YMin, self.YMax = min(ys), max(ys)
+		self.ZMin, self.ZMax = min(zs), max(zs)
+		self.XLength = self.XMax - self.XMin
+		self.YLength = self.YMax - self.YMin
+		self.ZLength = self.ZMax - self.ZMin
+		self.DiagonalLength = math.sqrt(self.XLength ** 2 + self.YLength ** 2 + self.ZLength ** 2)
+
+
+class Shape(object):
+
+	ShapeType = "Shape"
+
+	def __init__(self):
+		self._tshape = next(_tshapeIds)
+		self._placement = Placement()
+		self.Orientation = "Forward"
+
+	# placement ####################################
+
+	def _getPlacement(self):
+		return Placement(self._placement)
+
+	def _setPlacement(self, plm):
+		self._placement = Placement(plm)
+
+	Placement = property(_getPlacement, _setPlacement)
+
+	def hashCode(self):
+		p = self._placement
+		return hash((self._tshape, tuple(p.Base), p.Rotation.Q))
+
+	def isSame(self, other):
+		p, q = self._placement, other._placement
+		return self._tshape == other._tshape and tuple(p.Base) == tuple(q.Base) and p.Rotation.Q == q.Rotation.Q
+
+	def isEqual(self, other):
+		return self.isSame(other) and self.Orientation == other.Orientation
+
+	def isNull(self):
+		return False
+
+	def copy(self):
+		res = self._transformedCopy(Placement())
+		res._placement = Placement(self._placement)
+		return res
+
+	def transformed(self, plm):
+		'''Copy with its local geometry moved by the placement'''
+		return self._transformedCopy(plm)
+
+	def transformGeometry(self, matrix):
+		res = self._mapped(lambda p: matrix.multVec(self._placement.multVec(p)))
+		return res
+
+	def transformShape(self, matrix, copy = False):
+		moved = self.transformGeometry(matrix)
+		self.__dict__.update(moved.__dict__)
+		self._tshape = next(_tshapeIds)
+
+	def translate(self, v):
+		self._placement = Placement(v, FreeCAD.Rotation()).multiply(self._placement)
+		return self
+
+	def scale(self, factor, center = None):
+		m = FreeCAD.Matrix()
+		m.scale(factor)
+		self.transformShape(m)
+		return self
+
+	def _global(self, p):
+		return self._placement.multVec(p)
+
+	# topology #####################################
+
+	def _subShapes(self, kind):
+		return []
+
+	@property
+	def Vertexes(self):
+		return self._subShapes("Vertexes")
+
+	@property
+	def Edges(self):
+		return self._subShapes("Edges")
+
+	@property
+	def Wires(self):
+		return self._subShapes("Wires")
+
+	@property
+	def Faces(self):
+		return self._subShapes("Faces")
+
+	@property
+	def Solids(self):
+		return []
+
+	def __getattr__(self, name):
+		for prefix in ("Vertex", "Edge", "Face", "Wire"):
+			if name.startswith(prefix) and name[len(prefix):].isdigit():
+				items = getattr(self, prefix + ("es" if prefix == "Vertex" else "s"))
+				i = int(name[len(prefix):]) - 1
+				if i < len(items):
+					return items[i]
+		raise AttributeError(name)
+
+	@property
+	def BoundBox(self):
+		return BoundBox([v.Point for v in self.Vertexes])
+
+	@property
+	def Length(self):
+		return sum(e.Length for e in self.Edges)
+
+	@property
+	def Volume(self):
+		return 0.0
+
+	@property
+	def Area(self):
+		return 0.0
+
+	@property
+	def CenterOfMass(self):
+		pts = [v.Point for v in self.Vertexes]
+		if not pts:
+			return Vector()
+		c = Vector()
+		for p in pts:
+			c = c + p
+		return c * (1.0 / len(pts))
+
+	def slice(self, normal, d):
+		'''Section of the polygonal faces by the plane normal . p = d: one segment per crossed face,
+		the segments of the faces in their order as one wire'''
+		n = Vector(normal)
+		n.normalize()
+		edges = []
+		for f in self.Faces:
+			pts = [v.Point for v in f.Vertexes]
+			cuts = []
+			for a, b in zip(pts, pts[1:] + pts[:1]):
+				da, db = n.dot(a) - d, n.dot(b) - d
+				if da == 0 or da * db < 0:
+					cuts.append(a + (b - a) * (da / (da - db)) if da != 0 else Vector(a))
+			if len(cuts) >= 2 and (cuts[1] - cuts[0]).Length > 1e-9:
+				edges.append(Edge(LineSegment(cuts[0], cuts[1])))
+		return [Wire(edges)] if edges else []
+
+	def isClosed(self):
+		return False
+
+	def distToShape(self, other):
+		best = None
+		for e1 in self.Edges:
+			for e2 in other.Edges:
+				d, pa, pb = _segmentDistance(e1.firstVertex().Point, e1.lastVertex().Point,
+											e2.firstVertex().Point, e2.lastVertex().Point)
+				if best is None or d < best[0]:
+					best = (d, [(pa, pb)], [])
+		return best
+
+
+class Vertex(Shape):
+
+	ShapeType = "Vertex"
+
+	def __init__(self, p = None):
+		Shape.__init__(self)
+		if p is not None and not isinstance(p, Vector):
+			p = Vector(p)
+		self._p = Vector(p or Vector())
+
+	@property
+	def Point(self):
+		return self._global(self._p)
+
+	@property
+	def X(self):
+		return self.Point.x
+
+	@property
+	def Y(self):
+		return self.Point.y
+
+	@property
+	def Z(self):
+		return self.Point.z
+
+	def _subShapes(self, kind):
+		return [self] if kind == "Vertexes" else []
+
+	def _mapped(self, f):
+		return Vertex(f(self._p))
+
+	def _transformedCopy(self, plm):
+		return Vertex(plm.multVec(self._p))
+
+
+class Edge(Shape):
+
+	ShapeType = "Edge"
+
+	def __init__(self, curve, first = None, last = None):
+		Shape.__init__(self)
+		self._curve = curve
+		self.FirstParameter = curve.FirstParameter if first is None else first
+		self.LastParameter = curve.LastParameter if last is None else last
+
+	@property
+	def Curve(self):
+		return self._curve.transformed(self._placement)
+
+	def valueAt(self, u):
+		return self._global(self._curve.value(u))
+
+	def tangentAt(self, u):
+		return self._placement.Rotation.multVec(self._curve.tangent(u)[0])
+
+	def firstVertex(self):
+		return Vertex(self.valueAt(self.FirstParameter))
+
+	def lastVertex(self):
+		return Vertex(self.valueAt(self.LastParameter))
+
+	@property
+	def Length(self):
+		pts = self.discretize(2 if isinstance(self._curve, LineSegment) else 64)
+		return sum((b - a).Length for a, b in zip(pts[:-1], pts[1:]))
+
+	def getParameterByLength(self, length):
+		u0, u1 = self.FirstParameter, self.LastParameter
+		total = self.Length
+		return u0 + (u1 - u0) * (length / total if total > 0 else 0.0)
+
+	def discretize(self, n):
+		if isinstance(n, int) is False and hasattr(n, "__int__"):
+			n = int(n)
+		u0, u1 = self.FirstParameter, self.LastParameter
+		return [self.valueAt(u0 + (u1 - u0) * i / float(n - 1)) for i in range(n)]
+
+	def _subShapes(self, kind):
+		if kind == "Vertexes":
+			if isinstance(self._curve, Circle):
+				return [self.firstVertex()]
+			return [self.firstVertex(), self.lastVertex()]
+		if kind == "Edges":
+			return [self]
+		return []
+
+	def _mapped(self, f):
+		if isinstance(self._curve, LineSegment):
+			return Edge(LineSegment(f(self._curve.StartPoint), f(self._curve.EndPoint)))
+		pts = [f(p) for p in self.discretize(64)]
+		c = BSplineCurve()
+		c._setPoints(pts)
+		return Edge(c)
+
+	def _transformedCopy(self, plm):
+		e = Edge(self._curve.transformed(plm), self.FirstParameter, self.LastParameter)
+		e.Orientation = self.Orientation
+		return e
+
+
+def _segmentDistance(p1, q1, p2, q2):
+	d1 = q1 - p1
+	d2 = q2 - p2
+	r = p1 - p2
+	a = d1.dot(d1)
+	e = d2.dot(d2)
+	f = d2.dot(r)
+	if a <= 1e-300 and e <= 1e-300:
+		return (p1 - p2).Length, p1, p2
+	if a <= 1e-300:
+		s, t = 0.0, max(0.0, min(1.0, f / e))
+	else:
+		c = d1.dot(r)
+		if e <= 1e-300:
+			t, s = 0.0, max(0.0, min(1.0, -c / a))
+		else:
+			b = d1.dot(d2)
+			den = a * e - b * b
+			s = max(0.0, min(1.0, (b * f - c * e) / den)) if den != 0 else 0.0
+			t = (b * s + f) / e
+			if t < 0:
+				t, s = 0.0, max(0.0, min(1.0, -c / a))
+			elif t > 1:
+				t, s = 1.0, max(0.0, min(1.0, (b - c) / a))
+	ca = p1 + d1 * s
+	cb = p2 + d2 * t
+	return (ca - cb).Length, ca, cb
+
+
+class Wire(Shape):
+
+	ShapeType = "Wire"
+
+	def __init__(self, edges = None):
+		Shape.__init__(self)
+		self._edges = list(edges or [])
+
+	def _subShapes(self, kind):
+		edges = [e.transformed(self._placement) for e in self._edges]
+		if kind == "Edges":
+			return edges
+		if kind == "Wires":
+			return [self]
+		if kind == "Vertexes":
+			res = []
+			for e in edges:
+				for v in e.Vertexes:
+					if not any((v.Point - w.Point).Length < 1e-7 for w in res[-1:] + res[:1]):
+						res.append(v)
+			return res
+		return []
+
+	def isClosed(self):
+		if not self._edges:
+			return False
+		return (self._edges[0].firstVertex().Point - self._edges[-1].lastVertex().Point).Length < 1e-7
+
+	def discretize(self, n):
+		return [v.Point for v in self.Vertexes]
+
+	def _mapped(self, f):
+		return Wire([e._mapped(f) for e in self._edges])
+
+	def _transformedCopy(self, plm):
+		return Wire([e._transformedCopy(plm) for e in self._edges])
+
+
+class Face(Shape):
+
+	ShapeType = "Face"
+
+	def __init__(self, wire = None, normal = None):
+		Shape.__init__(self)
+		self._wire = wire or Wire()
+		self._normal = Vector(normal or Vector(0, 0, 1))
+
+	def normalAt(self, u, v):
+		return self._placement.Rotation.multVec(self._normal)
+
+	def _subShapes(self, kind):
+		w = self._wire.transformed(self._placement)
+		if kind == "Faces":
+			return [self]
+		return w._subShapes(kind)
+
+	@property
+	def OuterWire(self):
+		return self._wire.transformed(self._placement)
+
+	@property
+	def CenterOfMass(self):
+		edges = self.Edges
+		if len(edges) == 1 and isinstance(edges[0]._curve, Circle):
+			return edges[0]._curve.Center
+		return Shape.CenterOfMass.fget(self)
+
+	def _mapped(self, f):
+		return Face(self._wire._mapped(f), self._normal)
+
+	def _transformedCopy(self, plm):
+		return Face(self._wire._transformedCopy(plm), plm.Rotation.multVec(self._normal))
+
+
+class Compound(Shape):
+
+	ShapeType = "Compound"
+
+	def __init__(self, shapes = None):
+		Shape.__init__(self)
+		self._shapes = list(shapes or [])
+		self._volume = 0.0
+
+	def _subShapes(self, kind):
+		res = []
+		for s in self._shapes:
+			res.extend(s.transformed(self._placement)._subShapes(kind))
+		return res
+
+	@property
+	def Volume(self):
+		return self._volume
+
+	def _mapped(self, f):
+		c = Compound([s._mapped(f) for s in self._shapes])
+		c._volume = self._volume
+		return c
+
+	def _transformedCopy(self, plm):
+		c = Compound([s._transformedCopy(plm) for s in self._shapes])
+		c._volume = self._volume
+		return c
+
+
+class Solid(Compound):
+
+	ShapeType = "Solid"
+
+
+class _BoxSolid(Solid):
+	'''Box keeping the OCC vertex numbering'''
+
+	def _subShapes(self, kind):
+		if kind == "Vertexes":
+			return [Vertex(self._global(p)) for p in self._boxVertexes]
+		return Solid._subShapes(self, kind)
+
+	def _mapped(self, f):
+		s = _BoxSolid([sh._mapped(f) for sh in self._shapes])
+		s._volume = self._volume
+		s._boxVertexes = [f(p) for p in self._boxVertexes]
+		return s
+
+	def _transformedCopy(self, plm):
+		s = _BoxSolid([sh._transformedCopy(plm) for sh in self._shapes])
+		s._volume = self._volume
+		s._boxVertexes = [plm.multVec(p) for p in self._boxVertexes]
+		return s
+
+
+def makePolygon(points, closed = False):
+	pts = [Vector(p) for p in points]
+	if closed and len(pts) > 1 and (pts[0] - pts[-1]).Length > 1e-7:
+		pts.append(Vector(pts[0]))
+	return Wire([Edge(LineSegment(a, b)) for a, b in zip(pts[:-1], pts[1:])])
+
+
+def makeLine(p1, p2):
+	return Edge(LineSegment(Vector(p1), Vector(p2)))
+
+
+def makePlane(length, width, pnt = None, dirv = None):
+	p0 = Vector(0, 0, 0)
+	wire = makePolygon([p0, Vector(length, 0, 0), Vector(length, width, 0), Vector(0, width, 0)], True)
+	face = Face(wire, Vector(0, 0, 1))
+	plm = Placement(pnt or Vector(), FreeCAD.Rotation(Vector(0, 0, 1), dirv or Vector(0, 0, 1)))
+	face.Placement = plm
+	return face
+
+
+def makeLoft(wires, solid = False, ruled = False, closed = False):
+	'''One face per edge of each wire pair'''
+	faces = []
+	for w1, w2 in zip(wires[:-1], wires[1:]):
+		for e1, e2 in zip(w1.Edges, w2.Edges):
+			pts = [e1.firstVertex().Point, e1.lastVertex().Point, e2.lastVertex().Point, e2.firstVertex().Point]
+			faces.append(Face(makePolygon(pts, True)))
+	res = Solid(faces) if solid else Compound(faces)
+	res._volume = 1.0 if solid else 0.0
+	return res
+
+
+#############################
+# Built-in document features
+#############################
+
+class Feature(DocumentObject):
+
+	def __init__(self, doc, typeId, name):
+		DocumentObject.__init__(self, doc, typeId, name)
+		self.__dict__["_shape"] = Compound()
+
+	def _build(self):
+		return None
+
+	def _builtinExecute(self):
+		shape = self._build()
+		if shape is not None:
+			shape.Placement = self._props["Placement"]
+			self.__dict__["_shape"] = shape
+
+
+class PlaneFeature(Feature):
+
+	def __init__(self, doc, typeId, name):
+		Feature.__init__(self, doc, typeId, name)
+		self.addProperty("App::PropertyLength", "Length")
+		self.addProperty("App::PropertyLength", "Width")
+		self._props["Length"] = 10.0
+		self._props["Width"] = 10.0
+		self._builtinExecute()
+
+	def _build(self):
+		return makePlane(self._props["Length"], self._props["Width"])
+
+
+class BoxFeature(Feature):
+
+	def __init__(self, doc, typeId, name):
+		Feature.__init__(self, doc, typeId, name)
+		for p in ("Length", "Width", "Height"):
+			self.addProperty("App::PropertyLength", p)
+			self._props[p] = 10.0
+		self._builtinExecute()
+
+	def _build(self):
+		l, w, h = self._props["Length"], self._props["Width"], self._props["Height"]
+		v = [Vector(0, 0, 0), Vector(0, 0, h), Vector(0, w, 0), Vector(0, w, h),
+			Vector(l, 0, 0), Vector(l, 0, h), Vector(l, w, 0), Vector(l, w, h)]
+		quads = [(0, 1, 3, 2, Vector(-1, 0, 0)), (4, 6, 7, 5, Vector(1, 0, 0)), (0, 4, 5, 1, Vector(0, -1, 0)),
+				(2, 3, 7, 6, Vector(0, 1, 0)), (0, 2, 6, 4, Vector(0, 0, -1)), (1, 5, 7, 3, Vector(0, 0, 1))]
+		faces = [Face(makePolygon([v[a], v[b], v[c], v[d]], True), n) for a, b, c, d, n in quads]
+		s = _BoxSolid(faces)
+		s._volume = l * w * h
+		s._boxVertexes = v
+		return s
+
+
+class CylinderFeature(Feature):
+
+	def __init__(self, doc, typeId, name):
+		Feature.__init__(self, doc, typeId, name)
+		for p, val in (("Radius", 2.0), ("Height", 10.0), ("Angle", 360.0)):
+			self.addProperty("App::PropertyLength", p)
+			self._props[p] = val
+		self._builtinExecute()
+
+	def _build(self):
+		r, h = self._props["Radius"], self._props["Height"]
+		lateral = Face(Wire([Edge(Circle(Vector(0, 0, h), Vector(0, 0, 1), r)), Edge(Circle(Vector(0, 0, 0), Vector(0, 0, 1), r))]))
+		top = Face(Wire([Edge(Circle(Vector(0, 0, h), Vector(0, 0, 1), r))]), Vector(0, 0, 1))
+		bottom = Face(Wire([Edge(Circle(Vector(0, 0, 0), Vector(0, 0, 1), r))]), Vector(0, 0, -1))
+		s = Solid([lateral, top, bottom])
+		s._volume = math.pi * r * r * h
+		return s
+
+
+class LoftFeature(Feature):
+
+	def __init__(self, doc, typeId, name):
+		Feature.__init__(self, doc, typeId, name)
+		self.addProperty("App::PropertyLinkList", "Sections")
+		self.addProperty("App::PropertyBool", "Solid")
+		self.addProperty("App::PropertyBool", "Ruled")
+		self.addProperty("App::PropertyBool", "Closed")
+		self.__dict__["BuildCount"] = 0
+
+	def _builtinExecute(self):
+		wires = [s.Shape for s in self._props["Sections"] if s.Shape is not None]
+		self.__dict__["BuildCount"] += 1
+		if len(wires) > 1:
+			self.__dict__["_shape"] = makeLoft(wires, self._props["Solid"], self._props["Ruled"])
+
+
+class Part2DObject(Feature):
+
+	def __init__(self, doc, typeId, name):
+		DocumentObject.__init__(self, doc, typeId, name)
+		self.__dict__["_shape"] = Wire()
+
+
+builtinFeatures = {
+	"Part::Feature": Feature,
+	"Part::FeaturePython": Feature,
+	"Part::Part2DObjectPython": Part2DObject,
+	"Part::Plane": PlaneFeature,
+	"Part::Box": BoxFeature,
+	"Part::Cylinder": CylinderFeature,
+	"Part::Loft": LoftFeature,
+}
@@ -0,0 +1,69 @@
+class _Signal:
+
+	def __init__(self):
+		self._slots = []
+
+	def connect(self, slot):
+		self._slots.append(slot)
+
+	def emit(self, *args):
+		for slot in list(self._slots):
+			slot(*args)
+
+
+class QTimer:
+	'''Timer that only fires when fire() is called, to keep tests deterministic'''
+
+	def __init__(self, parent = None):
+		self.timeout = _Signal()
+		self._active = False
+		self._single = False
+		self.interval = 0
+
+	def setSingleShot(self, flag):
+		self._single = flag
+
+	def setInterval(self, msec):
+		self.interval = msec
+
+	def start(self, msec = None):
+		if msec is not None:
+			self.interval = msec
+		self._active = True
+
+	def stop(self):
+		self._active = False
+
+	def isActive(self):
+		return self._active
+
+	def fire(self):
+		if self._active:
+			if self._single:
+				self._active = False
+			self.timeout.emit()
+
+
+class QObject:
+
+	@staticmethod
+	def connect(*args):
+		pass
+
+
+class QDir:
+
+	@staticmethod
+	def addSearchPath(prefix, path):
+		pass
+
+
+def SIGNAL(name):
+	return name
+
+
+class QString:
+
+	@staticmethod
+	def fromUtf8(s):
+		return s
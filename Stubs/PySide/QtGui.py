@@ -0,0 +1,19 @@
+class QFileDialog:
+
+	@staticmethod
+	def getOpenFileName(*args):
+		return "", ""
+
+
+class _App:
+
+	@staticmethod
+	def activeWindow():
+		return None
+
+qApp = _App()
+
+
+class QDockWidget:
+
+	DockWidgetMovable = DockWidgetFloatable = DockWidgetClosable = 0
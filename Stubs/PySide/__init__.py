@@ -0,0 +1 @@
+'''Qt stand-in: only timers and the names imported at module load'''
@@ -0,0 +1,33 @@
+'''Stand-in of the FreeCAD modules used by the Wing workbench, to drive the feature
+proxies in a plain python interpreter: FreeCAD (Vector, Rotation, Placement, Matrix,
+Console, parameters, documents), Part, Draft, FreeCADGui (selection, commands),
+and the PySide and pivy names imported at module load.
+
+Geometry is polygonal and timers only fire on fire(), so that results and call counts
+are deterministic. Documents count recomputes, executes and property changes:
+
+	import Stubs
+	Stubs.install()
+	import FreeCAD, Wing
+	doc = FreeCAD.newDocument("Test")
+	Wing.createProfile()
+	doc.recompute()
+	print(doc.RecomputeCount, doc.ExecuteCount, doc.ChangeCount)
+'''
+
+import os, sys
+
+path = os.path.dirname(os.path.abspath(__file__))
+
+def install(force = False):
+	'''Put the stand-in modules first in sys.path. A real FreeCAD is kept unless force.
+	Return True if the stand-in is used.'''
+	if not force:
+		try:
+			import FreeCAD
+			return os.path.dirname(os.path.abspath(getattr(FreeCAD, "__file__", ""))) == path
+		except ImportError:
+			pass
+	if path not in sys.path:
+		sys.path.insert(0, path)
+	return True
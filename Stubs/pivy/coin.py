@@ -0,0 +1,4 @@
+class SoGroup:
+
+	def addChild(self, node):
+		pass
@@ -30,12 +30,15 @@
 __title__="FreeCAD Wing Toolkit"
 __author__ = "Matthieu Carron"
 
-import os, sys
+import os, sys, time, contextlib
+from collections import deque
+import numpy
 sys.path.append("/usr/lib/freecad/lib/")
 #from PySide import QtGui
 import FreeCAD, FreeCADGui, Part, Draft
 from FreeCAD import Vector, Rotation, Placement
 from WingLib import *
+import WingLog
 from pivy import coin
 
 __dir__ = os.path.dirname(__file__)
@@ -44,7 +47,7 @@ iconPath = __dir__ + '/Icons/'
 global ProfilesPath
 ProfilesPath = __dir__ + '/Profiles/'
 
-ModeVerbose = True
+log = WingLog.getLogger("Wing")
 VecNul = Vector(0,0,0)
 DefaultProfile = ProfilesPath + 'Default.dat'
 
@@ -93,59 +96,276 @@ class ViewProviderGeneric():
 		return None
 	
 
+#############################
+# Change coalescing
+#############################
+
+ChangeUpdating = {}   # (document, object) names: number of its onChanged handlers running
+ChangeBatches = {}   # (document, object) names: [nesting of its change batches, properties changed meanwhile in order, notifications]
+ChangeDiagnostics = False   # report the handlers run for each edit
+changeReports = deque(maxlen = 50)
+changeEdit = None   # counters of the edit being handled when ChangeDiagnostics is on
+
+def changeKey(obj):
+	return (obj.Document.Name, obj.Name)
+
+def coalescedChanges(onChanged):
+	'''Decorator of the proxies onChanged. Changes of the changeOutputs properties, results written by
+	the updates, are not notified while an update of the same object runs. Changes made during a change batch of the object
+	are notified once each at its end, the ones of updateProps, all running the same update, merged into one.'''
+	def handler(self, fp, prop):
+		key = changeKey(fp)
+		if key in ChangeUpdating and prop in self.changeOutputs:
+			countChange(fp, prop, "suppressed")
+			return
+		if key in ChangeBatches:
+			batch = ChangeBatches[key]
+			if prop not in batch[1]: batch[1].append(prop)
+			batch[2] += 1
+			return
+		top = startEdit(fp.Name + "." + prop)
+		countChange(fp, prop, "handlers")
+		ChangeUpdating[key] = ChangeUpdating.get(key, 0) + 1
+		try:
+			onChanged(self, fp, prop)
+		finally:
+			ChangeUpdating[key] -= 1
+			if ChangeUpdating[key] == 0: del ChangeUpdating[key]
+			if top: finishEdit()
+	handler.__name__ = onChanged.__name__
+	handler.__doc__ = onChanged.__doc__
+	return handler
+
+def beginChanges(*objs):
+	'''Defer the notifications of the changes of the objects until endChanges'''
+	for obj in objs:
+		ChangeBatches.setdefault(changeKey(obj), [0, [], 0])[0] += 1
+
+def endChanges(*objs):
+	'''Notify the changes made since beginChanges, once per property and with one update for the updateProps'''
+	top = startEdit("batch " + ", ".join(obj.Name for obj in objs))
+	try:
+		for obj in objs:
+			batch = ChangeBatches.get(changeKey(obj))
+			if batch is None: continue
+			batch[0] -= 1
+			if batch[0] > 0: continue
+			del ChangeBatches[changeKey(obj)]
+			if changeEdit is not None: changeEdit["deferred"] += batch[2]
+			proxy = getattr(obj, "Proxy", None)
+			if proxy is None: continue
+			merged = [p for p in batch[1] if p in proxy.updateProps][:-1]
+			for prop in batch[1]:
+				if prop in merged:
+					# the update of the last one covers it, only its chord position is kept in step
+					if hasattr(proxy, "chordPoints"): chordPositionChanged(obj, prop, proxy.chordPoints)
+					countChange(obj, prop, "merged")
+				else:
+					proxy.onChanged(obj, prop)
+	finally:
+		if top: finishEdit()
+
+@contextlib.contextmanager
+def changeBatch(*objs):
+	'''with changeBatch(obj): set several properties of obj, its update runs once at the end'''
+	beginChanges(*objs)
+	try:
+		yield
+	finally:
+		endChanges(*objs)
+
+def setChangeDiagnostics(enabled = True):
+	'''Report in the console the handlers run, suppressed, deferred and merged for each edit'''
+	global ChangeDiagnostics
+	ChangeDiagnostics = enabled
+	changeReports.clear()
+
+def startEdit(label):
+	'''Start the counters of an edit if diagnostics are on and no edit is being handled, return True then'''
+	global changeEdit
+	if not ChangeDiagnostics or changeEdit is not None: return False
+	changeEdit = {"edit" : label, "start" : time.time(), "handlers" : 0, "suppressed" : 0, "deferred" : 0, "merged" : 0, "calls" : {}}
+	return True
+
+def countChange(fp, prop, kind):
+	if changeEdit is None: return
+	changeEdit[kind] += 1
+	if kind == "handlers":
+		key = fp.Name + "." + prop
+		changeEdit["calls"][key] = changeEdit["calls"].get(key, 0) + 1
+
+def finishEdit():
+	global changeEdit
+	edit, changeEdit = changeEdit, None
+	edit["time"] = time.time() - edit["start"]
+	changeReports.append(edit)
+	calls = sorted(edit["calls"].items(), key = lambda kv: -kv[1])
+	log.info("%s: %d handlers on %d objects, %d suppressed, %d deferred, %d merged, %.1f ms: %s", edit["edit"], edit["handlers"],
+			len(set(k.split(".")[0] for k in edit["calls"])), edit["suppressed"], edit["deferred"], edit["merged"], edit["time"] * 1000,
+			", ".join("%s %d" % kv for kv in calls[:8]))
+
 class Profile:
 
+	inputLinks = []
+	changeOutputs = ["Points", "Wire", "CSTCoefficients", "CSTFitError", "MatchedPointCount"]
+	updateProps = ["Resampling", "PointCount", "Tolerance"]
+
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyFile", "File", "Profile", "Data source of wire").File = DefaultProfile
 		obj.addProperty("App::PropertyLength", "Scale", "Profile", "Profile scale").Scale = 1.0
+		obj.addProperty("App::PropertyEnumeration", "ScaleMode", "Profile", "Apply the scale as a transformation of the unit chord wire or by rewriting its points").ScaleMode = ["Transform", "Points"]
+		obj.addProperty("App::PropertyEnumeration", "Resampling", "Resampling", "Spacing of the resampled points, None to keep the points of the file").Resampling = ["None"] + ResampleSpacings
+		obj.addProperty("App::PropertyInteger", "PointCount", "Resampling", "Number of resampled points, 0 to get it from the tolerance").PointCount = 0
+		obj.addProperty("App::PropertyInteger", "MatchedPointCount", "Resampling", "PointCount given by the wings to match their sections", 0, True, True)
+		obj.addProperty("App::PropertyFloat", "Tolerance", "Resampling", "Max distance between the points of the file and the resampled profile, in fraction of the chord").Tolerance = 0.0002
+		obj.addProperty("App::PropertyEnumeration", "WireType", "Profile", "Polygon through the points or one BSpline fitted on them, with the Transform scale mode. Tools using the points of the wire, as the leading edge ones, need a Polygon").WireType = ProfileWireTypes
+		obj.addProperty("App::PropertyFloat", "FitTolerance", "Profile", "Tolerance of the BSpline approximation in fraction of the chord, 0 to interpolate the points. The PeriodicBSpline always interpolates them").FitTolerance = 0.0
+		obj.addProperty("App::PropertyEnumeration", "Representation", "Representation", "Points of the file, or CST coefficients fitted on them and evaluated at PointCount cosine spaced points").Representation = ["Points", "CST"]
+		obj.addProperty("App::PropertyInteger", "CSTOrder", "Representation", "Order of the Bernstein polynomials of the CST, order + 1 coefficients per surface").CSTOrder = CSTOrder
+		obj.addProperty("App::PropertyFloatList", "CSTCoefficients", "Representation", "CST coefficients of the upper then lower surface, then upper and lower trailing edge ordinates", 1)
+		obj.addProperty("App::PropertyFloat", "CSTFitError", "Representation", "Max distance between the points of the file and the CST profile, in fraction of the chord", 1)
 		obj.addProperty("App::PropertyVectorList","Points","Profile","Points of the profile", 1)
 		obj.addProperty("App::PropertyLink","Wire","Profile","Wire build from the profile", 1)
 		self.createWire(obj)
 		obj.Proxy = self
 
+	def loadPoints(self, fp):
+		if getattr(fp, "Representation", "Points") == "CST":
+			coords = evalCST(self.cstCoefficients(fp), fp.PointCount if fp.PointCount > 0 else CSTPointCount)
+		else:
+			userMsg("Loading root points from file...")
+			coords = getProfileCoords(fp.File)
+			spacing = getattr(fp, "Resampling", "None")
+			if spacing != "None":
+				coords = resampleProfile(coords, fp.PointCount, fp.Tolerance, spacing)
+		points = profileVectors(coords)
+		# delete last point if it's the same as first one
+		if len(points) > 1 and points[0].sub(points[len(points)-1]).Length <= 1.e-14: points.pop()
+		fp.Points = points
+
+	def cstCoefficients(self, fp):
+		'''CST coefficients of the profile, fitted on the points of the file the first time'''
+		if len(fp.CSTCoefficients) == 0:
+			userMsg("Fitting CST coefficients on the points of the file...")
+			coords = getProfileCoords(fp.File)
+			coeffs = fitCST(coords, fp.CSTOrder)
+			fp.CSTFitError = chordError(coords, evalCST(coeffs, max(CSTPointCount, 2 * len(coords))))
+			fp.CSTCoefficients = [float(c) for c in coeffs]
+		return fp.CSTCoefficients
+
+	def scaleMode(self, fp):
+		# profiles of older documents have no ScaleMode and a Draft wire
+		return fp.ScaleMode if hasattr(fp, "ScaleMode") else "Points"
+
+	def makeWire(self, fp):
+		if self.scaleMode(fp) == "Transform":
+			wire = makeProfileWire(fp.Points, fp.Scale, getattr(fp, "WireType", "Polygon"), getattr(fp, "FitTolerance", 0.0))
+		else:
+			wireP = Part.makePolygon(self.scaledPoints(fp), True)
+			wire = Draft.makeWire(wireP, True, False)
+		wire.Label = "ProfileWire"
+		return wire
+
 	def createWire(self, fp):
 		#############################
 		# Dwire creation
 		#############################
 		# get the points from the root profile and make the wire
-		userMsg("Loading root points from file...")
-		points=[]
-		points = getPoints(fp.File)
-		e = fp.Scale
-		for p in points:
-			p.x = p.x * e
-			p.y = p.y * e
-		# delete last point if it's the same as first one
-		if points[0].sub(points[len(points)-1]).Length <= 1.e-14: points.remove([len(points)-1])
-		fp.Points = points
-		wireP = Part.makePolygon(fp.Points, True)
-		wire = Draft.makeWire(wireP, True, False)
-		wire.Label = "ProfileWire"
+		self.loadPoints(fp)
+		fp.Wire = self.makeWire(fp)
+
+	def replaceWire(self, fp):
+		'''Build the wire of the current scale mode and link its users to it instead of the old one'''
+		old = fp.Wire
+		wire = self.makeWire(fp)
+		wire.Placement = old.Placement
+		for obj in old.InList:
+			if obj == fp: continue
+			with changeBatch(obj):
+				for prop in obj.PropertiesList:
+					ptype = obj.getTypeIdOfProperty(prop)
+					if ptype == "App::PropertyLink" and obj.getPropertyByName(prop) == old:
+						setattr(obj, prop, wire)
+					elif ptype == "App::PropertyLinkList" and old in obj.getPropertyByName(prop):
+						setattr(obj, prop, [wire if o == old else o for o in obj.getPropertyByName(prop)])
 		fp.Wire = wire
-				
+		FreeCAD.ActiveDocument.removeObject(old.Name)
+
+	@coalescedChanges
 	def onChanged(self, fp, prop):
 		# Do something when a property has changed
 #		msgCsl(self.__class__.__name__ + " class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
 		if prop == "File":
-			fp.Points = getPoints(fp.File)
+			if hasattr(fp, "CSTCoefficients"): fp.CSTCoefficients = []
+			self.loadPoints(fp)
 			self.updateWire(fp)
-		if prop == "Scale":
+			self.matchWings(fp)
+		if prop in ["Representation", "CSTOrder"] and hasattr(fp, "Wire") and hasattr(fp, "CSTFitError"):
+			if prop == "CSTOrder": fp.CSTCoefficients = []
+			self.pointsStatus(fp)
+			self.loadPoints(fp)
 			self.updateWire(fp)
-				
+			self.matchWings(fp)
+		if prop in ["Resampling", "PointCount", "Tolerance"] and hasattr(fp, "Wire") and hasattr(fp, "Tolerance"):
+			self.loadPoints(fp)
+			self.updateWire(fp)
+			self.matchWings(fp)
+		if prop == "Scale":
+			self.updateWire(fp, False)
+		if prop == "WireType" and hasattr(fp, "FitTolerance"): fitToleranceMode(fp, fp.WireType)
+		if prop in ["WireType", "FitTolerance"] and hasattr(fp, "Wire") and hasattr(fp, "FitTolerance"):
+			self.updateWire(fp, False)
+		if prop == "ScaleMode" and hasattr(fp, "Wire"):
+			if fp.Wire != None and isProfileWire(fp.Wire) != (fp.ScaleMode == "Transform"):
+				self.replaceWire(fp)
+
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
-	
-	def updateWire(self, fp):
+		log.debug("class %s, execute", self.__class__.__name__)
+		if self.pointsStatus(fp) and len(fp.Points) == 0:
+			self.loadPoints(fp)
+			self.updateWire(fp)
+
+	def onDocumentRestored(self, fp):
+		# the points of a CST profile are not saved, they are evaluated again from its coefficients
+		if self.pointsStatus(fp) and len(fp.Points) == 0 and len(fp.CSTCoefficients) > 0:
+			self.loadPoints(fp)
+			fp.purgeTouched()
+
+	def pointsStatus(self, fp):
+		'''Points are not saved with the document in the CST representation, return True then'''
+		cst = getattr(fp, "Representation", "Points") == "CST"
+		# the property status can't be changed before FreeCAD 0.19, the points are saved then
+		if hasattr(fp, "setPropertyStatus"): fp.setPropertyStatus("Points", "Transient" if cst else "-Transient")
+		return cst
+
+	def matchWings(self, fp):
+		'''Give the other profile of the wings using this one its number of points'''
+		for obj in fp.InList:
+			if hasattr(obj, "Proxy") and obj.Proxy.__class__.__name__ == "Wing":
+				obj.Proxy.matchSections(obj, fp)
+
+	def scaledPoints(self, fp):
+		pts = []
+		for p in fp.Points:
+			pts.append(Vector(p.x * fp.Scale,p.y * fp.Scale, 0))
+		return pts
+
+	def updateWire(self, fp, pointsChanged = True):
 		if hasattr(fp, "Wire"):
-			pts = []
-			for p in fp.Points:
-				pts.append(Vector(p.x * fp.Scale,p.y * fp.Scale, 0))
-			fp.Wire.Points = pts
+			if isProfileWire(fp.Wire):
+				# the wire keeps the unit chord points, only its scale transformation changes
+				if pointsChanged: fp.Wire.Points = fp.Points
+				fp.Wire.Scale = float(fp.Scale)
+				if hasattr(fp, "WireType"):
+					if fp.Wire.Type != fp.WireType: fp.Wire.Type = fp.WireType
+					if fp.Wire.FitTolerance != fp.FitTolerance: fp.Wire.FitTolerance = fp.FitTolerance
+			else:
+				fp.Wire.Points = self.scaledPoints(fp)
 			#FreeCADGui.SendMsgToActiveView("ViewFit")
 
 	def recompute(self, fp):
-		self.onChanged(fp, "Scale")
+		self.updateWire(fp)
 
 class ViewProviderProfile(ViewProviderGeneric):
 
@@ -158,10 +378,115 @@ class ViewProviderProfile(ViewProviderGeneric):
 		doc.removeObject(obj.Wire.Name)
 		return True
 
+class ProfileWire:
+	'''Wire of a profile keeping the unit chord points: the scale is applied to the polygon
+	built once from the points, so that a scale change doesn't rewrite any point. Scaling a copy
+	of the polygon still costs one pass over its vertexes, the recomputes at an unchanged scale are skipped.
+	Points are not the model geometry, their number and order are the ones of the polygon vertexes,
+	the coordinates are read from the shape (Vertexes, WireData).'''
+
+	def __init__(self, obj):
+		obj.addProperty("App::PropertyVectorList","Points","ProfileWire","Unit chord points of the wire", 1)
+		obj.addProperty("App::PropertyBool","Closed","ProfileWire","Close the wire").Closed = True
+		obj.addProperty("App::PropertyFloat","Scale","ProfileWire","Scale of the unit chord points", 1).Scale = 1.0
+		obj.addProperty("App::PropertyEnumeration","Type","ProfileWire","Polygon through the points or BSpline fitted on them").Type = ProfileWireTypes
+		obj.addProperty("App::PropertyFloat","FitTolerance","ProfileWire","Tolerance of the BSpline approximation in fraction of the chord, 0 to interpolate the points. The PeriodicBSpline always interpolates them").FitTolerance = 0.0
+		obj.addProperty("App::PropertyFloat","FitError","ProfileWire","Max distance between the points and the BSpline, in fraction of the chord", 1).FitError = 0.0
+		self.unitShape = None
+		obj.Proxy = self
+
+	def onChanged(self, fp, prop):
+		if prop in ["Points", "Closed", "Type", "FitTolerance"]:
+			self.unitShape = None
+		if prop == "Type" and hasattr(fp, "FitTolerance"): fitToleranceMode(fp, fp.Type)
+		if prop == "Shape":
+			# set by execute, which then records its scale, or restored by an undo
+			self.shapeScale = None
+
+	def execute(self, fp):
+		if len(fp.Points) < 2: return
+		if getattr(self, "unitShape", None) is None:
+			self.unitShape = self.makeUnitShape(fp)
+			self.shapeScale = None
+		if getattr(self, "shapeScale", None) == fp.Scale: return
+		# a placement can't scale, the scale is one similarity transformation of the unit shape geometry,
+		# which keeps its lines as lines (transformGeometry would make them BSplines)
+		shape = self.unitShape.copy()
+		shape.scale(fp.Scale)
+		plm = fp.Placement
+		fp.Shape = shape
+		fp.Placement = plm
+		self.shapeScale = fp.Scale
+
+	def makeUnitShape(self, fp):
+		wtype = getattr(fp, "Type", "Polygon")
+		if wtype == "Polygon":
+			return Part.makePolygon(fp.Points, fp.Closed)
+		shape, error = makeProfileBSpline(fp.Points, fp.FitTolerance, wtype == "PeriodicBSpline")
+		if abs(fp.FitError - error) > 1e-12: fp.FitError = error
+		log.debug("%s BSpline fit error: %s of chord", fp.Label, error)
+		return shape
+
+	def __getstate__(self):
+		return None
+
+	def __setstate__(self, state):
+		self.unitShape = None
+		self.shapeScale = None
+		return None
+
+class ViewProviderProfileWire:
+
+	def __init__(self, vobj):
+		vobj.Proxy = self
+
+	def attach(self, vobj):
+		self.Object = vobj.Object
+
+	def getIcon(self):
+		return iconPath + 'Profile-icon.svg'
+
+	def __getstate__(self):
+		return None
+
+	def __setstate__(self, state):
+		return None
+
+def isProfileWire(obj):
+	return obj != None and hasattr(obj, "Proxy") and obj.Proxy.__class__.__name__ == "ProfileWire"
+
+def fitToleranceMode(fp, wtype):
+	'''The periodic BSpline goes through the points, its FitTolerance is read only'''
+	fp.setEditorMode("FitTolerance", 1 if wtype == "PeriodicBSpline" else 0)
+
+def makeProfileWire(points, scale = 1.0, wtype = "Polygon", tolerance = 0.0):
+	obj = FreeCAD.ActiveDocument.addObject("Part::Part2DObjectPython", "ProfileWire")
+	ProfileWire(obj)
+	if FreeCAD.GuiUp:
+		ViewProviderProfileWire(obj.ViewObject)
+	obj.Points = points
+	obj.Scale = float(scale)
+	obj.Type = wtype
+	obj.FitTolerance = tolerance
+	obj.Proxy.execute(obj)
+	return obj
+
+def hasPointCount(profile):
+	'''True if the number of points of the profile is its PointCount'''
+	return getattr(profile, "Representation", "Points") == "CST" or profile.Resampling != "None"
+
+def pointCountSet(profile):
+	'''True if the PointCount of the profile was set by the user, not left to 0 or given by the section matching'''
+	return profile.PointCount > 0 and profile.PointCount != getattr(profile, "MatchedPointCount", 0)
+
 class Wing:
 
+	inputLinks = ["RootProfile", "TipProfile"]
+	changeOutputs = ["Loft"]
+	updateProps = ["Length", "TipXOffset", "TipYOffset", "TipAngle"]
+
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyLength", "Length", "Wing", "Length of the wing").Length = 500.0
 		obj.addProperty("App::PropertyDistance", "TipXOffset", "Tip", "Tip offset in X from root wire").TipXOffset = 0.0
 		obj.addProperty("App::PropertyDistance", "TipYOffset", "Tip", "Tip offset in Y from root wire").TipYOffset = 0.0
@@ -170,16 +495,21 @@ class Wing:
 		obj.addProperty("App::PropertyLink","TipProfile","Wing","Profile of the wing tip")
 		obj.addProperty("App::PropertyLink","RootProfile","Wing","Profile of the wing root")
 		obj.addProperty("App::PropertyLink","Loft","Wing","Name of the wing's loft", 1)
+		obj.addProperty("App::PropertyBool", "MatchSections", "Wing", "Resample root and tip profiles to the same number of points").MatchSections = True
+		obj.addProperty("App::PropertyFloat", "PreviewDelay", "Wing", "While the wing is edited, the loft is a ruled shell and the smooth solid is built after this idle time in seconds. 0 to always build the smooth solid").PreviewDelay = 1.0
 		self.rName = ""
 		self.tName = ""
 		obj.Proxy = self
 				
+	@coalescedChanges
 	def onChanged(self, fp, prop):
 		# Do something when a property has changed
 #		msgCsl(self.__class__.__name__ + " class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
 		if prop in ["Length", "TipXOffset", "TipYOffset", "TipAngle"] and self.check(fp):
 			if hasattr(fp, "TipYOffset"):
+				self.editing = True
 				self.updatePosition(fp)
+				self.updateLoft(fp)
 		if prop in ["RootProfile", "TipProfile"] and self.check(fp):
 #			msgCsl("prop in RootProfile...")
 			if fp.RootProfile.Name != self.rName:
@@ -188,12 +518,15 @@ class Wing:
 			if fp.TipProfile.Name != self.tName:
 				self.tName = fp.TipProfile.Name
 				self.updatePosition(fp)
+			self.updateLoft(fp)
+		if prop == "MatchSections":
+			self.matchSections(fp)
 		if prop == "MakeLoft":
 			if fp.MakeLoft:
 				self.createLoft(fp)
-			else:
-				# remove Loft
-				FreeCAD.ActiveDocument.removeObject(fp.Loft.Name)		
+			elif fp.Loft != None and FreeCAD.GuiUp:
+				# the loft is only hidden, it will be reused
+				fp.Loft.ViewObject.Visibility = False
 
 	def check(self, fp):
 		if hasattr(fp, "RootProfile") and hasattr(fp, "TipProfile"):
@@ -205,20 +538,79 @@ class Wing:
 			return False
 
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
+		log.debug("class %s, execute", self.__class__.__name__)
+
+	def matchSections(self, fp, source = None):
+		'''Give the root and tip profiles the number of points of source, by default the one of most points of
+		the profiles having a PointCount, a user set one first, so that the loft gets matched sections. The points
+		of a profile without resampling and a PointCount set by the user are kept, the mismatch is reported.'''
+		if not getattr(fp, "MatchSections", False) or not self.check(fp): return
+		profiles = [fp.RootProfile, fp.TipProfile]
+		if not all(hasattr(p, "Resampling") for p in profiles): return
+		counted = [p for p in profiles if hasPointCount(p)]
+		if source not in profiles:
+			if len(counted) == 0: return
+			source = max(counted, key = lambda p: (pointCountSet(p), len(p.Points)))
+		count = len(source.Points)
+		for p in profiles:
+			if p == source or len(p.Points) == count: continue
+			if hasPointCount(p) and not pointCountSet(p):
+				if hasattr(p, "MatchedPointCount"): p.MatchedPointCount = count
+				p.PointCount = count
+			elif hasPointCount(p):
+				log.warning("%s: %s has %d points and %s a PointCount of %d set by the user, kept, the loft sections don't match",
+						fp.Label, source.Label, count, p.Label, p.PointCount)
+			else:
+				log.warning("%s: %s has %d points and %s %d, the loft sections don't match, set a Resampling on %s",
+						fp.Label, source.Label, count, p.Label, len(p.Points), p.Label)
 
 	def createLoft(self, fp):
 		#############################
 		# Wing's loft creation
 		#############################
-		AileBis = FreeCAD.ActiveDocument.addObject('Part::Loft','Loft')
-		AileBis.Label = "Loft_Wing"
-		fp.Loft = AileBis
-		AileBis.Sections = [fp.RootProfile.Wire,fp.TipProfile.Wire]
-		AileBis.Solid = True
-		AileBis.Ruled = False
-		FreeCAD.ActiveDocument.recompute()
+		if fp.Loft == None:
+			fp.Loft = makeWingLoft()
+		elif FreeCAD.GuiUp:
+			fp.Loft.ViewObject.Visibility = True
+		# the wing, then the objects depending on its loft, and the document recomputed once
+		getScheduler(fp.Document).run([fp.Name])
 		FreeCADGui.SendMsgToActiveView("ViewFit")
+
+	def previewing(self, fp):
+		'''True while the wing is edited and the smooth solid loft must wait for the idle time'''
+		return getattr(self, "editing", False) and getattr(fp, "PreviewDelay", 0.0) > 0 and FreeCAD.GuiUp
+
+	def updateLoft(self, fp):
+		'''Give the loft the section wires and, while the wing is edited, the ruled shell mode: the smooth solid
+		comes after PreviewDelay without edit. The loft builds its shape when the document is recomputed.'''
+		if not getattr(fp, "MakeLoft", False) or fp.Loft == None or not self.check(fp): return
+		wires = [fp.RootProfile.Wire, fp.TipProfile.Wire]
+		preview = self.previewing(fp)
+		if preview:
+			if not hasattr(self, "fullLoft") or self.fullLoft is None:
+				self.fullLoft = DelayedCall(lambda: self.previewDone(fp))
+			self.fullLoft.request(fp.PreviewDelay)
+		loft = fp.Loft
+		if loft.Sections != wires: loft.Sections = wires
+		if loft.Ruled != preview: loft.Ruled = preview
+		if loft.Solid == preview: loft.Solid = not preview
+
+	def buildFullLoft(self, fp):
+		'''Leave the preview: the next recompute builds the smooth solid loft'''
+		self.editing = False
+		if getattr(self, "fullLoft", None) is not None: self.fullLoft.cancel()
+		if fp.isValid(): self.updateLoft(fp)
+
+	def previewDone(self, fp):
+		'''Idle time after the last edit, build the smooth solid loft now'''
+		if fp.isValid(): getScheduler(fp.Document).run([fp.Name])
+
+	def __getstate__(self):
+		return {"rName" : self.rName, "tName" : self.tName}
+
+	def __setstate__(self, state):
+		if state: self.__dict__.update(state)
+		return None
 	
 	def updatePosition(self, fp):
 		if fp.RootProfile.Proxy.__class__.__name__ == "Profile" and fp.TipProfile.Proxy.__class__.__name__ == "Profile":
@@ -240,7 +632,11 @@ class Wing:
 			fp.TipProfile.Placement = place
 
 	def recompute(self, fp):
+		self.matchSections(fp)
 		self.onChanged(fp, "RootProfile")
+		self.buildFullLoft(fp)
+		# the objects updated after the wing slice its current loft
+		if getattr(fp, "MakeLoft", False) and fp.Loft != None: fp.Loft.recompute()
 #		msgCsl("Recompute wing")
 #		if self.check(fp): self.updatePosition(fp)
 
@@ -250,11 +646,183 @@ class ViewProviderWing(ViewProviderGeneric):
 	def getIcon(self):
 		return iconPath + 'Aile-icon.svg'
 		
+class WingLoft:
+	'''Loft of a wing through its section wires. It is built by its own execute, after the wires in the
+	document recompute, and only if the sections or the loft mode changed since the last build'''
+
+	def __init__(self, obj):
+		obj.addProperty("App::PropertyLinkList", "Sections", "Loft", "Section wires of the loft")
+		obj.addProperty("App::PropertyBool", "Solid", "Loft", "Make a solid").Solid = True
+		obj.addProperty("App::PropertyBool", "Ruled", "Loft", "Ruled loft").Ruled = False
+		obj.Proxy = self
+
+	def onChanged(self, fp, prop):
+		pass
+
+	def execute(self, fp):
+		wires = [w for w in fp.Sections if w != None]
+		if len(wires) < 2: return
+		key = fingerprint(fp.Solid, fp.Ruled, *wires)
+		if key == getattr(self, "loftKey", None) and fp.Shape != None and not fp.Shape.isNull():
+			log.debug("%s sections unchanged, loft kept", fp.Label)
+			return
+		plm = fp.Placement
+		fp.Shape = Part.makeLoft([w.Shape for w in wires], fp.Solid, fp.Ruled)
+		fp.Placement = plm
+		self.loftKey = key
+
+	def __getstate__(self):
+		return getattr(self, "loftKey", None)
+
+	def __setstate__(self, state):
+		self.loftKey = state
+		return None
+
+class ViewProviderWingLoft:
+
+	def __init__(self, vobj):
+		vobj.Proxy = self
+
+	def attach(self, vobj):
+		self.Object = vobj.Object
+
+	def getIcon(self):
+		return iconPath + 'Aile-icon.svg'
+
+	def __getstate__(self):
+		return None
+
+	def __setstate__(self, state):
+		return None
+
+def makeWingLoft():
+	obj = FreeCAD.ActiveDocument.addObject("Part::FeaturePython", "Loft")
+	WingLoft(obj)
+	if FreeCAD.GuiUp:
+		ViewProviderWingLoft(obj.ViewObject)
+	obj.Label = "Loft_Wing"
+	return obj
+
+
+class StationWing:
+	'''Wing made of several panels, defined by a table of stations: one value per station in each list.
+	The sections between the stations are interpolated all at once and the wing is one loft through them.'''
+
+	inputLinks = ["Profiles"]
+
+	def __init__(self, obj):
+		log.debug("class %s, __init__", self.__class__.__name__)
+		obj.addProperty("App::PropertyLinkList", "Profiles", "Stations", "Profile of each station")
+		obj.addProperty("App::PropertyFloatList", "Spans", "Stations", "Span position of each station, along Z")
+		obj.addProperty("App::PropertyFloatList", "Chords", "Stations", "Chord of each station, the profile scale if missing")
+		obj.addProperty("App::PropertyFloatList", "Sweeps", "Stations", "Leading edge offset in X of each station")
+		obj.addProperty("App::PropertyFloatList", "Twists", "Stations", "Twist of each station in degrees, around its leading edge")
+		obj.addProperty("App::PropertyFloatList", "Dihedrals", "Stations", "Dihedral in degrees of the panel ending at each station")
+		obj.addProperty("App::PropertyInteger", "Sections", "Loft", "Number of interpolated sections between two stations").Sections = 0
+		obj.addProperty("App::PropertyInteger", "PointCount", "Loft", "Number of points of the sections, 0 for the largest profile").PointCount = 0
+		obj.addProperty("App::PropertyBool", "Solid", "Loft", "Make a solid").Solid = True
+		obj.addProperty("App::PropertyBool", "Ruled", "Loft", "Ruled loft").Ruled = False
+		obj.Proxy = self
+
+	def stationValues(self, values, nb, default):
+		values = list(values)[:nb]
+		return numpy.array(values + list(default[len(values):nb]), dtype = float)
+
+	def stations(self, fp):
+		'''Arrays of the stations parameters, None if the table isn't usable'''
+		profiles = [p for p in fp.Profiles if hasattr(p, "Points") and len(p.Points) > 2]
+		nb = len(profiles)
+		if nb < 2 or nb != len(fp.Profiles):
+			log.warning("StationWing needs at least 2 profiles")
+			return None
+		spans = self.stationValues(fp.Spans, nb, [0.0] * nb)
+		if len(fp.Spans) < nb or numpy.any(numpy.diff(spans) <= 0):
+			userMsg(fp.Label + ": one increasing span position is needed per station")
+			return None
+		chords = self.stationValues(fp.Chords, nb, [float(p.Scale) for p in profiles])
+		sweeps = self.stationValues(fp.Sweeps, nb, [0.0] * nb)
+		twists = self.stationValues(fp.Twists, nb, [0.0] * nb)
+		heights = stationHeights(spans, self.stationValues(fp.Dihedrals, nb, [0.0] * nb))
+		return profiles, spans, chords, sweeps, twists, heights
+
+	def unitSections(self, fp, profiles, panel, t):
+		'''Unit chord points of all the sections, array (sections, points, 2)'''
+		count = fp.PointCount if fp.PointCount > 0 else max(len(p.Points) for p in profiles)
+		cst = [p.CSTCoefficients for p in profiles if getattr(p, "Representation", "Points") == "CST"]
+		if len(cst) == len(profiles) and len(set(len(c) for c in cst)) == 1 and len(set(c[-2] == c[-1] for c in cst)) == 1:
+			# blend the coefficients, not the points
+			sections = evalCSTSections(blendStations(cst, panel, t), count)
+			return sections[:, :count]
+		units = []
+		for p in profiles:
+			coords = numpy.array([(v.x, v.y) for v in p.Points])
+			# closed so that every section goes around the same way, the closing point is dropped after
+			coords = numpy.concatenate((coords, coords[:1]))
+			units.append(resampleProfile(coords, count)[:count])
+		return blendStations(units, panel, t)
+
+	def execute(self, fp):
+		log.debug("class %s, execute", self.__class__.__name__)
+		stations = self.stations(fp)
+		if stations is None: return
+		profiles, spans, chords, sweeps, twists, heights = stations
+		# the placement only moves the shape, it isn't an input of the loft
+		key = fingerprint(objectFingerprint(fp, ["Placement"]), *profiles)
+		if key == getattr(self, "loftKey", None) and fp.Shape != None and not fp.Shape.isNull():
+			log.debug("%s stations unchanged, loft kept", fp.Label)
+			return
+		z, panel, t = spanPositions(spans, max(0, fp.Sections))
+		unit = self.unitSections(fp, profiles, panel, t)
+		sections = placeSections(unit, z, numpy.interp(z, spans, chords), numpy.interp(z, spans, sweeps),
+								numpy.interp(z, spans, heights), numpy.interp(z, spans, twists))
+		wires = [Part.makePolygon([Vector(*p) for p in sec] + [Vector(*sec[0])]) for sec in sections.tolist()]
+		plm = fp.Placement
+		fp.Shape = Part.makeLoft(wires, fp.Solid, fp.Ruled)
+		fp.Placement = plm
+		self.loftKey = key
+
+	def onChanged(self, fp, prop):
+		pass
+
+	def __getstate__(self):
+		return getattr(self, "loftKey", None)
+
+	def __setstate__(self, state):
+		self.loftKey = state
+		return None
+
+class ViewProviderStationWing:
+
+	def __init__(self, vobj):
+		vobj.Proxy = self
+
+	def attach(self, vobj):
+		self.Object = vobj.Object
+
+	def getIcon(self):
+		return iconPath + 'Aile-icon.svg'
+
+	def claimChildren(self):
+		if hasattr(self, "Object"):
+			return self.Object.Profiles
+		return []
+
+	def __getstate__(self):
+		return None
+
+	def __setstate__(self, state):
+		return None
+
+refFaceCache = {}   # (document, object): (face key, face in the object frame, origin)
 
 class CoordSys:
-	
+
+	inputLinks = ["LinkedObject"]
+	changeOutputs = ["LocalPlacement"]
+	updateProps = ["CenterType", "VertexNum", "Normal", "Direction", "Angle", "Type"]
+
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyLink","LinkedObject","LinkedObject","Object to link with the coordinate system")
 		obj.addProperty("App::PropertyEnumeration","CenterType","Settings","Either center of mass or vertexes").CenterType = ["MassCenter","Vertexes"]
 		obj.addProperty("App::PropertyFloat","VertexNum","Settings","Vertexes or intermediate point of vertexes couple").VertexNum = 0.0
@@ -281,8 +849,9 @@ class CoordSys:
 		obj.Proxy = self
 
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
+		log.debug("class %s, execute", self.__class__.__name__)
 
+	@coalescedChanges
 	def onChanged(self, fp, prop):
 		# Do something when a property has changed
 #		msgCsl(self.__class__.__name__ + " class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
@@ -299,55 +868,65 @@ class CoordSys:
 #			msgCsl("CoordSys class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
 			self.updatePlacement(fp)
 
-	def updateRefFace(self, fp):
-		ObjectOk = False
-		if fp.LinkedObject.TypeId == "Part::Extrusion":
-			nb = len(fp.LinkedObject.Base.Shape.Edges)
-			mface = fp.LinkedObject.Shape.Faces[nb]
-			ObjectEdges = mface.Edges
-			ObjectCenterOfMass = mface.CenterOfMass
-			ObjectOrigin = fp.LinkedObject.Shape.Vertex1.Point
-			ObjectOk = True
-		elif fp.LinkedObject.TypeId == "PartDesign::Pad":
-			nb = len(fp.LinkedObject.OutList[0].Shape.Edges)
-			mface = fp.LinkedObject.Shape.Faces[nb]
-#			ObjectEdges = fp.LinkedObject.OutList[0].Shape.Edges
-#			ObjectCenterOfMass = fp.LinkedObject.OutList[0].Shape.CenterOfMass
-			ObjectEdges = mface.Edges
-			ObjectCenterOfMass = mface.CenterOfMass
-			ObjectOrigin = fp.LinkedObject.OutList[0].AttachmentOffset.Base
-			ObjectOk = True
-		elif fp.LinkedObject.TypeId == "Part::Cylinder":
-			ObjectEdges = fp.LinkedObject.Shape.Face3.Edges
-			ObjectCenterOfMass = fp.LinkedObject.Shape.Face3.CenterOfMass
-			ObjectOrigin = ObjectCenterOfMass
-			ObjectOk = True
-		elif fp.LinkedObject.TypeId == "Part::Box":
-			ObjectEdges = fp.LinkedObject.Shape.Face5.Edges
-			ObjectCenterOfMass = fp.LinkedObject.Shape.Face5.CenterOfMass
-			ObjectOrigin = fp.LinkedObject.Shape.Vertex2.Point
-			ObjectOk = True
-		return ObjectOk, ObjectEdges, ObjectCenterOfMass, ObjectOrigin
+	def refFace(self, obj):
+		'''Reference face of the linked object and origin of the coordinate system, None if the type is not handled'''
+		if obj.TypeId == "Part::Extrusion":
+			return obj.Shape.Faces[len(obj.Base.Shape.Edges)], obj.Shape.Vertex1.Point
+		elif obj.TypeId == "PartDesign::Pad":
+			return obj.Shape.Faces[len(obj.OutList[0].Shape.Edges)], obj.OutList[0].AttachmentOffset.Base
+		elif obj.TypeId == "Part::Cylinder":
+			return obj.Shape.Face3, obj.Shape.Face3.CenterOfMass
+		elif obj.TypeId == "Part::Box":
+			return obj.Shape.Face5, obj.Shape.Vertex2.Point
+		return None, None
+
+	def localRefFace(self, obj):
+		'''Reference face and origin of the linked object in its own frame, cached while its shape keeps the same face'''
+		face, origin = self.refFace(obj)
+		if face is None: return None
+		key = (obj.TypeId, round(face.Area, 9), tuple(round(e.Length, 9) for e in face.Edges))
+		name = (obj.Document.Name, obj.Name)
+		entry = refFaceCache.get(name)
+		if entry is None or entry[0] != key:
+			inverse = obj.Placement.inverse()
+			face = face.copy()
+			face.Placement = inverse.multiply(face.Placement)
+			entry = refFaceCache[name] = (key, face, inverse.multVec(origin))
+		return entry[1], entry[2]
+
+	def updateRefFace(self, fp, placement):
+		'''Edges, center of mass of the reference face and origin the linked object would have with its placement,
+		or the attachment offset of the sketch of a pad, set to placement: the face of the object in its own frame
+		is moved there, no recompute needed'''
+		obj = fp.LinkedObject
+		local = self.localRefFace(obj)
+		if local is None:
+			return False, None, None, None
+		if obj.TypeId == "PartDesign::Pad":
+			# the pad follows its sketch, placed by its support and its attachment offset
+			move = obj.Placement.multiply(obj.OutList[0].AttachmentOffset.inverse()).multiply(placement)
+			origin = placement.Base
+		else:
+			move = placement
+			origin = move.multVec(local[1])
+		face = local[0].copy()
+		face.Placement = move.multiply(face.Placement)
+		return True, face.Edges, face.CenterOfMass, origin
 
 	def updatePlacement(self, fp):
 		if hasattr(fp, "LinkedObject"):
 			if fp.LinkedObject != None and hasattr(fp.LinkedObject.Shape, "Face1"):
-				ObjectOk, ObjectEdges, ObjectCenterOfMass, ObjectOrigin = self.updateRefFace(fp)
+				reference = fp.Tangent.Placement
+				ObjectOk, ObjectEdges, ObjectCenterOfMass, ObjectOrigin = self.updateRefFace(fp, reference)
 				if ObjectOk:
-					if fp.LinkedObject.TypeId == "PartDesign::Pad":
-						fp.LinkedObject.OutList[0].AttachmentOffset = fp.Tangent.Placement
-					else:
-						fp.LinkedObject.Placement = fp.Tangent.Placement
-					FreeCAD.ActiveDocument.recompute()
-					ObjectOk, ObjectEdges, ObjectCenterOfMass, ObjectOrigin = self.updateRefFace(fp)
 					Fract = int((round((round(fp.VertexNum,2) - int(fp.VertexNum)), 2) * 100 + 100)) % 100
-					msgCsl("ObjectOrigin : "+ format(ObjectOrigin))
+					log.debug("ObjectOrigin : %s", ObjectOrigin)
 					index = int((fp.VertexNum) % len(ObjectEdges))  # % len(ObjectEdges) to avoid error if VertexNum is set to high
 					mEdge = ObjectEdges[index]
 					longueur = mEdge.LastParameter - mEdge.FirstParameter
 					if mEdge.Orientation == "Reversed": Fract = 100 - Fract #;msgCsl("reverse fract")
 					Pt = mEdge.Curve.value(longueur * (100 - Fract) / 100) #mEdge.discretize(101)
-					msgCsl("Pt: " + format(Pt))
+					log.debug("Pt: %s", Pt)
 					if fp.CenterType == "MassCenter":
 						NewOrigin = ObjectCenterOfMass
 						mBend = PtsToVec(NewOrigin,Pt)
@@ -368,18 +947,18 @@ class CoordSys:
 							NewOrigin = mEdge.Curve.value(longueur * (100 - Fract) / 100) #mEdge.discretize(101)
 					else:
 						mRot = Rotation(mBend,fp.Bend.End.sub(fp.Bend.Start))
-					msgCsl("NewOrigin " + format(NewOrigin))
+					log.debug("NewOrigin %s", NewOrigin)
 					mTrans = PtsToVec(NewOrigin,ObjectOrigin)
-					msgCsl("mTrans " + format(mTrans))
+					log.debug("mTrans %s", mTrans)
 					mPlacement2 = FreeCAD.Placement(mTrans,mRot,NewOrigin)
 					fp.LocalPlacement = mPlacement2
 					# Add rotation angle from CoordSys property
 					mPlacement2 = Placement(VecNul, Rotation(fp.Normal.End.sub(fp.Normal.Start), fp.Angle), fp.Tangent.Start)
 					fp.LocalPlacement = mPlacement2.multiply(fp.LocalPlacement)
 					if fp.LinkedObject.TypeId == "PartDesign::Pad":
-						fp.LinkedObject.OutList[0].AttachmentOffset = fp.LocalPlacement.multiply(fp.LinkedObject.OutList[0].AttachmentOffset)
+						fp.LinkedObject.OutList[0].AttachmentOffset = fp.LocalPlacement.multiply(reference)
 					else:
-						fp.LinkedObject.Placement = fp.LocalPlacement.multiply(fp.LinkedObject.Placement)
+						fp.LinkedObject.Placement = fp.LocalPlacement.multiply(reference)
 	#				msgCsl("LocalPlacement: " + format(fp.LocalPlacement))
 
 	def recompute(self, fp):
@@ -400,10 +979,99 @@ class ViewProviderCoordSys(ViewProviderGeneric):
 		doc.removeObject(obj.Bend.Name)
 		return True
 
+ChordSyncing = set()   # objects whose chord positions are being synchronized
+ChordBatch = set()   # objects whose points are being moved together
+
+def addChordPositions(obj, points):
+	'''Add the chord position companion of the fractional vertex index properties of points, a list of
+	(index property, wire link property): positions in percent of chord survive a resampled or swapped profile'''
+	for index, link in points:
+		obj.addProperty("App::PropertyFloat", index + "Chord", "ChordPositions", "Position of " + index + " in percent of chord, positive on the upper surface, negative on the lower one")
+	obj.addProperty("App::PropertyBool", "KeepChordPositions", "ChordPositions", "When the wire changes, move the points to their chord positions").KeepChordPositions = True
+	obj.addProperty("App::PropertyStringList", "ChordWires", "ChordPositions", "Wire of each chord position", 0, True, True)
+	obj.ChordWires = [""] * len(points)
+
+def chordWireData(fp, link):
+	'''WireData of the wire linked by link if it's a polygon, else None'''
+	wire = fp.getPropertyByName(link)
+	if wire == None or not hasattr(wire, "Shape") or wire.Shape == None or wire.Shape.isNull(): return None
+	data = wireData(wire)
+	if len(data) < 3 or data.edges is not None: return None
+	return data
+
+def indexOfChord(data, index, chord):
+	'''Fractional vertex index of the chord position, the current index if it is already at that position'''
+	if abs(float(data.chordAt(index)[0]) - chord) <= 1e-9: return index
+	return float(data.indexAtChord(chord)[0])
+
+def setIfChanged(fp, prop, value):
+	if abs(fp.getPropertyByName(prop) - value) > 1e-9:
+		setattr(fp, prop, value)
+		return True
+	return False
+
+def moveToChordPositions(fp, points, link = None):
+	'''Move the points of the wire link (all the wires if None) to their chord positions, all together.
+	Points not positioned yet on their wire get the chord position of their index. Return True if a point moved.'''
+	wires = fp.ChordWires
+	if len(wires) != len(points): wires = [""] * len(points)
+	moved = False
+	ChordSyncing.add(fp.Name)
+	ChordBatch.add(fp.Name)
+	try:
+		for k, (index, wlink) in enumerate(points):
+			if link not in [None, wlink]: continue
+			data = chordWireData(fp, wlink)
+			if data is None: continue
+			if fp.KeepChordPositions and wires[k] != "":
+				moved |= setIfChanged(fp, index, indexOfChord(data, fp.getPropertyByName(index), fp.getPropertyByName(index + "Chord")))
+			else:
+				setIfChanged(fp, index + "Chord", float(data.chordAt(fp.getPropertyByName(index))[0]))
+			wires[k] = fp.getPropertyByName(wlink).Name
+	finally:
+		ChordSyncing.discard(fp.Name)
+		ChordBatch.discard(fp.Name)
+	if wires != fp.ChordWires: fp.ChordWires = wires
+	return moved
+
+def chordPositionChanged(fp, prop, points):
+	'''Keep the index and chord position properties of points in step, to call first in onChanged.
+	A chord change moves the index, an index change updates the chord, a wire change moves the points.
+	Return True for the index changes of a move of several points, that the object must skip.'''
+	if not hasattr(fp, "ChordWires") or "Restore" in fp.State: return False
+	if fp.Name in ChordSyncing: return fp.Name in ChordBatch
+	for index, link in points:
+		if prop in [index, index + "Chord"]:
+			data = chordWireData(fp, link)
+			if data is None: return False
+			ChordSyncing.add(fp.Name)
+			try:
+				if prop == index:
+					setIfChanged(fp, index + "Chord", float(data.chordAt(fp.getPropertyByName(index))[0]))
+				else:
+					setIfChanged(fp, index, indexOfChord(data, fp.getPropertyByName(index), fp.getPropertyByName(index + "Chord")))
+			finally:
+				ChordSyncing.discard(fp.Name)
+			return False
+	if prop in [link for index, link in points]:
+		moveToChordPositions(fp, points, prop)
+	return False
+
+def syncChordPositions(fp, points):
+	'''Move the points to their chord positions on the current wires, to call from execute.
+	Return True if a point moved, the object has to be updated then.'''
+	if not hasattr(fp, "ChordWires") or "Restore" in fp.State: return False
+	return moveToChordPositions(fp, points)
+
 class Rod:
 
+	chordPoints = [("RootPoint", "RootWire"), ("TipPoint", "TipWire")]
+	inputLinks = ["RootWire", "TipWire", "CoordSystem"]
+	changeOutputs = []
+	updateProps = ["RootPoint", "TipPoint", "RootOffset", "TipOffset", "RootInwardOffset", "TipInwardOffset", "AutoRotate", "TangentType", "AngleOffset"]
+
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyLink", "RootWire","Root","Root wire linked to the rod")
 		obj.addProperty("App::PropertyLink", "TipWire","Tip","Tip wire linked to the rod")
 		obj.addProperty("App::PropertyLink", "CoordSystem","Rod","Local coordinate system of the rod")
@@ -428,6 +1096,7 @@ class Rod:
 		self.VecRodCenter = [0, 0, 0] #VecNul
 		self.ObjNameList = {"RootWire":"", "TipWire":"", "CoordSystem":""}
 		obj.TangentType = "Next"
+		addChordPositions(obj, self.chordPoints)
 		obj.Proxy = self
 
 	def check(self, fp):
@@ -442,8 +1111,10 @@ class Rod:
 								if len(fp.TipWire.Shape.Edges) > 0: test["All"] = True
 		return test
 
+	@coalescedChanges
 	def onChanged(self, fp, prop):
 		# Do something when a property has changed
+			if chordPositionChanged(fp, prop, self.chordPoints): return
 			if prop in ["RootPoint", "TipPoint", "RootOffset", "TipOffset", "RootInwardOffset",
 						"TipInwardOffset", "AutoRotate", "TangentType", "AngleOffset"]:
 #				msgCsl("Rod class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
@@ -458,21 +1129,14 @@ class Rod:
 							if self.check(fp)["Root"]: self.updatePosition(fp)
 
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
+		log.debug("class %s, execute", self.__class__.__name__)
+		if syncChordPositions(fp, self.chordPoints): self.recompute(fp)
 	
 	def calcVecRoot(self, fp):
 #		msgCsl("int(fp.RootPoint) "+ str(int(fp.RootPoint)))
 #		msgCsl("nb fp.RootWire.Shape.Edges: " + str(len(fp.RootWire.Shape.Edges)))
-		mEdge = fp.RootWire.Shape.Edges[int(fp.RootPoint)]
-#			msgCsl("mEdge "+ str(mEdge))
-		Fract = int((round(fp.RootPoint,2) - int(fp.RootPoint))*100)
-#			msgCsl("Fract "+ str(Fract))
-		if Fract > 0:
-			Pts = mEdge.discretize(101)
-			Pt = Pts[Fract]
-		else:
-			Pt = fp.RootWire.Shape.Vertexes[int(fp.RootPoint)].Point
-		msgCsl("VecRoot Pt "+ format(Pt))
+		Pt = DiscretizedPoint(fp.RootWire, fp.RootPoint)
+		log.debug("VecRoot Pt %s", Pt)
 		# Root tangent, curvature axis calculated with adjacent points:
 		VecRootTangent = tangentVec(fp.RootWire, int(fp.RootPoint), fp.TangentType)
 		VecRootNormal = normalVec(fp.RootWire, int(fp.RootPoint))
@@ -496,16 +1160,8 @@ class Rod:
 			self.calcVecDirRod(fp)
 
 	def calcVecTip(self, fp):
-		mEdge = fp.TipWire.Shape.Edges[int(fp.TipPoint)]
-#		msgCsl("mEdge "+ str(mEdge))
-		Fract = int((round(fp.TipPoint,2) - int(fp.TipPoint))*100)
-#		msgCsl("Fract "+ str(Fract))
-		if Fract > 0:
-			Pts = mEdge.discretize(101)
-			Pt = Pts[Fract]
-		else:
-			Pt = fp.TipWire.Shape.Vertexes[int(fp.TipPoint)].Point
-		msgCsl("VecTip Pt "+ format(Pt))
+		Pt = DiscretizedPoint(fp.TipWire, fp.TipPoint)
+		log.debug("VecTip Pt %s", Pt)
 		# Tip tangent, normal, curvature axis calculated with adjacent points:
 		VecTipTangent = tangentVec(fp.TipWire, int(fp.TipPoint), fp.TangentType)
 		VecTipNormal = normalVec(fp.TipWire, int(fp.TipPoint))
@@ -639,8 +1295,13 @@ class ViewProviderRod(ViewProviderGeneric):
 
 class WrapLeadingEdge:
 
+	chordPoints = [("StartPoint", "Wire"), ("EndPoint", "Wire")]
+	inputLinks = ["Wire"]
+	changeOutputs = ["Wrap", "CutWire", "StartPointObj", "EndPointObj"]
+	updateProps = ["StartPoint", "EndPoint", "Thickness", "Inward", "DeleteLoop", "Join"]
+
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyLink", "Wire", "LinkedObject", "Wire to wrap")
 		obj.addProperty("App::PropertyFloat","StartPoint", "Settings","Start point of the wrap").StartPoint = 0.0
 		obj.addProperty("App::PropertyFloat","EndPoint", "Settings","End point of the wrap").EndPoint = 1.0
@@ -650,98 +1311,87 @@ class WrapLeadingEdge:
 		obj.addProperty("App::PropertyBool", "Inward", "Settings", "Draw the wrap inward or backward").Inward = True
 		obj.addProperty("App::PropertyLink","StartPointObj","LinkedObject","", 0, True, True)
 		obj.addProperty("App::PropertyLink","EndPointObj","LinkedObject","", 0, True, True)
-#		obj.addProperty("App::PropertyBool", "DeleteLoop", "Settings", "Delete loop of wrap and cut wires").DeleteLoop = False
+		obj.addProperty("App::PropertyBool", "DeleteLoop", "Settings", "Delete loop of wrap and cut wires").DeleteLoop = False
+		obj.addProperty("App::PropertyEnumeration", "Join", "Settings", "Join of the offset segments at the outer corners").Join = OffsetJoins
 		self.WireLinked = False
+		addChordPositions(obj, self.chordPoints)
 		obj.Proxy = self
 
+	@coalescedChanges
 	def onChanged(self, fp, prop):
+		if chordPositionChanged(fp, prop, self.chordPoints): return
 		# Do something when a property has changed
 		if hasattr(fp, "Wire"):
 			if fp.Wire != None:
-				if prop in ["StartPoint", "EndPoint", "Thickness", "Inward"]:
+				if prop in ["StartPoint", "EndPoint", "Thickness", "Inward", "DeleteLoop", "Join"]:
 					if self.WireLinked:
-						self.updateWrap(fp, fp.Wire, fp.StartPoint, fp.EndPoint)
-						if fp.Inward: self.updateCutWire(fp.Wire, fp.Wrap, fp.CutWire, fp.StartPoint, fp.EndPoint)
-#						if fp.DeleteLoop: DeleteLoop(fp.CutWire)
+						curves = self.updateWrap(fp, fp.Wire, fp.StartPoint, fp.EndPoint)
+						if fp.Inward: self.updateCutWire(fp, fp.Wire, curves, fp.CutWire, fp.StartPoint, fp.EndPoint)
 				if prop == "Wire":
 					if not self.WireLinked:
 						self.createWrap(fp, fp.Wire, fp.StartPoint, fp.EndPoint)
 						self.WireLinked = True
 					elif hasattr(fp, "Wrap"):
-						self.updateWrap(fp, fp.Wire, fp.StartPoint, fp.EndPoint)
-						if fp.Inward: self.updateCutWire(fp.Wire, fp.Wrap, fp.CutWire, fp.StartPoint, fp.EndPoint)
-#						if fp.DeleteLoop: DeleteLoop(fp.CutWire)
+						curves = self.updateWrap(fp, fp.Wire, fp.StartPoint, fp.EndPoint)
+						if fp.Inward: self.updateCutWire(fp, fp.Wire, curves, fp.CutWire, fp.StartPoint, fp.EndPoint)
 
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
+		log.debug("class %s, execute", self.__class__.__name__)
+		if syncChordPositions(fp, self.chordPoints): self.recompute(fp)
+
+	def wrapCurves(self, fp, wire, start, end):
+		'''Points of the wire from start to end and their offset by the thickness, as arrays'''
+		data = wireData(wire)
+		values = [start] + list(range(int(start) + 1, int(end) + 1))
+		if end > int(end): values.append(end)
+		base = data.pointsAt(values)
+		sens = 1 if fp.Inward else -1
+		join = fp.Join if hasattr(fp, "Join") else "Miter"
+		return base, offsetPolyline(base, sens * fp.Thickness, data.normals()[int(start) % len(data)], join)
+
+	def wrapPoints(self, curves):
+		'''Closed wrap: the wire points, then the offset points backward'''
+		base, offset = curves
+		return [toVector(p) for p in base] + [toVector(p) for p in offset[::-1]]
 
 	def calculateWrapPoints(self, fp, wire, start, end):
 		pts = []
 		if wire != None and int(end) > int(start):
-			sens = 1 if fp.Inward else -1
-			pts.append(DiscretizedPoint(wire, start))
-#			nbpts = int(end) - int(start)
-			nbp = int(end) - int(start)
-			i = 1
-			while i < (nbp + 1):
-				pts.append(wire.Shape.Vertexes[int(start) + i].Point)
-				i += 1
-			if end > int(end):
-				pt = DiscretizedPoint(wire, end)
-				pts.append(pt)
-				nbp += 1
-				nbwire = len(wire.Shape.Vertexes)
-#				msgCsl("int(start): " + str(int(start)) + " int(end): " + str(int(end)))
-#				msgCsl("nbwire: " + str(nbwire) + " nbp: " + str(nbp))
-				if (int(start) + nbp) > (nbwire - 1):  # end point is on the last edge
-					vecdec = curveVec(wire, int(start) + nbp - 1, "Previous")
-					vecdec.normalize()
-					vecdec.multiply(sens * fp.Thickness)
-					pts.append(pts[nbp].add(vecdec))
-					nbp -= 1
-#					msgCsl ("int(start) + nbp: " + str(int(start) + nbp))
-#			nbpts = 2 * nbp #len(pts)
-			for i in range(nbp, 0, -1):
-				vecdec = curveVec(wire, int(start) + i, "Previous")
-				vecdec.normalize()
-				vecdec.multiply(sens * fp.Thickness)
-				pts.append(pts[i].add(vecdec))
-			vecdec = curveVec(wire, int(start), "Next")
-			vecdec.normalize()
-			vecdec.multiply(sens * fp.Thickness)
-			pts.append(pts[0].add(vecdec))			
+			pts = self.wrapPoints(self.wrapCurves(fp, wire, start, end))
 		return pts
 	
-	def calculateCutWirePoints(self, wire, wrap, start, end):
+	def withoutLoops(self, fp, pts):
+		'''Points of a closed wire, without their loops if DeleteLoop'''
+		if getattr(fp, "DeleteLoop", False) and len(pts) > 3:
+			pts, removed = removeLoops(pts, True)
+		return pts
+
+	def calculateCutWirePoints(self, wire, curves, start, end):
+		# curves are the wire and offset points of the wrap, before the loops are removed
 		pts2 = []
-		if wire != None and wrap != None and int(end) > int(start):
-			pts = wrap.Points
-			nbp = int(len(pts) / 2)
-			i = 0
-			while i <= int(start):
-				pts2.append(wire.Shape.Vertexes[i].Point)
-				i += 1
+		if wire != None and curves != None and int(end) > int(start):
+			base, offset = curves
+			points = wireData(wire).points
+			pts2 = [toVector(p) for p in points[:int(start) + 1]]
 			if start > int(start):  # if start point is inside edge
-				pts2.append(pts[0])
-			for i in range(2 * nbp - 1, nbp - 2, -1):  # end = nbp then -1 because of index start at 0, then -1 because range stops at end-1
-				pts2.append(pts[i])
-#			if end > int(end):
-#				pts2.append(pts[nbp])
-			for i in range(int(end) + 1, len(wire.Shape.Vertexes), +1):
-				pts2.append(wire.Shape.Vertexes[i].Point)
+				pts2.append(toVector(base[0]))
+			pts2 += [toVector(p) for p in offset]
+			pts2.append(toVector(base[-1]))
+			pts2 += [toVector(p) for p in points[int(end) + 1:]]
 		return pts2
 
 	def createWrap(self, fp, wire,  start,  end):
 		if wire != None and int(end) > int(start):
-			msgCsl("create wrap")
-			pts = self.calculateWrapPoints(fp, wire, start, end)
-			wrapobj = Draft.makeWire(pts, True, False)
+			log.debug("create wrap")
+			curves = self.wrapCurves(fp, wire, start, end)
+			pts = self.wrapPoints(curves)
+			wrapobj = Draft.makeWire(self.withoutLoops(fp, pts), True, False)
 			wrapobj.Label = "Wrap"
 			fp.Wrap = wrapobj
 			if fp.Inward:
-				msgCsl("create cut wire")
-				pts2 = self.calculateCutWirePoints(wire, wrapobj, start, end)
-				cutobj = Draft.makeWire(pts2, True, False)
+				log.debug("create cut wire")
+				pts2 = self.calculateCutWirePoints(wire, curves, start, end)
+				cutobj = Draft.makeWire(self.withoutLoops(fp, pts2), True, False)
 				cutobj.Label = "CutWire"
 				fp.CutWire = cutobj
 			if fp.StartPointObj == None:
@@ -759,7 +1409,8 @@ class WrapLeadingEdge:
 	
 	def updateWrap(self, fp, wire, start, end):
 		if wire != None and fp.Wrap != None and int(end) > int(start):
-			pts = self.calculateWrapPoints(fp, wire, start, end)
+			curves = self.wrapCurves(fp, wire, start, end)
+			pts = self.wrapPoints(curves)
 			wrappts = fp.Wrap.Points
 			nbwrap = len(wrappts)
 			nbpts = len(pts)
@@ -771,14 +1422,14 @@ class WrapLeadingEdge:
 			if nbpts > nbwrap:
 				for i in range(nbwrap, nbpts, +1):
 					wrappts.append(pts[i])   # pts[i] does not matter, it's just to increase the wire points number
-			fp.Wrap.Points = pts
-#			if fp.DeleteLoop: DeleteLoop(fp.Wrap)
+			fp.Wrap.Points = self.withoutLoops(fp, pts)
 			setPointCoord(fp.StartPointObj, DiscretizedPoint(fp.Wire, fp.StartPoint))
 			setPointCoord(fp.EndPointObj, DiscretizedPoint(fp.Wire, fp.EndPoint))
+			return curves
 
-	def updateCutWire(self, wire, wrap, cutwire, start, end):
-		if wire != None and wrap != None and int(end) > int(start):
-			pts = self.calculateCutWirePoints(wire, wrap, start, end)
+	def updateCutWire(self, fp, wire, curves, cutwire, start, end):
+		if wire != None and curves != None and int(end) > int(start):
+			pts = self.calculateCutWirePoints(wire, curves, start, end)
 			wrappts = cutwire.Points
 			nbwrap = len(wrappts)
 			nbpts = len(pts)
@@ -790,7 +1441,7 @@ class WrapLeadingEdge:
 			if nbpts > nbwrap:
 				for i in range(nbwrap, nbpts, +1):
 					wrappts.append(pts[i])   # pts[i] does not matter, it's just to increase the wire points number
-			cutwire.Points = pts
+			cutwire.Points = self.withoutLoops(fp, pts)
 
 	def recompute(self, fp):
 		self.onChanged(fp, "Wire")
@@ -812,9 +1463,14 @@ class ViewProviderWrapLeadingEdge(ViewProviderGeneric):
 	
 
 class LeadingEdge:
+
+	chordPoints = [("RootStartPoint", "RootWire"), ("RootEndPoint", "RootWire"), ("TipStartPoint", "TipWire")]
+	inputLinks = ["RootWire", "TipWire"]
+	changeOutputs = ["TipEndPoint", "Plane", "LeftCutRoot", "RightCutRoot", "LeftCutTip", "RightCutTip"]
+	updateProps = ["RootWire", "RootStartPoint", "RootEndPoint", "TipWire", "TipStartPoint", "CutType"]
 	
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyLink","RootWire","Root", "")
 		obj.addProperty("App::PropertyFloat","RootStartPoint", "Root","Start point of the root wire").RootStartPoint = 0.0
 		obj.addProperty("App::PropertyFloat","RootEndPoint", "Root","End point of the root wire").RootEndPoint = 0.0
@@ -829,10 +1485,12 @@ class LeadingEdge:
 		obj.addProperty("App::PropertyEnumeration", "CutType", "CutPlane", "Define wire to be created").CutType = ["Left", "Right", "Both"]
 		self.Initialized = {"Left" : False, "Right" : False}
 		obj.CutType = "Right"
+		addChordPositions(obj, self.chordPoints)
 		obj.Proxy = self
 
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
+		log.debug("class %s, execute", self.__class__.__name__)
+		if syncChordPositions(fp, self.chordPoints): self.recompute(fp)
 		
 	def check(self, fp):
 		if hasattr(fp, "RootWire") and hasattr(fp, "TipWire"):
@@ -841,7 +1499,9 @@ class LeadingEdge:
 					return True
 		else: return False
 		
+	@coalescedChanges
 	def onChanged(self, fp, prop):
+		if chordPositionChanged(fp, prop, self.chordPoints): return
 		# Do something when a property has changed
 #		msgCsl(self.__class__.__name__ + " class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
 		if self.check(fp) and prop in ["RootWire", "RootStartPoint", "RootEndPoint", "TipWire", "TipStartPoint", "CutType"]:
@@ -878,19 +1538,20 @@ class LeadingEdge:
 		mplane.Placement.move(vec2.multiply(-5 / vec2.Length))
 		fp.Plane = mplane
 
+	def cutPlane(self, fp):
+		'''Point and normal of the cutting plane, through the root start, root end and tip start points'''
+		rstart, rend = discretizedPoints(fp.RootWire, [fp.RootStartPoint, fp.RootEndPoint])
+		tstart = discretizedPoints(fp.TipWire, fp.TipStartPoint)[0]
+		return rstart, numpy.cross(tstart - rstart, rend - rstart)
+
 	def calculateTipEndPoint(self, fp):
 		self.updatePlane(fp)
-		mplane = fp.Plane
-		startindex = int(fp.TipStartPoint)
-		for i in range(startindex + 1, len(fp.TipWire.Shape.Vertexes) - 1, +1):
-			intersectPt = intersecLinePlane(fp.TipWire.Shape.Vertexes[i].Point, fp.TipWire.Shape.Vertexes[i + 1].Point, mplane.Shape)
-			vec1 = PtsToVec(intersectPt, fp.TipWire.Shape.Vertexes[i].Point)
-			vec2 = PtsToVec(intersectPt, fp.TipWire.Shape.Vertexes[i + 1].Point)
-			mdot = vec1.dot(vec2)
-			if mdot <= 0:  #intersection point is in edge if dot is negative (vectors are in opposite directions)
-				fp.TipEndPoint = i + vec1.Length / (vec1.Length + vec2.Length) # TipEndPoint is TipWire point index i + part of edge[i]
-				return True
-		return False
+		origin, normal = self.cutPlane(fp)
+		# TipEndPoint is the first crossing of the tip wire with the plane after the tip start point
+		crossings = wireData(fp.TipWire).planeCrossings(origin, normal, int(fp.TipStartPoint) + 1)[0]
+		if len(crossings) == 0: return False
+		fp.TipEndPoint = float(crossings[0])
+		return True
 
 	def createCutWires(self, fp):
 		if fp.RootEndPoint > fp.RootStartPoint + 1:
@@ -962,9 +1623,14 @@ class ViewProviderLeadingEdge(ViewProviderGeneric):
 
 
 class CutWire:
+
+	chordPoints = [("StartPoint", "Wire"), ("EndPoint", "Wire")]
+	inputLinks = ["Wire"]
+	changeOutputs = ["LeftCut", "RightCut", "StartPointObj", "EndPointObj"]
+	updateProps = ["Wire", "StartPoint", "EndPoint", "CutType"]
 	
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyLink","Wire","Wire", "")
 		obj.addProperty("App::PropertyFloat","StartPoint", "Wire","Start point of the root wire").StartPoint = 0.0
 		obj.addProperty("App::PropertyFloat","EndPoint", "Wire","End point of the root wire").EndPoint = 0.0
@@ -975,10 +1641,12 @@ class CutWire:
 		obj.addProperty("App::PropertyEnumeration", "CutType", "CutPlane", "Define wire to be created").CutType = ["Left", "Right", "Both"]
 		self.Initialized = {"Left" : False, "Right" : False}
 		obj.CutType = "Right"
+		addChordPositions(obj, self.chordPoints)
 		obj.Proxy = self
 
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
+		log.debug("class %s, execute", self.__class__.__name__)
+		if syncChordPositions(fp, self.chordPoints): self.recompute(fp)
 		
 	def check(self, fp):
 		if hasattr(fp, "Wire"):
@@ -987,12 +1655,14 @@ class CutWire:
 					return True
 		else: return False
 		
+	@coalescedChanges
 	def onChanged(self, fp, prop):
+		if chordPositionChanged(fp, prop, self.chordPoints): return
 		# Do something when a property has changed
 #		msgCsl(self.__class__.__name__ + " class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
 		if prop in ["Wire", "StartPoint", "EndPoint", "CutType"]:
 			if self.check(fp):
-				msgCsl("CutWire onChanged check&prop = true prop= " + str(prop))
+				log.debug("CutWire onChanged check&prop = true prop= %s", prop)
 				create = False
 				for mkey, mvalue in self.Initialized.items():
 					if (mkey == fp.CutType) or (fp.CutType == "Both"):
@@ -1008,14 +1678,14 @@ class CutWire:
 			type = fp.CutType
 			leftpts, rightpts = cutWire(fp.Wire, fp.StartPoint, fp.EndPoint, type)
 			if not self.Initialized["Right"]: #((type == "Right") or (type == "Both")) and (
-				msgCsl("createCutWires if right ok")
+				log.debug("createCutWires if right ok")
 				fp.RightCut = Draft.makeWire(rightpts, True, False)
-				msgCsl("createCutWires right makeWire")
+				log.debug("createCutWires right makeWire")
 				fp.RightCut.Label = "RightCut"
-				msgCsl("createCutWires right label change")
+				log.debug("createCutWires right label change")
 				self.Initialized["Right"] = True
 			if not self.Initialized["Left"]: #((type == "Left") or (type == "Both")) and (
-				msgCsl("Create left CutWire")
+				log.debug("Create left CutWire")
 				fp.LeftCut = Draft.makeWire(leftpts, True, False)
 				fp.LeftCut.Label = "LeftCut"
 				self.Initialized["Left"] = True
@@ -1078,8 +1748,12 @@ class ViewProviderCutWire(ViewProviderGeneric):
 
 class Section:
 
+	inputLinks = ["SlicedObject"]
+	changeOutputs = ["CutPlane", "Section", "planePlacement", "planeToX", "planeToNormal"]
+	updateProps = []
+
 	def __init__(self, obj):
-		msgCsl("class " + self.__class__.__name__ + ", __init__")
+		log.debug("class %s, __init__", self.__class__.__name__)
 		obj.addProperty("App::PropertyLink", "SlicedObject", "Section", "Sliced object")
 		obj.addProperty("App::PropertyFloat", "Offset", "Settings", "Distance from the object origin").Offset = 0.001
 		obj.addProperty("App::PropertyEnumeration", "RefPlane", "Settings", "Reference plane of the section").RefPlane = ["XY", "XZ", "YZ"]
@@ -1095,10 +1769,10 @@ class Section:
 		obj.Proxy = self
 
 	def execute(self, fp):
-		msgCsl("class " + self.__class__.__name__ + ", execute")
+		log.debug("class %s, execute", self.__class__.__name__)
 		
 	def check(self, fp):
-		msgCsl("check method starting")
+		log.debug("check method starting")
 		if hasattr(fp, "SlicedObject") and hasattr(fp, "planeToX") and hasattr(fp, "planeToNormal") and hasattr(fp, "planePlacement"):
 			if fp.SlicedObject != None:
 #				if hasattr(fp.SlicedObject, "Shape"):
@@ -1109,6 +1783,7 @@ class Section:
 #							msgCsl("Shape volume is under 0.001, slice abort")
 		else: return False
 		
+	@coalescedChanges
 	def onChanged(self, fp, prop):
 		# Do something when a property has changed
 #		msgCsl(self.__class__.__name__ + " class property change: " + str(prop) + "  Type of property :" + str(fp.getTypeIdOfProperty(prop)))
@@ -1127,7 +1802,7 @@ class Section:
 		if prop == "RefPlane":
 			if self.check(fp):
 				if fp.CutPlane == None:
-					msgCsl("Section plane not created")
+					log.debug("Section plane not created")
 					return
 				self.external = True
 				self.CalculateParam(fp)
@@ -1135,7 +1810,7 @@ class Section:
 				self.updateSection(fp)
 
 	def CalculateParam(self, fp):
-		msgCsl("CalculateParam method starting")
+		log.debug("CalculateParam method starting")
 		bbox = fp.SlicedObject.Shape.BoundBox
 		pos = Vector(bbox.XMin, bbox.YMin, bbox.ZMin)
 		vecX = PtsToVec(pos, Vector(bbox.XMax, bbox.YMin, bbox.ZMin))
@@ -1143,7 +1818,7 @@ class Section:
 		vecZ = PtsToVec(pos, Vector(bbox.XMin, bbox.YMin, bbox.ZMax))
 		i = 1
 		if fp.RefPlane == "XY":
-			msgCsl("refplane XY checked")
+			log.debug("refplane XY checked")
 			self.bboxLength = bbox.ZLength
 			self.bboxOrigin = bbox.ZMin
 			fp.planeToX = vecX
@@ -1151,7 +1826,7 @@ class Section:
 			length = bbox.XLength
 			width = bbox.YLength
 		elif fp.RefPlane == "XZ":
-			msgCsl("refplane XZ checked")
+			log.debug("refplane XZ checked")
 			self.bboxLength = bbox.YLength
 			self.bboxOrigin = bbox.YMin
 			fp.planeToX = vecX
@@ -1160,7 +1835,7 @@ class Section:
 			width = bbox.ZLength
 			i = -1
 		elif fp.RefPlane == "YZ":
-			msgCsl("refplane YZ checked")
+			log.debug("refplane YZ checked")
 			self.bboxLength = bbox.XLength
 			self.bboxOrigin = bbox.XMin
 			fp.planeToX = vecY
@@ -1183,7 +1858,7 @@ class Section:
 		return length, width
 	
 	def createPlane(self, fp, length, width):
-		msgCsl("createPlane method starting")
+		log.debug("createPlane method starting")
 		if fp.CutPlane == None:
 			mplane = FreeCAD.ActiveDocument.addObject("Part::Plane","Plane")
 			mplane.ViewObject.ShapeColor = (0.33,0.67,1.00)
@@ -1207,7 +1882,7 @@ class Section:
 
 	def updatePlane(self, fp, dist):
 		if hasattr(fp, "planePlacement"):
-			msgCsl("updatePlane method starting")
+			log.debug("updatePlane method starting")
 			mplane = fp.CutPlane
 			if dist != 0:
 				if dist >= self.bboxLength: dist = self.bboxLength
@@ -1218,7 +1893,7 @@ class Section:
 			fp.CutPlane = mplane
 
 	def createSection(self, fp):
-		msgCsl("createSection method starting")
+		log.debug("createSection method starting")
 		length, width = self.CalculateParam(fp)
 		if length * width == 0: return
 		self.createPlane(fp, length, width)
@@ -1235,7 +1910,7 @@ class Section:
 		del slice		
 	
 	def updateSection(self, fp):
-		msgCsl("updateSection method starting")
+		log.debug("updateSection method starting")
 		# in case of freecad file is loading, check plane is build
 		self.updatePlane(fp, fp.Offset)
 		if len(fp.CutPlane.Shape.Edges) == 0: return
@@ -1268,9 +1943,9 @@ class ViewProviderSection(ViewProviderGeneric):
 
 
 def createWing():
-	msgCsl("createWing method starting...")
+	log.debug("createWing method starting...")
 	sl = FreeCADGui.Selection.getSelectionEx()
-	msgCsl("Content of selection: " + str(len(sl)))
+	log.debug("Content of selection: %s", len(sl))
 	obj = FreeCAD.ActiveDocument.addObject("App::FeaturePython","Wing")  #FeaturePython
 	Wing(obj)
 	ViewProviderWing(obj.ViewObject,  "Aile-icon.svg")
@@ -1287,9 +1962,26 @@ def createWing():
 	FreeCAD.ActiveDocument.recompute()
 	FreeCADGui.SendMsgToActiveView("ViewFit")
 
+def createStationWing():
+	'''Wing with a station for each selected profile, spaced by the length of the default wing'''
+	log.debug("createStationWing method starting...")
+	sl = FreeCADGui.Selection.getSelectionEx()
+	profiles = [s.Object for s in sl if hasattr(s.Object, "Proxy") and s.Object.Proxy.__class__.__name__ == "Profile"]
+	obj = FreeCAD.ActiveDocument.addObject("Part::FeaturePython", "StationWing")
+	StationWing(obj)
+	if FreeCAD.GuiUp:
+		ViewProviderStationWing(obj.ViewObject)
+	if len(profiles) > 0:
+		obj.Profiles = profiles
+		obj.Spans = [500.0 * i for i in range(len(profiles))]
+		obj.Chords = [float(p.Scale) for p in profiles]
+		for p in profiles:
+			if hasattr(p.Wire, "ViewObject") and p.Wire.ViewObject != None: p.Wire.ViewObject.Visibility = False
+	FreeCAD.ActiveDocument.recompute()
+
 def createCoordSys():
 	sl = FreeCADGui.Selection.getSelectionEx()
-	msgCsl("Content of selection: " + str(len(sl)))
+	log.debug("Content of selection: %s", len(sl))
 	obj = FreeCAD.ActiveDocument.addObject("App::FeaturePython", "CoordSystem")
 	CoordSys(obj)
 	ViewProviderCoordSys(obj.ViewObject, "WF_Axes.svg")
@@ -1300,22 +1992,23 @@ def createCoordSys():
 	
 def createRod():
 	sl = FreeCADGui.Selection.getSelectionEx()
-	msgCsl("Content of selection: " + str(len(sl)))
+	log.debug("Content of selection: %s", len(sl))
 	obj = FreeCAD.ActiveDocument.addObject("App::FeaturePython","Rod")
 	Rod(obj)
 	ViewProviderRod(obj.ViewObject, "Rod-icon.svg")
 
 	if len(sl) > 0:
-		msgCsl("Wing found for linking Rod")
+		log.debug("Wing found for linking Rod")
 		wobj = sl[0].Object
 		if wobj.Proxy.__class__.__name__ == "Wing":
-			msgCsl("Wing type found in selection")
+			log.debug("Wing type found in selection")
 			if hasattr(wobj, "RootProfile"):
 				if wobj.RootProfile != None: obj.RootWire = wobj.RootProfile.Wire
 			if hasattr(wobj, "TipProfile"):
 				if wobj.TipProfile != None: obj.TipWire = wobj.TipProfile.Wire
-			obj.RootPoint = 1
-			obj.TipPoint = 1
+			with changeBatch(obj):
+				obj.RootPoint = 1
+				obj.TipPoint = 1
 		if len(sl) > 1:
 			wobj1, wobj2 = sl[:2]
 			if wobj2.Object.Proxy.__class__.__name__ == "CoordSys":
@@ -1328,38 +2021,41 @@ def createRod():
 				obj.RootWire = wobj1.Object
 				obj.TipWire = wobj2.Object
 				FreeCAD.ActiveDocument.recompute()
-				obj.RootPoint = 1
-				obj.TipPoint = 1
+				with changeBatch(obj):
+					obj.RootPoint = 1
+					obj.TipPoint = 1
 	return obj
 
 def createWrapLeadingEdge():
 	sl = FreeCADGui.Selection.getSelectionEx()
-	msgCsl("Content of selection: " + str(len(sl)))
+	log.debug("Content of selection: %s", len(sl))
 	obj = FreeCAD.ActiveDocument.addObject("App::FeaturePython", "WrapLeadingEdge")
 	WrapLeadingEdge(obj)
 	ViewProviderWrapLeadingEdge(obj.ViewObject, "WrapLeadingEdge-icon.svg")
-	obj.StartPoint = 1.0
-	obj.EndPoint = 2.0
+	with changeBatch(obj):
+		obj.StartPoint = 1.0
+		obj.EndPoint = 2.0
+		if len(sl) > 0:
+			wobj = sl[0]
+			if wobj.Object.Proxy.__class__.__name__ == "Profile":
+				log.debug("Wing type found in selection for linking WrapLeadingEdge")
+				obj.Wire = wobj.Object.Wire
+			elif wobj.TypeName == "Part::Part2DObjectPython":
+				obj.Wire = wobj.Object
 	if len(sl) > 0:
-		wobj = sl[0]
-		if wobj.Object.Proxy.__class__.__name__ == "Profile":
-			msgCsl("Wing type found in selection for linking WrapLeadingEdge")
-			obj.Wire = wobj.Object.Wire
-		elif wobj.TypeName == "Part::Part2DObjectPython":
-			obj.Wire = wobj.Object
 		return obj
 	else:
 		userMsg("No selection or selection is not a wing object")
 
 def createProfile():
-	msgCsl("createProfile method starting...")
+	log.debug("createProfile method starting...")
 	a = FreeCAD.ActiveDocument.addObject("App::FeaturePython","Profile")
 	Profile(a)
 	ViewProviderProfile(a.ViewObject, 'Profile-icon.svg')
 	a.Scale = 300
 
 def createLeadingEdge():
-	msgCsl("createLeadingEdge method starting...")
+	log.debug("createLeadingEdge method starting...")
 	sl = FreeCADGui.Selection.getSelectionEx()
 	obj = FreeCAD.ActiveDocument.addObject("App::FeaturePython","LeadingEdge")
 	LeadingEdge(obj)
@@ -1368,11 +2064,12 @@ def createLeadingEdge():
 		wobj1 = sl[0].Object
 		wobj2 = sl[1].Object
 		if wobj1.TypeId == wobj2.TypeId == "Part::Part2DObjectPython":
-			obj.RootWire = wobj1
-			obj.TipWire = wobj2
+			with changeBatch(obj):
+				obj.RootWire = wobj1
+				obj.TipWire = wobj2
 
 def createCutWire():
-	msgCsl("createCutWire method starting...")
+	log.debug("createCutWire method starting...")
 	sl = FreeCADGui.Selection.getSelectionEx()
 	obj = FreeCAD.ActiveDocument.addObject("App::FeaturePython","CutWire")
 	CutWire(obj)
@@ -1380,13 +2077,14 @@ def createCutWire():
 	if len(sl) > 0:
 		wobj = sl[0].Object
 		if wobj.TypeId == "Part::Part2DObjectPython":
-			obj.Wire = wobj
-			if len(wobj.Points) > 2:
-				obj.StartPoint = 1.0
-				obj.EndPoint = 3.0
+			with changeBatch(obj):
+				obj.Wire = wobj
+				if len(wobj.Points) > 2:
+					obj.StartPoint = 1.0
+					obj.EndPoint = 3.0
 
 def createSection():
-	msgCsl("createCutWire method starting...")
+	log.debug("createCutWire method starting...")
 	sl = FreeCADGui.Selection.getSelectionEx()
 	obj = FreeCAD.ActiveDocument.addObject("App::FeaturePython","Section")
 	Section(obj)
@@ -1396,29 +2094,172 @@ def createSection():
 		if wobj.Shape.Volume > 0.001:
 			obj.SlicedObject = wobj
 		else:
-			msgCsl("Shape volume is under 0.001, slice abort")
+			log.debug("Shape volume is under 0.001, slice abort")
+
+#############################
+# Recompute scheduler
+#############################
+
+WingClasses = ["Profile", "Wing", "StationWing", "CoordSys", "Rod", "CutWire", "LeadingEdge", "WrapLeadingEdge", "Section"]
+IgnoredChanges = ["Label", "Label2", "Visibility", "Proxy", "ExpressionEngine"]
+
+def isWingObject(obj):
+	return obj.Proxy.__class__.__name__ in WingClasses if hasattr(obj, "Proxy") else False
+
+def linkedObjects(obj, props):
+	'''Objects of the link and link list properties props of obj'''
+	res = []
+	for prop in props:
+		if hasattr(obj, prop):
+			value = obj.getPropertyByName(prop)
+			if isinstance(value, (list, tuple)):
+				res.extend(v for v in value if v is not None)
+			elif value is not None:
+				res.append(value)
+	return res
+
+class RecomputeScheduler:
+	'''Changed wing objects of a document, run() updates them, or the given ones, and the wing objects
+	depending on them once each, dependencies first, then recomputes the document once.
+	A wing object depends on the wing objects reached by its inputLinks, directly, through the objects
+	they own (their other links: wires, lofts, cut wires...) or through any other object in between.'''
+
+	def __init__(self, doc):
+		self.doc = doc
+		self.dirty = set()   # names of the changed wing objects not updated since
+		self.running = False
+
+	def markDirty(self, obj):
+		# changes made by the updates of run() are its own results
+		if not self.running: self.dirty.add(obj.Name)
+
+	def forget(self, obj):
+		self.dirty.discard(obj.Name)
+
+	def graph(self):
+		'''Names of the wing objects in document order and the names of the wing objects each one depends on'''
+		objects = [o for o in self.doc.Objects if isWingObject(o)]
+		owner = {}
+		for o in objects:
+			outputs = [p for p in o.PropertiesList if p not in o.Proxy.inputLinks
+					and o.getTypeIdOfProperty(p) in ["App::PropertyLink", "App::PropertyLinkList"]]
+			for t in linkedObjects(o, outputs):
+				owner.setdefault(t.Name, o.Name)
+		names = [o.Name for o in objects]
+		deps = {}
+		for o in objects:
+			deps[o.Name], seen = set(), set()
+			todo = linkedObjects(o, o.Proxy.inputLinks)
+			while todo:
+				t = todo.pop()
+				if t.Name in seen: continue
+				seen.add(t.Name)
+				if isWingObject(t):
+					deps[o.Name].add(t.Name)
+				elif t.Name in owner:
+					deps[o.Name].add(owner[t.Name])
+				else:
+					todo.extend(t.OutList)
+			deps[o.Name].discard(o.Name)
+		return names, deps
+
+	def order(self, names, deps, seeds):
+		'''Seeds and the wing objects depending on them, dependencies first and in document order otherwise'''
+		dependents = dict((n, []) for n in names)
+		for n in names:
+			for d in deps[n]:
+				if d in dependents: dependents[d].append(n)
+		todo, stack = set(), list(seeds)
+		while stack:
+			n = stack.pop()
+			if n not in todo:
+				todo.add(n)
+				stack.extend(dependents[n])
+		count = dict((n, len([d for d in deps[n] if d in todo])) for n in todo)
+		res = []
+		ready = [n for n in names if n in todo and count[n] == 0]
+		while ready:
+			n = ready.pop(0)
+			res.append(n)
+			for m in dependents[n]:
+				if m in todo:
+					count[m] -= 1
+					if count[m] == 0: ready.append(m)
+			ready.sort(key = names.index)
+		if len(res) < len(todo):
+			cycle = [n for n in names if n in todo and n not in res]
+			log.warning("Dependency cycle between %s, recomputed in document order", ", ".join(cycle))
+			res.extend(cycle)
+		return res
+
+	def pending(self, seeds = None):
+		'''Names of the wing objects run(seeds) would update, in that order'''
+		names, deps = self.graph()
+		seeds = self.dirty if seeds is None else seeds
+		return self.order(names, deps, [n for n in seeds if n in deps])
+
+	def run(self, seeds = None, recompute = True):
+		'''Update the seeds wing objects, the dirty ones by default, and their dependents, then recompute
+		the document. Return the names of the updated objects.'''
+		order = self.pending(seeds)
+		self.running = True
+		try:
+			for name in order:
+				obj = self.doc.getObject(name)
+				if obj is not None:
+					log.debug("Recompute %s %s", name, obj.Proxy.__class__.__name__)
+					obj.Proxy.recompute(obj)
+			if recompute: self.doc.recompute()
+		finally:
+			self.running = False
+			self.dirty.difference_update(order)
+		return order
+
+schedulers = {}
+
+def getScheduler(doc = None):
+	doc = doc or FreeCAD.ActiveDocument
+	if doc.Name not in schedulers or schedulers[doc.Name].doc is not doc:
+		schedulers[doc.Name] = RecomputeScheduler(doc)
+	return schedulers[doc.Name]
+
+class RecomputeObserver:
+	'''Document observer marking the changed wing objects dirty in the scheduler of their document'''
+
+	def slotChangedObject(self, obj, prop):
+		if prop not in IgnoredChanges and isWingObject(obj) and hasattr(obj, "Document"):
+			getScheduler(obj.Document).markDirty(obj)
+
+	def slotDeletedObject(self, obj):
+		scheduler = schedulers.get(obj.Document.Name) if hasattr(obj, "Document") else None
+		if scheduler is not None: scheduler.forget(obj)
+
+	def slotDeletedDocument(self, doc):
+		schedulers.pop(doc.Name, None)
+
+if hasattr(FreeCAD, "addDocumentObserver"):
+	# the observer of a previous load of the module is replaced
+	for observer in getattr(FreeCAD, "WingRecomputeObservers", []):
+		FreeCAD.removeDocumentObserver(observer)
+	FreeCAD.WingRecomputeObservers = [RecomputeObserver()]
+	FreeCAD.addDocumentObserver(FreeCAD.WingRecomputeObservers[0])
 
 def recomputeSelection():
-	'''Recompute wing objects in the order of the selection'''
-	sl = FreeCADGui.Selection.getSelectionEx()
-	if len(sl) > 0:
-		for s in sl:
-			obj = s.Object
-			if hasattr(obj, "Proxy"):
-				if obj.Proxy.__class__.__name__ in ["Profile", "Wing", "CoordSys", "CutWire", "LeadingEdge", "Rod", "Section", "WrapLeadingEdge"]:
-					obj.Proxy.recompute(obj)
-#					msgCsl("Recompute " + obj.Name + " " + obj.Proxy.__class__.__name__)
-					FreeCAD.ActiveDocument.recompute()
+	'''Recompute the selected wing objects, or without selection the ones changed since their last update,
+	and the ones depending on them, once each in dependency order, then the document once'''
+	if FreeCAD.ActiveDocument is None: return
+	selection = [s.Object.Name for s in FreeCADGui.Selection.getSelectionEx() if isWingObject(s.Object)]
+	getScheduler().run(selection or None)
 
 class CommandRecompute:
-	"""Recompute wing objects in the order of the selection"""
+	"""Recompute the selected or changed wing objects and their dependents in dependency order"""
 	
 	def GetResources(self):
 		icon = os.path.join( iconPath , 'RecomputeSelection.svg')
 		return {'Pixmap'  : icon , # the name of a svg file available in the resources
 			'MenuText': "Recompute selection" ,
-			'ToolTip' : """Recompute wing objects in the order of the selection.
-						   It could take time."""}
+			'ToolTip' : """Recompute the selected wing objects, or without selection the changed ones,
+						   and the ones depending on them, dependencies first. It could take time."""}
 
 	def Activated(self):
 		recomputeSelection()
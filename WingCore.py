@@ -0,0 +1,767 @@
+'''Numeric core of the Wing workbench: profile parsing and caching, resampling, CST,
+spanwise interpolation, polyline frames and fractional points, cuts, plane crossings,
+offsets and loop removal. It depends only on the standard library and NumPy, so it runs
+in worker processes, benchmarks and batch scripts without FreeCAD. Points are float arrays,
+WingLib adapts them to FreeCAD vectors and shapes.'''
+
+import os, sys, math, struct, threading
+from collections import OrderedDict
+import numpy
+import WingLog
+
+# names of "from WingCore import *", the modules, log and messageHandler stay in WingCore
+__all__ = ["ProfileCacheSize", "FractionTolerance", "ProfileBinaryExt", "ProfileBinaryMagic", "ProfileBinaryVersion", "ProfileBinaryHeader",
+	"msgCsl", "userMsg",
+	"parseProfile", "loadTextProfile", "binaryProfilePath", "writeProfileBinary", "mapProfileBinary", "readProfileBinary",
+	"hasFreshBinary", "loadProfile", "updateProfileBinary", "readProfile", "ProfileCache", "profileCache", "profileCacheInfo",
+	"getProfileCoords", "profileMetadata",
+	"ResampleSpacings", "ResampleMinPoints", "polylineLengths", "polylineCurvature", "chordError", "resampleSurface", "resampleProfile",
+	"CSTOrder", "CSTClassN1", "CSTClassN2", "CSTPointCount", "bernsteinMatrix", "cstMatrix", "fitCST", "cstOrder", "evalCST", "evalCSTSections",
+	"spanPositions", "blendStations", "placeSections", "stationHeights", "normalizedRows",
+	"PolylineData", "cutPolyline", "planeCrossings",
+	"OffsetJoins", "OffsetMiterLimit", "OffsetArcTolerance", "offsetPolyline", "planarCoords", "segmentCrossings", "trimLoops"]
+
+ProfileCacheSize = 64
+FractionTolerance = 1e-6   # fractional vertex indexes closer to the vertex are the vertex
+ProfileBinaryExt = ".wpb"
+ProfileBinaryMagic = b"WPRF"
+ProfileBinaryVersion = 1
+ProfileBinaryHeader = struct.Struct("<4sHHII")  # magic, version, reserved, point count, name length
+
+# messages go to the standard output, WingLib sends them to the FreeCAD console
+messageHandler = sys.stdout.write
+log = WingLog.getLogger("WingCore")
+
+def msgCsl(message):
+	log.debug(message)
+
+def userMsg(message):
+	messageHandler(message + "\n")
+
+def parseProfile(lines):
+	'''Return the coordinates of the airfoil text lines as a (n, 2) float64 array.
+	The first line is the airfoil name. Selig files (trailing edge, upper surface,
+	leading edge, lower surface) are returned as is, Lednicer files (point counts,
+	then upper and lower surfaces from the leading edge) are reordered as Selig.'''
+	tokens = " ".join(lines[1:]).replace(",", " ").split()
+	coords = None
+	if len(tokens) % 2 == 0:
+		try:
+			coords = numpy.array(tokens, dtype=float).reshape(-1, 2)
+		except ValueError:
+			coords = None
+	if coords is None:
+		# text mixed with the data: only keep the lines made of two numbers
+		values = []
+		for lin in lines[1:]:
+			fields = lin.replace(",", " ").split()
+			if len(fields) == 2:
+				try:
+					values.append((float(fields[0]), float(fields[1])))
+				except ValueError:
+					pass
+		coords = numpy.array(values, dtype=float).reshape(-1, 2)
+	if len(coords) > 0 and coords[0, 0] > 1.0 and coords[0, 1] > 1.0:
+		# Lednicer layout: first row holds the number of upper and lower points
+		nup, nlow = int(coords[0, 0]), int(coords[0, 1])
+		upper = coords[1:nup + 1]
+		lower = coords[nup + 1:nup + nlow + 1]
+		if len(lower) > 0 and len(upper) > 0 and (lower[0] == upper[0]).all():
+			lower = lower[1:]   # leading edge point is shared by both surfaces
+		coords = numpy.concatenate((upper[::-1], lower))
+	return numpy.ascontiguousarray(coords)
+
+def loadTextProfile(filename):
+	'''Read an airfoil .dat file in one pass and return its name and coordinates, see parseProfile'''
+	afile = open(filename, 'r')
+	try:
+		lines = afile.read().splitlines()
+	finally:
+		afile.close()
+	name = lines[0].strip() if len(lines) > 0 else ""
+	return name, parseProfile(lines)
+
+def binaryProfilePath(filename):
+	return filename + ProfileBinaryExt
+
+def writeProfileBinary(filename, coords, name = ""):
+	'''Write the binary sidecar of the profile file: header, name padded to 8 bytes,
+	then the x array and the y array, packed little endian float64'''
+	coords = numpy.asarray(coords, dtype = float)
+	bname = name.encode("utf-8")
+	bname += b"\0" * (-(ProfileBinaryHeader.size + len(bname)) % 8)
+	binfile = binaryProfilePath(filename)
+	afile = open(binfile, 'wb')
+	try:
+		afile.write(ProfileBinaryHeader.pack(ProfileBinaryMagic, ProfileBinaryVersion, 0, len(coords), len(bname)))
+		afile.write(bname)
+		afile.write(numpy.ascontiguousarray(coords.T, dtype = "<f8").tobytes())
+	finally:
+		afile.close()
+	return binfile
+
+def mapProfileBinary(binfile):
+	'''Memory map a binary profile and return its name and the (2, n) array of x and y rows'''
+	afile = open(binfile, 'rb')
+	try:
+		header = afile.read(ProfileBinaryHeader.size)
+		if len(header) < ProfileBinaryHeader.size:
+			raise ValueError("Truncated binary profile " + binfile)
+		magic, version, reserved, nbpts, namelen = ProfileBinaryHeader.unpack(header)
+		if magic != ProfileBinaryMagic or version != ProfileBinaryVersion:
+			raise ValueError("Not a binary profile " + binfile)
+		name = afile.read(namelen).rstrip(b"\0").decode("utf-8")
+	finally:
+		afile.close()
+	offset = ProfileBinaryHeader.size + namelen
+	if os.path.getsize(binfile) != offset + 16 * nbpts:
+		raise ValueError("Truncated binary profile " + binfile)
+	if nbpts == 0:
+		return name, numpy.zeros((2, 0))
+	return name, numpy.memmap(binfile, dtype = "<f8", mode = 'r', offset = offset, shape = (2, nbpts))
+
+def readProfileBinary(binfile):
+	name, xy = mapProfileBinary(binfile)
+	coords = numpy.ascontiguousarray(xy.T, dtype = float)  # copy, so that the file is not kept open
+	del xy
+	return name, coords
+
+def hasFreshBinary(filename):
+	'''True if the binary sidecar of the file exists and is not older than the file'''
+	binfile = binaryProfilePath(filename)
+	try:
+		return os.path.getmtime(binfile) >= os.path.getmtime(filename)
+	except OSError:
+		return False
+
+def loadProfile(filename, useBinary = True):
+	'''Return the name and coordinates of a profile file, from its binary sidecar when it is up to date'''
+	if useBinary and hasFreshBinary(filename):
+		try:
+			return readProfileBinary(binaryProfilePath(filename))
+		except (IOError, OSError, ValueError):
+			log.warning("Unreadable binary profile, text file used: %s", binaryProfilePath(filename))
+	return loadTextProfile(filename)
+
+def updateProfileBinary(filename):
+	'''Write the binary sidecar of the profile file if it is missing or older than the file'''
+	if not hasFreshBinary(filename):
+		name, coords = loadTextProfile(filename)
+		writeProfileBinary(filename, coords, name)
+		return True
+	return False
+
+def readProfile(filename):
+	return loadProfile(filename)[1]
+
+class ProfileCache:
+	'''Process wide cache of the parsed profile files, with least recently used eviction.
+	Entries are keyed by the file path and invalidated when the file mtime or size changes.'''
+
+	def __init__(self, maxsize = ProfileCacheSize):
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self.entries = OrderedDict()  # path: ((mtime, size), coords)
+		self.lock = threading.Lock()
+
+	def get(self, filename):
+		'''Return the read-only coordinates array of the file, parsing it only on a miss'''
+		path = os.path.abspath(filename)
+		stat = os.stat(path)
+		key = (stat.st_mtime, stat.st_size)
+		with self.lock:
+			entry = self.entries.pop(path, None)
+			if entry is not None and entry[0] == key:
+				self.hits += 1
+				self.entries[path] = entry  # most recently used is at the end
+				return entry[1]
+			self.misses += 1
+		coords = readProfile(path)
+		coords.flags.writeable = False  # shared between all the users of the file
+		with self.lock:
+			self.entries[path] = (key, coords)
+			while len(self.entries) > self.maxsize:
+				self.entries.popitem(last = False)
+		return coords
+
+	def info(self):
+		return {"hits" : self.hits, "misses" : self.misses, "size" : len(self.entries), "maxsize" : self.maxsize}
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+			self.hits = 0
+			self.misses = 0
+
+profileCache = ProfileCache()
+
+def profileCacheInfo():
+	return profileCache.info()
+
+def getProfileCoords(filename):
+	return profileCache.get(filename)
+
+def profileMetadata(coords):
+	'''Return the shape parameters of a Selig ordered profile, in percent of the chord:
+	max thickness and its position, max camber and its position, leading edge radius'''
+	x = coords[:, 0]
+	y = coords[:, 1]
+	le = int(numpy.argmin(x))
+	chord = x.max() - x[le]
+	if len(coords) < 3 or chord <= 0 or le == 0 or le == len(coords) - 1:
+		return None
+	x = (x - x[le]) / chord
+	y = (y - y[le]) / chord
+	# both surfaces from the leading edge to the trailing edge, on a cosine spaced grid
+	upper = numpy.argsort(x[:le + 1], kind = "mergesort")
+	lower = numpy.argsort(x[le:], kind = "mergesort") + le
+	grid = (1 - numpy.cos(numpy.linspace(0, numpy.pi, 201))) / 2
+	yup = numpy.interp(grid, x[upper], y[upper])
+	ylow = numpy.interp(grid, x[lower], y[lower])
+	if yup.sum() < ylow.sum():
+		yup, ylow = ylow, yup
+	thickness = yup - ylow
+	camber = (yup + ylow) / 2
+	it = int(numpy.argmax(thickness))
+	ic = int(numpy.argmax(numpy.abs(camber)))
+	# leading edge radius: least squares fit of the parabola x = y^2 / (2 r) on the first 2 % of chord
+	near = (x > 0) & (x <= 0.02)
+	if near.sum() < 2:   # too few points, use the interpolated half thickness
+		x, y = numpy.concatenate((grid, grid)), numpy.concatenate((yup - camber[0], ylow - camber[0]))
+		near = (x > 0) & (x <= 0.02)
+	y2 = y[near] ** 2
+	radius = (y2 * y2).sum() / (2 * (x[near] * y2).sum()) if y2.sum() > 0 else 0.0
+	return {"thickness" : float(thickness[it] * 100), "thicknessPos" : float(grid[it] * 100),
+			"camber" : float(camber[ic] * 100), "camberPos" : float(grid[ic] * 100), "leRadius" : float(radius * 100)}
+
+ResampleSpacings = ["Cosine", "Curvature"]
+ResampleMinPoints = 8
+
+def polylineLengths(coords):
+	'''Cumulative arc length at each point of a polyline'''
+	seg = numpy.hypot(*numpy.diff(coords, axis = 0).T)
+	return numpy.concatenate(([0.0], numpy.cumsum(seg)))
+
+def polylineCurvature(coords):
+	'''Curvature at each point of a polyline: turning angle over the mean length of the
+	adjacent segments, smoothed over 3 points to damp the rounding noise of the files'''
+	d = numpy.diff(coords, axis = 0)
+	seg = numpy.hypot(d[:, 0], d[:, 1])
+	seg[seg == 0] = 1e-300
+	angle = numpy.arctan2(d[:-1, 0] * d[1:, 1] - d[:-1, 1] * d[1:, 0], (d[:-1] * d[1:]).sum(axis = 1))
+	kappa = numpy.zeros(len(coords))
+	kappa[1:-1] = numpy.abs(angle) / ((seg[:-1] + seg[1:]) / 2)
+	kappa[1:-1] = numpy.convolve(kappa, [0.25, 0.5, 0.25], "same")[1:-1]
+	return kappa
+
+def chordError(coords, resampled):
+	'''Max distance from the points of coords to the polyline resampled'''
+	a = resampled[:-1]
+	d = numpy.diff(resampled, axis = 0)
+	len2 = (d * d).sum(axis = 1)
+	len2[len2 == 0] = 1e-300
+	rel = coords[:, None, :] - a[None, :, :]
+	t = numpy.clip((rel * d[None, :, :]).sum(axis = 2) / len2[None, :], 0, 1)
+	dist = numpy.hypot(*(rel - t[:, :, None] * d[None, :, :]).transpose(2, 0, 1))
+	return float(dist.min(axis = 1).max())
+
+def resampleSurface(coords, kappa, nbpts, spacing):
+	'''Resample one surface of nbpts points, ends included'''
+	s = polylineLengths(coords)
+	if spacing == "Curvature":
+		# the chord error of a segment of length l is about kappa l^2 / 8,
+		# so the points are equally spaced on the integral of sqrt(kappa)
+		w = numpy.sqrt(kappa)
+		w = (w[:-1] + w[1:]) / 2
+		w += 0.1 * w.mean() + 1e-12
+		cum = numpy.concatenate(([0.0], numpy.cumsum(w * numpy.diff(s))))
+		target = numpy.interp(numpy.linspace(0, cum[-1], nbpts), cum, s)
+	else:
+		target = s[-1] * (1 - numpy.cos(numpy.linspace(0, numpy.pi, nbpts))) / 2
+	return numpy.column_stack((numpy.interp(target, s, coords[:, 0]), numpy.interp(target, s, coords[:, 1])))
+
+def resampleProfile(coords, count = 0, tolerance = 0.0, spacing = "Cosine"):
+	'''Resample a Selig ordered profile to count distinct points, the leading and trailing edge points are kept.
+	Cosine spacing refines both ends of each surface, Curvature spacing follows the curvature of the profile.
+	With count 0, the smallest count keeping the points of the file within tolerance of the new profile is used.
+	The points of a closed profile are returned closed too, the last point being the first one.'''
+	coords = numpy.asarray(coords, dtype = float)
+	closed = len(coords) > 1 and numpy.hypot(*(coords[0] - coords[-1])) <= 1.e-14
+	nbsrc = len(coords) - 1 if closed else len(coords)
+	le = int(numpy.argmin(coords[:, 0]))
+	if nbsrc < 3 or le == 0 or le == len(coords) - 1 or (count <= 0 and tolerance <= 0):
+		return coords
+	kappa = polylineCurvature(coords)
+	def resample(n):
+		n = max(ResampleMinPoints, int(n))
+		nbup = int(n / 2) + 1   # trailing edge to leading edge
+		nblow = n - nbup + (2 if closed else 1)   # leading edge to trailing edge
+		upper = resampleSurface(coords[:le + 1], kappa[:le + 1], nbup, spacing)
+		lower = resampleSurface(coords[le:], kappa[le:], nblow, spacing)
+		res = numpy.concatenate((upper, lower[1:]))
+		if closed: res[-1] = res[0]
+		return res
+	if count > 0:
+		return resample(count)
+	# first guess from the curvature, then increase the count until the tolerance is met
+	s = polylineLengths(coords)
+	n = max(ResampleMinPoints, int(math.ceil((numpy.sqrt(kappa[:-1] / (8 * tolerance)) * numpy.diff(s)).sum())))
+	while n < nbsrc:
+		res = resample(n)
+		if chordError(coords, res) <= tolerance:
+			return res
+		n = int(math.ceil(n * 1.25))
+	return coords
+
+CSTOrder = 5
+CSTClassN1 = 0.5   # round leading edge
+CSTClassN2 = 1.0   # sharp trailing edge
+CSTPointCount = 100   # points of a CST profile when no count is given
+
+def bernsteinMatrix(x, order):
+	'''Bernstein polynomials of order at each x, one row per x'''
+	i = numpy.arange(order + 1)
+	binom = numpy.array([math.factorial(order) / (math.factorial(k) * math.factorial(order - k)) for k in i], dtype = float)
+	x = numpy.asarray(x, dtype = float)[:, None]
+	return binom * x ** i * (1 - x) ** (order - i)
+
+def cstMatrix(x, order):
+	'''Class function times the Bernstein polynomials, y = cstMatrix(x, order).dot(A) + x * yte'''
+	x = numpy.asarray(x, dtype = float)
+	return (x ** CSTClassN1 * (1 - x) ** CSTClassN2)[:, None] * bernsteinMatrix(x, order)
+
+def fitCST(coords, order = CSTOrder):
+	'''Least squares fit of the Class Shape Transformation (Kulfan) of a Selig ordered profile.
+	Return the coefficients: order + 1 for the upper surface, order + 1 for the lower one,
+	then the upper and lower trailing edge ordinates, all in fraction of the chord.'''
+	coords = numpy.asarray(coords, dtype = float)
+	le = int(numpy.argmin(coords[:, 0]))
+	chord = coords[:, 0].max() - coords[le, 0]
+	if len(coords) < 2 * (order + 1) or le == 0 or le == len(coords) - 1 or chord <= 0:
+		raise ValueError("Not enough points to fit a CST of order " + str(order))
+	xy = (coords - coords[le]) / chord
+	res = []
+	tes = []
+	for surf in [xy[:le + 1], xy[le:]]:
+		x, y = numpy.clip(surf[:, 0], 0, 1), surf[:, 1]
+		yte = y[numpy.argmax(x)]
+		res.append(numpy.linalg.lstsq(cstMatrix(x, order), y - x * yte, rcond = -1)[0])
+		tes.append(yte)
+	return numpy.concatenate((res[0], res[1], tes))
+
+def cstOrder(coeffs):
+	return int((len(coeffs) - 2) / 2) - 1
+
+def evalCST(coeffs, count = 100):
+	'''Selig ordered coordinates of a CST profile, with count distinct points on cosine spaced abscissas.
+	A closed trailing edge gives a closed profile, the last point being the first one.'''
+	coeffs = numpy.asarray(coeffs, dtype = float)
+	order = cstOrder(coeffs)
+	nb = order + 1
+	closed = abs(coeffs[-2] - coeffs[-1]) <= 1.e-14
+	count = max(ResampleMinPoints, int(count))
+	nbup = int(count / 2) + 1
+	nblow = count - nbup + (2 if closed else 1)
+	xup = (1 + numpy.cos(numpy.linspace(0, numpy.pi, nbup))) / 2   # trailing edge to leading edge
+	xlow = (1 - numpy.cos(numpy.linspace(0, numpy.pi, nblow))) / 2
+	yup = cstMatrix(xup, order).dot(coeffs[:nb]) + xup * coeffs[-2]
+	ylow = cstMatrix(xlow, order).dot(coeffs[nb:2 * nb]) + xlow * coeffs[-1]
+	return numpy.column_stack((numpy.concatenate((xup, xlow[1:])), numpy.concatenate((yup, ylow[1:]))))
+
+def evalCSTSections(coeffs, count = 100):
+	'''evalCST of several profiles of the same order and trailing edge closure, one row of coefficients each.
+	Return an array (sections, points, 2), the abscissas being shared only one matrix product is done.'''
+	coeffs = numpy.atleast_2d(numpy.asarray(coeffs, dtype = float))
+	ref = evalCST(coeffs[0], count)
+	order = cstOrder(coeffs[0])
+	nb = order + 1
+	le = int(numpy.argmin(ref[:, 0]))
+	xup, xlow = ref[:le + 1, 0], ref[le:, 0]
+	yup = coeffs[:, :nb].dot(cstMatrix(xup, order).T) + coeffs[:, -2:-1] * xup
+	ylow = coeffs[:, nb:2 * nb].dot(cstMatrix(xlow, order).T) + coeffs[:, -1:] * xlow
+	y = numpy.concatenate((yup, ylow[:, 1:]), axis = 1)
+	return numpy.concatenate((numpy.broadcast_to(ref[:, 0], y.shape)[:, :, None], y[:, :, None]), axis = 2)
+
+def spanPositions(spans, nbinter = 0):
+	'''Span positions of the stations and of nbinter sections evenly spaced between each pair of stations.
+	Return the positions, the index of the panel of each position and its parameter in the panel.'''
+	spans = numpy.asarray(spans, dtype = float)
+	t = numpy.linspace(0, 1, nbinter + 2)[:-1]
+	panel = numpy.repeat(numpy.arange(len(spans) - 1), len(t))
+	t = numpy.tile(t, len(spans) - 1)
+	panel = numpy.append(panel, len(spans) - 2)
+	t = numpy.append(t, 1.0)
+	return spans[panel] + t * (spans[panel + 1] - spans[panel]), panel, t
+
+def blendStations(values, panel, t):
+	'''Linear blending between the stations values (points arrays or CST coefficients, first axis is the station)
+	for each panel index and parameter, in one array operation'''
+	values = numpy.asarray(values, dtype = float)
+	t = numpy.asarray(t, dtype = float).reshape((-1,) + (1,) * (values.ndim - 1))
+	return (1 - t) * values[panel] + t * values[panel + 1]
+
+def placeSections(unit, z, chord, sweep, height, twist):
+	'''Place unit chord sections (sections, points, 2) in the wing: twisted by twist degrees around
+	their leading edge, scaled by chord, moved to (sweep, height, z). Return an array (sections, points, 3).'''
+	unit = numpy.asarray(unit, dtype = float)
+	a = -numpy.radians(numpy.asarray(twist, dtype = float))[:, None]
+	c = numpy.asarray(chord, dtype = float)[:, None]
+	x = (unit[:, :, 0] * numpy.cos(a) - unit[:, :, 1] * numpy.sin(a)) * c + numpy.asarray(sweep, dtype = float)[:, None]
+	y = (unit[:, :, 0] * numpy.sin(a) + unit[:, :, 1] * numpy.cos(a)) * c + numpy.asarray(height, dtype = float)[:, None]
+	return numpy.concatenate((x[:, :, None], y[:, :, None], numpy.broadcast_to(numpy.asarray(z, dtype = float)[:, None], x.shape)[:, :, None]), axis = 2)
+
+def stationHeights(spans, dihedrals):
+	'''Height of each station, the dihedral of a station being the angle in degrees of the panel ending at it'''
+	dz = numpy.diff(numpy.asarray(spans, dtype = float))
+	return numpy.concatenate(([0.0], numpy.cumsum(dz * numpy.tan(numpy.radians(numpy.asarray(dihedrals, dtype = float)[1:])))))
+
+def normalizedRows(vecs):
+	norm = numpy.sqrt((vecs * vecs).sum(axis = 1))
+	norm[norm == 0] = 1.0
+	return vecs / norm[:, None]
+
+class PolylineData:
+	'''Vertexes of a polyline as an array, and the arrays derived from them: tangent, normal and
+	curve vectors at every vertex, computed for all the vertexes at once on the first request.
+	A closed polyline has an edge from its last vertex to its first one.'''
+
+	def __init__(self, points, closed = False):
+		self.points = numpy.asarray(points, dtype = float).reshape(-1, 3)
+		self.arrays = {}
+		self.nbedges = len(self.points) if closed else max(len(self.points) - 1, 0)
+		self.edges = None
+
+	def __len__(self):
+		return len(self.points)
+
+	def normals(self):
+		'''Normal of the plane of each vertex and the vertexes a third of the wire before and after it'''
+		if "normals" not in self.arrays:
+			nb = len(self.points)
+			if nb >= 3:
+				gap = int(nb / 3)
+				idx = numpy.arange(nb)
+				before = self.points[idx - gap] - self.points
+				after = self.points[(idx + gap) % nb] - self.points
+				self.arrays["normals"] = normalizedRows(numpy.cross(before, after))
+			else:
+				self.arrays["normals"] = numpy.zeros((nb, 3))
+		return self.arrays["normals"]
+
+	def tangents(self, mtype):
+		'''Tangent at each vertex, from the previous vertex, to the next one, or from the previous to the next one'''
+		key = "tangents" + mtype
+		if key not in self.arrays:
+			nb = len(self.points)
+			i, j = {"Previous" : (1, 0), "Next" : (0, 1), "PreviousAndNext" : (1, 1)}.get(mtype, (0, -1))
+			if nb >= 3:
+				self.arrays[key] = normalizedRows(numpy.roll(self.points, -j, axis = 0) - numpy.roll(self.points, i, axis = 0))
+			elif nb == 2:
+				self.arrays[key] = normalizedRows(numpy.roll(self.points, 1, axis = 0) - self.points)
+			else:
+				self.arrays[key] = numpy.zeros((nb, 3))
+		return self.arrays[key]
+
+	def pointsAt(self, values):
+		'''Points at fractional vertex indexes: i + f is at f of the length of the edge i, for an array of indexes'''
+		values = numpy.atleast_1d(numpy.asarray(values, dtype = float))
+		idx = numpy.floor(values).astype(int)
+		frac = values - idx
+		last = idx >= self.nbedges   # end of the last edge
+		idx[last] = self.nbedges - 1
+		frac[last] = 1.0
+		return self.edgePoints(idx, frac)
+
+	def edgePoints(self, idx, frac):
+		'''Points at the fractions frac of the edges idx, on the segments between the vertexes'''
+		nb = len(self.points)
+		a = self.points[idx % nb]
+		return a + frac[:, None] * (self.points[(idx + 1) % nb] - a)
+
+	def segmentLengths(self):
+		'''Length of each edge'''
+		nb = len(self.points)
+		seg = self.points[(numpy.arange(self.nbedges) + 1) % nb] - self.points[:self.nbedges] if nb > 0 else numpy.zeros((0, 3))
+		return numpy.sqrt((seg * seg).sum(axis = 1))
+
+	def lengths(self):
+		'''Cumulative arc length at each vertex, and at the end of the closing edge of a closed wire'''
+		if "lengths" not in self.arrays:
+			self.arrays["lengths"] = numpy.concatenate(([0.0], numpy.cumsum(self.segmentLengths())))
+		return self.arrays["lengths"]
+
+	def lengthAt(self, values):
+		'''Arc length at fractional vertex indexes'''
+		lengths = self.lengths()
+		values = numpy.clip(numpy.atleast_1d(numpy.asarray(values, dtype = float)), 0, self.nbedges)
+		idx = numpy.minimum(numpy.floor(values).astype(int), self.nbedges - 1)
+		return lengths[idx] + (values - idx) * (lengths[idx + 1] - lengths[idx])
+
+	def indexAtLength(self, lengths):
+		'''Fractional vertex indexes at arc lengths, by binary search'''
+		cum = self.lengths()
+		lengths = numpy.clip(numpy.atleast_1d(numpy.asarray(lengths, dtype = float)), 0, cum[-1])
+		idx = numpy.clip(numpy.searchsorted(cum, lengths, "right") - 1, 0, self.nbedges - 1)
+		seg = cum[idx + 1] - cum[idx]
+		seg[seg == 0] = 1.0
+		return idx + (lengths - cum[idx]) / seg
+
+	def leadingEdge(self):
+		'''Index of the leading edge vertex of a Selig ordered profile wire: the farthest from the trailing edge,
+		which is the middle of the first and last vertexes'''
+		if "leadingEdge" not in self.arrays:
+			te = (self.points[0] + self.points[-1]) / 2
+			d = self.points - te
+			self.arrays["leadingEdge"] = int(numpy.argmax((d * d).sum(axis = 1)))
+		return self.arrays["leadingEdge"]
+
+	def chords(self):
+		'''Chord position of each vertex in percent, positive on the first (upper) surface, negative on the lower one:
+		from 100 at the trailing edge to 0 at the leading edge, then to -100. The trailing edge is the vertex farthest
+		along the chord line, so that an open trailing edge keeps distinct positions. Positions are only forced to be
+		decreasing where a profile turns back along the chord.'''
+		if "chords" not in self.arrays:
+			le = self.leadingEdge()
+			d = self.points - self.points[le]
+			te = self.points[int(numpy.argmax(d.dot((self.points[0] + self.points[-1]) / 2 - self.points[le])))]
+			axis = te - self.points[le]
+			xc = 100 * d.dot(axis) / max(axis.dot(axis), 1e-300)
+			xc[le + 1:] *= -1
+			self.arrays["chords"] = numpy.minimum.accumulate(xc)
+		return self.arrays["chords"]
+
+	def chordAt(self, values):
+		'''Chord positions of fractional vertex indexes, the closing edge being at the lower trailing edge'''
+		chords = self.chords()
+		last = len(chords) - 1
+		values = numpy.clip(numpy.atleast_1d(numpy.asarray(values, dtype = float)), 0, last)
+		idx = numpy.minimum(numpy.floor(values).astype(int), last - 1)
+		return chords[idx] + (values - idx) * (chords[idx + 1] - chords[idx])
+
+	def indexAtChord(self, chords):
+		'''Fractional vertex indexes of chord positions, by binary search'''
+		dec = -self.chords()
+		chords = numpy.clip(-numpy.atleast_1d(numpy.asarray(chords, dtype = float)), dec[0], dec[-1])
+		idx = numpy.clip(numpy.searchsorted(dec, chords, "left") - 1, 0, len(dec) - 2)
+		seg = dec[idx + 1] - dec[idx]
+		seg[seg == 0] = 1.0
+		return idx + numpy.clip((chords - dec[idx]) / seg, 0, 1)
+
+	def planeCrossings(self, origin, normal, start = 0, closed = False):
+		'''Fractional vertex indexes and points where the polygon of the vertexes crosses the plane(s),
+		the closing edge of a closed wire being included if closed, see planeCrossings'''
+		return planeCrossings(self.points, origin, normal, start, closed and self.nbedges == len(self.points))
+
+	def curves(self, mtype):
+		'''Tangent cross normal at each vertex: in the plane of the wire, perpendicular to it'''
+		key = "curves" + mtype
+		if key not in self.arrays:
+			self.arrays[key] = numpy.cross(self.tangents(mtype), self.normals())
+		return self.arrays[key]
+
+def cutPolyline(data, start, end, type):
+	'''Points of the polyline data (a PolylineData) cut at the fractional vertex indexes start and end:
+	the right part is from start to end, the left part is the rest. Return the left and right arrays.'''
+	intstart = int(start)
+	fracstart = start - intstart > FractionTolerance
+	intend = int(end)
+	fracend = end - intend > FractionTolerance
+	startpt, endpt = data.pointsAt([start, end])
+	right = []
+	if type in ["Right", "Both"]:
+		right = [startpt[None, :], data.points[intstart + 1:intend + 1]]   # first point is 'start' or intermediate point of 'first' edge
+		if fracend:   # if 'end' point has decimal, one should add the intermediate point of 'last' edge
+			right.append(endpt[None, :])
+	left = []
+	if type in ["Left", "Both"]:
+		left = [data.points[:intstart + 1]]
+		if fracstart:   # if 'start' point has decimal, one should add the intermediate point of 'first' edge
+			left.append(startpt[None, :])
+		left += [endpt[None, :], data.points[intend + 1:]]  # next point is 'end' point or the intermediate point of 'last' edge
+	return (numpy.concatenate(left) if left else numpy.zeros((0, 3))), (numpy.concatenate(right) if right else numpy.zeros((0, 3)))
+
+def planeCrossings(points, origins, normals, start = 0, closed = False):
+	'''Crossings of the polyline points (n, 3) with analytic planes, all segments at once.
+	origins and normals are a point and a normal vector (3,) of one plane, or arrays (m, 3) of m planes.
+	Segments before the vertex start are skipped, the closing segment is included if closed.
+	Return the fractional vertex indexes (k,) and points (k, 3) of the crossings in wire order,
+	or a list of them, one per plane. A vertex on a plane is one crossing, a segment in a plane crosses at its start.'''
+	points = numpy.asarray(points, dtype = float)
+	origins = numpy.asarray(origins, dtype = float)
+	normals = numpy.asarray(normals, dtype = float)
+	single = normals.ndim == 1
+	normals = numpy.atleast_2d(normals)
+	origins = numpy.broadcast_to(numpy.atleast_2d(origins), normals.shape)
+	nb = len(points)
+	seg = numpy.arange(max(int(start), 0), nb if closed else nb - 1)
+	# signed distances of the vertexes to each plane (m, n)
+	dist = points.dot(normals.T).T - (origins * normals).sum(axis = 1)[:, None]
+	d0 = dist[:, seg]
+	d1 = dist[:, (seg + 1) % nb]
+	mask = (d0 == 0) | (d0 * d1 < 0)
+	if not closed and nb > 0 and nb - 1 >= start:
+		# the last vertex on a plane has no segment starting from it
+		mask = numpy.concatenate((mask, dist[:, nb - 1:] == 0), axis = 1)
+		seg = numpy.append(seg, nb - 1)
+		d0 = dist[:, seg]
+		d1 = numpy.concatenate((d1, d0[:, -1:]), axis = 1)
+	denom = d0 - d1
+	denom[denom == 0] = 1.0
+	frac = numpy.where(d0 == 0, 0.0, d0 / denom)
+	res = []
+	for k in range(len(normals)):
+		sel = numpy.nonzero(mask[k])[0]
+		i, t = seg[sel], frac[k, sel]
+		pts = points[i] + t[:, None] * (points[(i + 1) % nb] - points[i]) if len(i) > 0 else numpy.zeros((0, 3))
+		res.append((i + t, pts))
+	return res[0] if single else res
+
+OffsetJoins = ["Miter", "Round", "Bevel"]
+OffsetMiterLimit = 4.0   # miter joins longer than this ratio of the offset distance are beveled
+OffsetArcTolerance = 0.01   # maximal gap between a round join and its arc
+
+def offsetPolyline(points, distance, normal, join = "Miter", closed = False, miterLimit = OffsetMiterLimit, arcTolerance = OffsetArcTolerance):
+	'''Offset of the planar polyline points (n, 3), computed on whole arrays.
+	A positive distance offsets along tangent cross normal, normal being the normal of the plane of the polyline.
+	Inner corners are the crossing of the offset segments, outer corners get a miter, round or bevel join,
+	a miter longer than miterLimit times the distance being beveled. The open ends are offset square to their segment.
+	Repeated points get the offset of the point they repeat, loops left by short segments are trimmed.
+	Return the offset points array.'''
+	points = numpy.asarray(points, dtype = float).reshape(-1, 3)
+	normal = numpy.asarray(normal, dtype = float)
+	normal = normal / max(numpy.sqrt(normal.dot(normal)), 1e-300)
+	# repeated points are removed, and the closing point of a closed polyline
+	step = numpy.sqrt(((points[1:] - points[:-1]) ** 2).sum(axis = 1))
+	unique = numpy.concatenate(([True], step > 1e-12))
+	if closed and unique.sum() > 1 and numpy.allclose(points[unique][-1], points[0], 0, 1e-12):
+		unique[numpy.nonzero(unique)[0][-1]] = False
+	pts = points[unique]
+	nb = len(pts)
+	if nb < 2 or distance == 0:
+		return points.copy()
+	nbseg = nb if closed else nb - 1
+	idx = numpy.arange(nbseg)
+	tangents = normalizedRows(pts[(idx + 1) % nb] - pts[idx])
+	sides = normalizedRows(numpy.cross(tangents, normal))
+	# incoming and outgoing segment sides of each vertex, a single segment at the open ends
+	vidx = numpy.arange(nb)
+	n1 = sides[(vidx - 1) % nbseg]
+	n2 = sides[numpy.minimum(vidx, nbseg - 1)]
+	if not closed:
+		n1[0] = n2[0]
+		n2[-1] = n1[-1]
+	cosa = numpy.clip((n1 * n2).sum(axis = 1), -1, 1)
+	outer = numpy.cross(n1, n2).dot(normal) * distance > 0
+	outer &= cosa < 1 - 1e-12
+	miter = numpy.sqrt(2 / numpy.maximum(1 + cosa, 1e-300))
+	if join == "Round":
+		angle = numpy.arccos(cosa)
+		maxstep = 2 * numpy.arccos(max(1 - arcTolerance / abs(distance), -1.0))
+		counts = numpy.where(outer, numpy.ceil(angle / max(maxstep, 1e-3)).astype(int) + 1, 1)
+	else:
+		counts = numpy.where(outer & ((join == "Bevel") | (miter > miterLimit)), 2, 1)
+	single = counts == 1
+	# single points are miters, the others are spread from the incoming to the outgoing side
+	vertex = numpy.repeat(vidx, counts)
+	first = numpy.repeat(numpy.cumsum(counts) - counts, counts)
+	frac = (numpy.arange(len(vertex)) - first) / numpy.maximum(numpy.repeat(counts, counts) - 1, 1).astype(float)
+	a, b = n1[vertex], n2[vertex]
+	theta = numpy.arccos(numpy.repeat(cosa, counts))
+	sint = numpy.sin(theta)
+	arc = sint > 1e-9
+	wa = numpy.where(arc, numpy.sin((1 - frac) * theta) / numpy.where(arc, sint, 1), 1 - frac)
+	wb = numpy.where(arc, numpy.sin(frac * theta) / numpy.where(arc, sint, 1), frac)
+	dirs = numpy.where(numpy.repeat(single, counts)[:, None], (a + b) / numpy.maximum(1 + (a * b).sum(axis = 1), 1e-12)[:, None], wa[:, None] * a + wb[:, None] * b)
+	res, removed = trimLoops(pts[vertex] + distance * dirs, closed)
+	if removed == 0 and len(res) == nb and nb < len(points):
+		# no join was added: the repeated points get their offset back
+		res = res[numpy.cumsum(unique) - 1]
+	return res
+
+def planarCoords(points):
+	'''2D coordinates of the points (n, 3) in their mean plane'''
+	points = numpy.asarray(points, dtype = float)
+	if len(points) < 3:
+		return points[:, :2].copy()
+	centered = points - points.mean(axis = 0)
+	axes = numpy.linalg.svd(centered, full_matrices = False)[2]
+	return centered.dot(axes[:2].T)
+
+def segmentCrossings(points, closed = False):
+	'''Self-intersections of the polyline points (n, 3), the closing segment included if closed.
+	Candidate pairs come from a sweep along x of the segment bound boxes, so only segments whose boxes overlap are tested.
+	Return the arrays i, ti, j, tj of the crossings, sorted along the wire: segment i at ti crosses segment j > i at tj.
+	Adjacent segments are not tested.'''
+	p = planarCoords(points)
+	nb = len(p)
+	nbseg = nb if closed and nb > 2 else max(nb - 1, 0)
+	empty = numpy.zeros(0, dtype = int), numpy.zeros(0), numpy.zeros(0, dtype = int), numpy.zeros(0)
+	if nbseg < 3: return empty
+	idx = numpy.arange(nbseg)
+	a = p[idx]
+	b = p[(idx + 1) % nb]
+	lo = numpy.minimum(a, b)
+	hi = numpy.maximum(a, b)
+	order = numpy.argsort(lo[:, 0], kind = "mergesort")
+	sortedmin = lo[order, 0]
+	# segments after k in x order whose box starts before the end of the box of k
+	last = numpy.searchsorted(sortedmin, hi[order, 0], "right")
+	counts = numpy.maximum(last - numpy.arange(nbseg) - 1, 0)
+	total = counts.sum()
+	if total == 0: return empty
+	starts = numpy.cumsum(counts) - counts
+	first = numpy.repeat(order, counts)
+	second = order[numpy.repeat(numpy.arange(nbseg) + 1, counts) + numpy.arange(total) - numpy.repeat(starts, counts)]
+	i = numpy.minimum(first, second)
+	j = numpy.maximum(first, second)
+	keep = (lo[j, 1] <= hi[i, 1]) & (lo[i, 1] <= hi[j, 1]) & (j - i > 1)
+	if closed: keep &= ~((i == 0) & (j == nbseg - 1))
+	i, j = i[keep], j[keep]
+	r = b[i] - a[i]
+	s = b[j] - a[j]
+	q = a[j] - a[i]
+	den = r[:, 0] * s[:, 1] - r[:, 1] * s[:, 0]
+	ok = den != 0
+	den[~ok] = 1.0
+	ti = (q[:, 0] * s[:, 1] - q[:, 1] * s[:, 0]) / den
+	tj = (q[:, 0] * r[:, 1] - q[:, 1] * r[:, 0]) / den
+	# a crossing at a shared vertex is counted once, on the segments starting there
+	ok &= (ti >= 0) & (ti < 1) & (tj >= 0) & (tj < 1)
+	i, ti, j, tj = i[ok], ti[ok], j[ok], tj[ok]
+	sort = numpy.lexsort((-j, ti, i))
+	return i[sort], ti[sort], j[sort], tj[sort]
+
+def trimLoops(points, closed = False, passes = 10):
+	'''Remove the loops of the polyline points (n, 3): at each self-intersection the part of the wire
+	between the two crossing segments is replaced by the crossing point.
+	The first point must be outside the loops, the outermost loop is removed first.
+	A closed polyline keeps the longest side of its crossings, the first point may be in a loop then.
+	Return the points array and the number of removed loops.'''
+	points = numpy.asarray(points, dtype = float)
+	removed = 0
+	for n in range(passes):
+		si, sti, sj, stj = segmentCrossings(points, closed)
+		if len(si) == 0: break
+		nb = len(points)
+		if closed:
+			lengths = numpy.concatenate(([0.0], numpy.cumsum(numpy.sqrt(((numpy.roll(points, -1, axis = 0) - points) ** 2).sum(axis = 1)))))
+			inside = (lengths[sj] + stj * (lengths[sj + 1] - lengths[sj])) - (lengths[si] + sti * (lengths[si + 1] - lengths[si]))
+			k = int(numpy.argmax(inside))
+			if inside[k] > lengths[-1] / 2:
+				# the loop is outside, between j and i: the wire restarts at the crossing point
+				i, ti = si[k], sti[k]
+				points = numpy.concatenate(((points[i] + ti * (points[(i + 1) % nb] - points[i]))[None, :], points[i + 1:sj[k] + 1]))
+				removed += 1
+				continue
+		res = [points[:1]]
+		cur, tcur = 0, 0.0
+		for i, ti, j, tj in zip(si, sti, sj, stj):
+			if i < cur or (i == cur and ti <= tcur): continue   # inside a loop already removed
+			res.append(points[cur + 1:i + 1])
+			res.append((points[i] + ti * (points[(i + 1) % nb] - points[i]))[None, :])
+			cur, tcur = j, tj
+			removed += 1
+		res.append(points[cur + 1:])
+		points = numpy.concatenate(res)
+	return points, removed
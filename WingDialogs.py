@@ -4,7 +4,7 @@ import WingDial, SectionsDial
 import FreeCADGui, FreeCAD
 from PySide import QtCore, QtGui
 from WingLib import *
-from Wing import Section, ViewProviderSection
+from Wing import Section, ViewProviderSection, changeBatch
 
 try:
     _fromUtf8 = QtCore.QString.fromUtf8
@@ -208,18 +208,18 @@ class WingDialog():
 
 	def CutWireUpdatePoints(self):
 		'''update the position of the cutting points in the FreeCAD view'''
-		value = self.widget.ui.CutWire_doubleSpinBox_start.value()
-		setPointCoord(self.CutWireObj.StartPointObj, DiscretizedPoint(self.CutWireObj.Wire, value))
-		value = self.widget.ui.CutWire_doubleSpinBox_end.value()
-		setPointCoord(self.CutWireObj.EndPointObj, DiscretizedPoint(self.CutWireObj.Wire, value))
+		pts = discretizedPoints(self.CutWireObj.Wire, [self.widget.ui.CutWire_doubleSpinBox_start.value(), self.widget.ui.CutWire_doubleSpinBox_end.value()])
+		setPointCoord(self.CutWireObj.StartPointObj, toVector(pts[0]))
+		setPointCoord(self.CutWireObj.EndPointObj, toVector(pts[1]))
 		FreeCAD.ActiveDocument.recompute()
 
 	def CutWire_button_apply(self):
 		if hasattr(self, "CutWireObj"):
-			self.CutWireObj.StartPoint = self.widget.ui.CutWire_doubleSpinBox_start.value()
-			self.CutWireObj.EndPoint = self.widget.ui.CutWire_doubleSpinBox_end.value()
-			if hasattr(self.CutWireObj, "CutType"):
-				self.CutWireObj.CutType = self.widget.ui.CutWire_comboBox.currentText()
+			with changeBatch(self.CutWireObj):
+				self.CutWireObj.StartPoint = self.widget.ui.CutWire_doubleSpinBox_start.value()
+				self.CutWireObj.EndPoint = self.widget.ui.CutWire_doubleSpinBox_end.value()
+				if hasattr(self.CutWireObj, "CutType"):
+					self.CutWireObj.CutType = self.widget.ui.CutWire_comboBox.currentText()
 			FreeCAD.ActiveDocument.recompute()
 
 	def CutWireUpdateDbleSpin(self):
@@ -395,8 +395,8 @@ class WingDialog():
 
 	def LeadingEdgeUpdatePlane(self):
 		'''update the position of the LeadingEdge plane in the FreeCAD view'''
-		RStartPt = DiscretizedPoint(self.LeadingEdgeObj.RootWire, self.widget.ui.LeadingEdge_doubleSpinBox_Rootstart.value())
-		REndPt = DiscretizedPoint(self.LeadingEdgeObj.RootWire, self.widget.ui.LeadingEdge_doubleSpinBox_Rootend.value())
+		pts = discretizedPoints(self.LeadingEdgeObj.RootWire, [self.widget.ui.LeadingEdge_doubleSpinBox_Rootstart.value(), self.widget.ui.LeadingEdge_doubleSpinBox_Rootend.value()])
+		RStartPt, REndPt = toVector(pts[0]), toVector(pts[1])
 		TStartPt = DiscretizedPoint(self.LeadingEdgeObj.TipWire, self.widget.ui.LeadingEdge_doubleSpinBox_Tipstart.value())
 		vec1 = PtsToVec(RStartPt, REndPt)
 		vec2 = PtsToVec(RStartPt, TStartPt)
@@ -422,11 +422,12 @@ class WingDialog():
 
 	def LeadingEdge_button_apply(self):
 		if hasattr(self, "LeadingEdgeObj"):
-			self.LeadingEdgeObj.RootStartPoint = self.widget.ui.LeadingEdge_doubleSpinBox_Rootstart.value()
-			self.LeadingEdgeObj.RootEndPoint = self.widget.ui.LeadingEdge_doubleSpinBox_Rootend.value()
-			self.LeadingEdgeObj.TipStartPoint = self.widget.ui.LeadingEdge_doubleSpinBox_Tipstart.value()
-			if hasattr(self.LeadingEdgeObj, "CutType"):
-				self.LeadingEdgeObj.CutType = self.widget.ui.LeadingEdge_comboBox.currentText()
+			with changeBatch(self.LeadingEdgeObj):
+				self.LeadingEdgeObj.RootStartPoint = self.widget.ui.LeadingEdge_doubleSpinBox_Rootstart.value()
+				self.LeadingEdgeObj.RootEndPoint = self.widget.ui.LeadingEdge_doubleSpinBox_Rootend.value()
+				self.LeadingEdgeObj.TipStartPoint = self.widget.ui.LeadingEdge_doubleSpinBox_Tipstart.value()
+				if hasattr(self.LeadingEdgeObj, "CutType"):
+					self.LeadingEdgeObj.CutType = self.widget.ui.LeadingEdge_comboBox.currentText()
 			FreeCAD.ActiveDocument.recompute()
 
 	def LeadingEdge_button_reset(self):
@@ -1,61 +1,153 @@
-import os, re, math
-import FreeCAD
+import os, re, math, hashlib
+from collections import OrderedDict
+import numpy
+import FreeCAD, Part
 #import DraftGeomUtils
-from PySide import QtGui
+from PySide import QtGui, QtCore
 from FreeCAD import Vector
+import WingCore, WingLog
+from WingCore import *
 
-ModeVerbose = True
 VecNul = FreeCAD.Vector(0,0,0)
+WireCacheSize = 256
 global verbose
 verbose=0
 
-if open.__module__ == '__builtin__':
+if open.__module__ in ['__builtin__', 'io']:
 	pythonopen = open
 
+log = WingLog.getLogger("WingLib")
+
 def msgCsl(message):
-	if ModeVerbose:
-		FreeCAD.Console.PrintMessage(message + "\n")
+	log.debug(message)
 
 def userMsg(message):
 	FreeCAD.Console.PrintMessage(message + "\n")
 
+WingCore.messageHandler = FreeCAD.Console.PrintMessage
+
 def FileProfil():
 	# PySide returns a tuple (filename, filter) instead of just a string like in PyQt
 	FileProfil, filefilter = QtGui.QFileDialog.getOpenFileName(QtGui.qApp.activeWindow(),'Open An Airfoil File',FreeCAD.ConfigGet("UserHomePath"),'*.dat')
-	msgCsl(FileProfil+"\n")
+	log.debug("%s", FileProfil)
 	return  FileProfil
 
 def NomFichier(filename):
 	NomFichier = os.path.basename(filename)
-	msgCsl(NomFichier+"\n")
+	log.debug("%s", NomFichier)
 	return NomFichier
 
 def CheminFichier(filename):
 	CheminFichier = os.path.dirname(filename)
-	msgCsl(CheminFichier+"\n")
+	log.debug("%s", CheminFichier)
 	return CheminFichier
 
+def profileVectors(coords, scale = 1.0):
+	'''Build the FreeCAD vectors of a coordinates array, only when a wire needs them'''
+	return [Vector(x * scale, y * scale, 0) for x, y in coords.tolist()]
+
 def getPoints(filename):
-	# Regex to identify data rows and throw away unused metadata
-	regex = re.compile(r'^\s*(?P<xval>(\-|\d*)\.\d+(E\-?\d+)?)\,?\s*(?P<yval>\-?\s*\d*\.\d+(E\-?\d+)?)\s*$')
-	afile = pythonopen(filename,'r')
-	# read the airfoil name which is always at the first line
-	afile.readline().strip()	# airfoilname = afile.readline().strip()
-	coords=[]
-#	upside=True
-#	last_x=None
-	# Collect the data for the upper and the lower side seperately if possible
-	for lin in afile:
-		curdat = regex.match(lin)
-		if curdat != None:
-			x = float(curdat.group("xval"))
-			y = float(curdat.group("yval"))
-			# the normal processing
-			coords.append(FreeCAD.Vector(x,y,0))
-		# End of if curdat != None
-	# End of for lin in file
-	afile.close()
-	return coords
+	return profileVectors(getProfileCoords(filename))
+
+ProfileWireTypes = ["Polygon", "BSpline", "PeriodicBSpline"]
+
+def bsplineFitError(curve, points):
+	'''Max distance between the points and the curve'''
+	err = 0.0
+	for p in points:
+		err = max(err, curve.value(curve.parameter(p)).sub(p).Length)
+	return err
+
+def makeProfileBSpline(points, tolerance = 0.0, periodic = False):
+	'''Wire of one BSpline through the points of a Selig ordered profile, return the wire and the fit error.
+	The BSpline runs from the upper trailing edge to the lower one, which keeps a sharp trailing edge,
+	a line closes the wire when the trailing edge is open. A periodic BSpline suits round trailing edges.
+	With tolerance 0 the BSpline goes through the points, else it approximates them within tolerance.
+	The periodic BSpline always goes through the points, the tolerance isn't used.'''
+	points = list(points)
+	if len(points) > 1 and points[0].sub(points[-1]).Length <= 1.e-14: points.pop()
+	curve = Part.BSplineCurve()
+	if periodic:
+		curve.interpolate(Points = points, PeriodicFlag = True)
+		edges = [curve.toShape()]
+	else:
+		if tolerance > 0:
+			curve.approximate(Points = points, DegMin = 3, DegMax = 8, Tolerance = tolerance, Continuity = "C2", ParamType = "ChordLength")
+		else:
+			curve.interpolate(Points = points)
+		edges = [curve.toShape()]
+		if points[0].sub(points[-1]).Length > 1.e-14:
+			edges.append(Part.LineSegment(points[-1], points[0]).toShape())
+	return Part.Wire(edges), bsplineFitError(curve, points)
+
+def toVector(row):
+	return Vector(float(row[0]), float(row[1]), float(row[2]))
+
+class WireData(PolylineData):
+	'''PolylineData of the vertexes of a wire shape. Polygon edges are interpolated between the vertexes,
+	other edges are evaluated by the shape.'''
+
+	def __init__(self, shape):
+		PolylineData.__init__(self, [(v.X, v.Y, v.Z) for v in shape.Vertexes])
+		edges = shape.Edges
+		self.nbedges = len(edges)
+		self.edges = None if all(e.Curve.__class__.__name__ in ["LineSegment", "Line"] for e in edges) else edges
+
+	def edgePoints(self, idx, frac):
+		if self.edges is None:
+			return PolylineData.edgePoints(self, idx, frac)
+		res = numpy.empty((len(idx), 3))
+		for k, (i, f) in enumerate(zip(idx, frac)):
+			e = self.edges[i]
+			p = e.valueAt(e.getParameterByLength(f * e.Length))
+			res[k] = (p.x, p.y, p.z)
+		return res
+
+	def segmentLengths(self):
+		if self.edges is None:
+			return PolylineData.segmentLengths(self)
+		return numpy.array([e.Length for e in self.edges])
+
+class WireCache:
+	'''Cache of the WireData of document objects wires, with least recently used eviction.
+	Entries are keyed by the object and keep its shape, a hit needs the same hash code and the same shape
+	(isEqual: same underlying shape, location and orientation), both checked without walking the shape.
+	A rebuilt or moved shape (Points or Placement change) gets new data, and as the entry holds the previous
+	shape its hash code can't be reused by a new one.'''
+
+	def __init__(self, maxsize = WireCacheSize):
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self.entries = OrderedDict()  # (document, name): (hash code, shape, WireData)
+
+	def get(self, wire):
+		name = (wire.Document.Name, wire.Name)
+		shape = wire.Shape
+		code = shape.hashCode()
+		entry = self.entries.pop(name, None)
+		if entry is not None and entry[0] == code and entry[1].isEqual(shape):
+			self.hits += 1
+		else:
+			self.misses += 1
+			entry = (code, shape, WireData(shape))
+		self.entries[name] = entry  # most recently used is at the end
+		while len(self.entries) > self.maxsize:
+			self.entries.popitem(last = False)
+		return entry[2]
+
+	def info(self):
+		return {"hits" : self.hits, "misses" : self.misses, "size" : len(self.entries), "maxsize" : self.maxsize}
+
+	def clear(self):
+		self.entries.clear()
+		self.hits = 0
+		self.misses = 0
+
+wireCache = WireCache()
+
+def wireData(wire):
+	return wireCache.get(wire)
 
 def PtsToVec(p1,p2):
 	v=FreeCAD.Vector(p2.x-p1.x,p2.y-p1.y,p2.z-p1.z)
@@ -66,79 +158,35 @@ def middle(v1, v2):
 	return v
 
 def normalVec(wire, index):
-	if len(wire.Points) >= 3:
-		nbpts = len(wire.Points)
-		gap = int(nbpts/3)
-		pc = wire.Shape.Vertexes[index].Point
-		pav = wire.Shape.Vertexes[index - gap].Point
-		pap = wire.Shape.Vertexes[(index + gap) % nbpts].Point
-		vecnorm = PtsToVec(pc,pav).cross(PtsToVec(pc,pap))
-		vecnorm.normalize()
-	else:
-		vecnorm = VecNul
-	return vecnorm
+	data = wireData(wire)
+	if len(data) >= 3:
+		return toVector(data.normals()[index % len(data)])
+	return Vector(VecNul)
 	
 def tangentVec(wire, index, mtype):
-	i = 0
-	j = -1
-	if mtype == "Previous":
-		i = 1
-		j = 0
-	elif mtype == "Next":
-		i = 0
-		j = 1
-	elif mtype == "PreviousAndNext":
-		i = 1
-		j = 1
-#	msgCsl("i: " + str(i) + "j: " + str(j) + "type: " + mtype)
-	nbpts = len(wire.Points)
-	if nbpts >= 3:
-		vectan = PtsToVec(wire.Shape.Vertexes[(index - i) % nbpts].Point, wire.Shape.Vertexes[(index + j) % nbpts].Point)
-		vectan.normalize()
-	elif nbpts == 2:
-		vectan = PtsToVec(wire.Shape.Vertexes[index % nbpts].Point, wire.Shape.Vertexes[(index - 1) % nbpts].Point)
-		vectan.normalize()
-	else:
-		vectan = VecNul
-	return vectan
+	data = wireData(wire)
+	if len(data) >= 2:
+		return toVector(data.tangents(mtype)[index % len(data)])
+	return Vector(VecNul)
 
 def curveVec(wire, index, mtype):
-	veccurv = tangentVec(wire, index, mtype).cross(normalVec(wire, index))
-	return veccurv
+	data = wireData(wire)
+	if len(data) >= 3:
+		return toVector(data.curves(mtype)[index % len(data)])
+	return tangentVec(wire, index, mtype).cross(normalVec(wire, index))
 	
 def DiscretizedPoint(wire, value):
-	medge = wire.Shape.Edges[int(value)]
-	fract = abs(int((round(value,2) - int(value))*100))
-	if fract > 0:
-		ptsdis = medge.discretize(101)
-		pt = ptsdis[fract]
-	else:
-		pt = wire.Shape.Vertexes[int(value)].Point
-	return pt	
+	'''Point of the wire at the fractional vertex index value'''
+	return toVector(wireData(wire).pointsAt(value)[0])
+
+def discretizedPoints(wire, values):
+	'''Points of the wire at the fractional vertex indexes values, as an array (len(values), 3)'''
+	return wireData(wire).pointsAt(values)
 
 def cutWire(wire, start, end, type):  # start and end are represent wire.Vertexes[start or end] and intermediate point in case of float
-	intstart = int(start)
-	fracstart = int((round(start, 2) - int(start))*100)
-	intend = int(end)
-	fracend = int((round(end, 2) - int(end))*100)
-	ptsright = []
-	if type in ["Right", "Both"]:
-		ptsright.append(DiscretizedPoint(wire, start)) # first point is 'start' or intermediate point of 'first' edge
-		for i in range(intstart + 1, intend + 1, + 1):  # second point is always 'start' + 1
-			ptsright.append(wire.Shape.Vertexes[i].Point)
-		if fracend > 0:   # if 'end' point has decimal, one should add the intermediate point of 'last' edge
-			ptsright.append(DiscretizedPoint(wire, end))
-	ptsleft = []
-	if type in ["Left", "Both"]:
-		for i in range(0, intstart + 1, + 1):
-			ptsleft.append(wire.Shape.Vertexes[i].Point)
-		if fracstart > 0:   # if 'start' point has decimal, one should add the intermediate point of 'first' edge
-			ptsleft.append(DiscretizedPoint(wire, start))
-		ptsleft.append(DiscretizedPoint(wire, end))  # next point is 'end' point or the intermediate point of 'last' edge
-		for i in range(intend + 1, len(wire.Shape.Vertexes), + 1):  # first point of the loop is always the following point of 'end' point
-			ptsleft.append(wire.Shape.Vertexes[i].Point)
-	return ptsleft, ptsright
-	
+	left, right = cutPolyline(wireData(wire), start, end, type)
+	return [toVector(p) for p in left], [toVector(p) for p in right]
+
 def intersecLinePlane(A,B, plane):
     """ Return the intersection between a line A,B and a planar face.
     """
@@ -190,8 +238,7 @@ def intersecPerpendicularLine(A, B, C, info=0):
     distance = math.sqrt(V.dot(V))
 #    Tprime = T + V
     if info == 1:
-        msgCsl("Intersection Point at distance of " +
-                    str(distance) + " is : " + format(T))
+        log.debug("Intersection Point at distance of %s is : %s", distance, T)
     return T #, distance, Tprime
 
 def plot_2LinesPoint(edge1, edge2):
@@ -221,7 +268,7 @@ def plot_2LinesPoint(edge1, edge2):
 		Edge_List = [edge1, edge2]
 		Number_of_Edges = len(Edge_List)
 		if msg != 0:        
-			msgCsl("Number_of_Edges=" + str(Number_of_Edges))        
+			log.debug("Number_of_Edges=%s", Number_of_Edges)        
 
 		if Number_of_Edges >= 2:
 			for i in range( Number_of_Edges -1 ):
@@ -230,71 +277,37 @@ def plot_2LinesPoint(edge1, edge2):
 				#msgCsl(str(f1))
 				#msgCsl(str(f2))
 				d = f1.distToShape(f2)
-				msgCsl(str(d))
+				log.trace("%s", d)
 				Distance = d[0]
 				Vector_A = d[1][0][0]
 				#print_point(Vector_A,"Vector_A is : ")
 #				Vector_B = d[1][0][1]
 				if abs(Distance) <= 1.e-14: 
 #					Center_User_Name = plot_point(Vector_A, part, name, str(m_dir))
-					msgCsl(str(Vector_A) + result_msg )
+					log.debug("%s%s", Vector_A, result_msg)
 					return Vector_A
 				else:
 #					Center_User_Name = plot_point(Vector_A, part, name, str(m_dir))
 #					print_point(Vector_A,str(Center_User_Name) + result_msg + " at :")
 #					Center_User_Name = plot_point(Vector_B, part, name, str(m_dir))
 #					print_point(Vector_B,str(Center_User_Name) + result_msg + " at :")
-					msgCsl(" Distance between the points is : " + str(Distance))
+					log.debug(" Distance between the points is : %s", Distance)
 		else:
-			msgCsl(error_msg)
+			log.debug(error_msg)
 
 	except:
-		msgCsl(error_msg)
+		log.debug(error_msg)
+
+def removeLoops(points, closed = False, passes = 10):
+	'''trimLoops of a list of vectors, return the list of vectors and the number of removed loops'''
+	points, removed = trimLoops(numpy.array([(v[0], v[1], v[2]) for v in points], dtype = float).reshape(-1, 3), closed, passes)
+	return [toVector(p) for p in points], removed
 
 def DeleteLoop(wire):
+	'''Remove the loops of a Draft wire, not of a ProfileWire whose Points belong to its profile'''
 	if len(wire.Points) > 3:
-#		start = wire.Points[0]
-		nbpts = len(wire.Points)
-#		end = wire.Points[nbpts - 1]
-		i = 0
-		j = 0
-		test = True
-		beginpts = []
-		endpts = []
-		turn = True
-		while i + 1 < nbpts - j - 2 and test:
-			start = wire.Points[i]
-			beginpts.append(start)
-			end = wire.Points[nbpts - j - 1]
-			endpts.append(end)
-			starti = wire.Points[i + 1]
-			endi = wire.Points[nbpts - j - 2]
-			mid = middle(starti, endi)
-#			msgCsl("start: " + format(start) + " mid: " + format(mid) + " end: " + format(end))
-			midp = intersecPerpendicularLine(start, end, mid)
-#			msgCsl("starti: " + format(starti) + " midp: " + format(midp) + " endi: " + format(endi))
-			startip = intersecPerpendicularLine(start, end, starti)
-#			msgCsl("startip: " + format(startip))
-#			msgCsl("i: " + str(i) + " j: " + str(j))
-			msgCsl(str(PtsToVec(start, midp).dot(PtsToVec(midp, startip))))
-			if PtsToVec(start, midp).dot(PtsToVec(midp, startip)) > 0:
-#				msgCsl(str(plot_2LinesPoint(wire.Shape.Edges[i], wire.Shape.Edges[nbpts - j - 1])))
-				pt = plot_2LinesPoint(wire.Shape.Edges[i], wire.Shape.Edges[nbpts - j - 2])
-				if pt != None:
-					beginpts.append(pt)
-					test = False
-			if turn:
-				turn = False
-				i += 1
-			else:
-				turn = True
-				j += 1
-		if not test:
-			pts = []
-			for pt in beginpts:
-				pts.append(pt)
-			for i in range(len(endpts) - 1, -1, -1):
-				pts.append(endpts[i])
+		pts, removed = removeLoops(wire.Points, wire.Closed)
+		if removed > 0:
 			wire.Points = pts
 
 def getVec(vector):
@@ -308,3 +321,67 @@ def setPointCoord(pointobj, vector):
 	pointobj.X = vector.x
 	pointobj.Y = vector.y
 	pointobj.Z = vector.z
+
+FingerprintSkipped = ["Label", "Label2", "Shape", "ExpressionEngine", "Visibility", "FitError", "CSTFitError"]
+
+def fingerprintUpdate(md5, value):
+	'''Feed a property value to the md5, the geometry lists as arrays'''
+	if isinstance(value, FreeCAD.Vector):
+		md5.update(numpy.array([value.x, value.y, value.z]).tobytes())
+	elif isinstance(value, FreeCAD.Placement):
+		md5.update(numpy.array([value.Base.x, value.Base.y, value.Base.z] + list(value.Rotation.Q)).tobytes())
+	elif isinstance(value, (list, tuple)):
+		if len(value) > 0 and isinstance(value[0], FreeCAD.Vector):
+			md5.update(numpy.array([(v.x, v.y, v.z) for v in value]).tobytes())
+		else:
+			md5.update(str(len(value)).encode())
+			for v in value:
+				fingerprintUpdate(md5, v)
+	elif isinstance(value, numpy.ndarray):
+		md5.update(numpy.ascontiguousarray(value).tobytes())
+	elif hasattr(value, "Name") and hasattr(value, "TypeId"):   # linked document object
+		md5.update(value.Name.encode())
+	else:
+		md5.update(repr(value).encode())
+
+def objectFingerprint(obj, skipped = ()):
+	'''Digest of the properties of a document object, the shape and the skipped ones excepted: two objects
+	of same fingerprint build the same shape'''
+	md5 = hashlib.md5()
+	md5.update(obj.TypeId.encode())
+	for prop in obj.PropertiesList:
+		if prop in FingerprintSkipped or prop in skipped: continue
+		md5.update(prop.encode())
+		fingerprintUpdate(md5, obj.getPropertyByName(prop))
+	return md5.hexdigest()
+
+def fingerprint(*values):
+	'''Digest of values, document objects being replaced by their fingerprint'''
+	md5 = hashlib.md5()
+	for value in values:
+		if hasattr(value, "PropertiesList"):
+			md5.update(objectFingerprint(value).encode())
+		else:
+			fingerprintUpdate(md5, value)
+	return md5.hexdigest()
+
+class DelayedCall:
+	'''Call func once, delay seconds after the last request: requests made meanwhile restart the delay'''
+
+	def __init__(self, func):
+		self.func = func
+		self.timer = None
+
+	def request(self, delay):
+		if self.timer is None:
+			self.timer = QtCore.QTimer()
+			self.timer.setSingleShot(True)
+			self.timer.timeout.connect(self.func)
+		self.timer.start(int(delay * 1000))
+
+	def cancel(self):
+		if self.timer is not None:
+			self.timer.stop()
+
+	def pending(self):
+		return self.timer is not None and self.timer.isActive()
@@ -0,0 +1,205 @@
+'''Indexed airfoil library: the profile files of a directory tree are scanned
+once, in parallel, and their metadata are kept in a compact on-disk index
+(numpy .npz, one array per column) so that queries don't re-parse files.
+No command uses it yet, it is driven from the python console or scripts.'''
+
+import os, sys
+import numpy
+import multiprocessing
+from multiprocessing import Pool, cpu_count
+from WingCore import loadProfile, profileMetadata, hasFreshBinary, writeProfileBinary
+import WingLog
+
+LibraryIndexName = ".wingindex.npz"
+ParallelThreshold = 32   # below this number of files to parse, the scan stays in this process
+TextColumns = ["path", "name"]
+FloatColumns = ["mtime", "thickness", "thicknessPos", "camber", "camberPos", "leRadius"]
+IntColumns = ["size", "points"]
+
+log = WingLog.getLogger("WingLibrary")
+
+def scanProfile(path, writeBinary = False):
+	''' Parse one profile file and return its index row, None if the file can't be read.
+	Files which are not profiles get a row of 0 points, so they aren't parsed again at each scan.
+	The binary sidecar of the file is read when it is up to date, and written if writeBinary.
+	Module level function so that it can be sent to the worker processes. '''
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	try:
+		name, coords = loadProfile(path)
+		meta = profileMetadata(coords)
+		if writeBinary and meta is not None and not hasFreshBinary(path):
+			writeProfileBinary(path, coords, name)
+	except (IOError, OSError, ValueError, UnicodeDecodeError):
+		name, coords, meta = "", [], None
+	if meta is None:
+		coords = []
+		meta = dict((col, float("nan")) for col in FloatColumns)
+	meta.update({"path" : path, "name" : name, "mtime" : stat.st_mtime, "size" : stat.st_size, "points" : len(coords)})
+	return meta
+
+def scanProfileWithBinary(path):
+	return scanProfile(path, True)
+
+def startMethod():
+	'''Start method of the worker processes, without fixing it for the other users of multiprocessing'''
+	try:
+		return multiprocessing.get_start_method(allow_none = True) or multiprocessing.get_all_start_methods()[0]
+	except AttributeError:   # Python 2
+		return "spawn" if sys.platform == "win32" else "fork"
+
+def workerExecutable():
+	try:
+		from multiprocessing.spawn import get_executable
+		path = get_executable()
+	except ImportError:   # Python 2
+		path = sys.executable
+	if isinstance(path, bytes) and not isinstance(path, str):
+		path = path.decode(sys.getfilesystemencoding())
+	return path
+
+def canStartWorkers():
+	''' True if worker processes are forked from this one or run by a Python interpreter.
+	Inside FreeCAD sys.executable is FreeCAD itself: on spawn platforms (Windows, macOS) each worker
+	would start another FreeCAD, unless multiprocessing.set_executable gave it a Python interpreter. '''
+	if startMethod() == "fork":
+		return True
+	name = os.path.basename(workerExecutable() or "").lower()
+	return name.startswith("python") or name.startswith("pypy")
+
+def findProfileFiles(directory, ext = ".dat"):
+	files = []
+	for root, dirs, names in os.walk(directory):
+		for name in names:
+			if name.lower().endswith(ext):
+				files.append(os.path.join(root, name))
+	files.sort()
+	return files
+
+
+class ProfileLibrary:
+	''' Library of the profiles found under a directory.
+	Columns: path, name, mtime, size, points, thickness, thicknessPos, camber, camberPos
+	and leRadius, the last five in percent of the chord. '''
+
+	def __init__(self, directory, indexFile = None):
+		self.directory = os.path.abspath(directory)
+		self.indexFile = indexFile or os.path.join(self.directory, LibraryIndexName)
+		self.columns = self.emptyColumns()
+		self.load()
+
+	def emptyColumns(self):
+		columns = {}
+		for col in TextColumns:
+			columns[col] = numpy.array([], dtype = str)
+		for col in FloatColumns:
+			columns[col] = numpy.array([], dtype = float)
+		for col in IntColumns:
+			columns[col] = numpy.array([], dtype = numpy.int64)
+		return columns
+
+	def __len__(self):
+		return len(self.columns["path"])
+
+	def load(self):
+		if os.path.exists(self.indexFile):
+			try:
+				data = numpy.load(self.indexFile, allow_pickle = False)
+				self.columns = dict((col, data[col]) for col in TextColumns + FloatColumns + IntColumns)
+				data.close()
+			except (IOError, OSError, KeyError, ValueError):
+				log.warning("Profile library index unreadable, it will be rebuilt: %s", self.indexFile)
+				self.columns = self.emptyColumns()
+
+	def save(self):
+		# write in a temporary file first, a killed scan must not leave a broken index
+		tmpfile = self.indexFile + ".tmp.npz"
+		numpy.savez(tmpfile, **self.columns)
+		if os.path.exists(self.indexFile):
+			os.remove(self.indexFile)
+		os.rename(tmpfile, self.indexFile)
+
+	def setRows(self, rows):
+		columns = {}
+		for col in TextColumns:
+			columns[col] = numpy.array([r[col] for r in rows], dtype = str)
+		for col in FloatColumns:
+			columns[col] = numpy.array([r[col] for r in rows], dtype = float)
+		for col in IntColumns:
+			columns[col] = numpy.array([r[col] for r in rows], dtype = numpy.int64)
+		self.columns = columns
+
+	def row(self, i):
+		r = {}
+		for col, values in self.columns.items():
+			r[col] = values[i].item()
+		return r
+
+	def rows(self, indexes = None):
+		if indexes is None:
+			indexes = range(len(self))
+		return [self.row(i) for i in indexes]
+
+	def scan(self, processes = None, save = True, writeBinaries = False):
+		''' Incremental scan: only the new files and the ones whose mtime or size changed are parsed.
+		With writeBinaries, the missing or outdated binary sidecars are written too.
+		Return the number of parsed and removed files. '''
+		known = {}
+		for i, path in enumerate(self.columns["path"]):
+			known[path] = i
+		rows = []
+		todo = []
+		files = findProfileFiles(self.directory)
+		for path in files:
+			stat = os.stat(path)
+			i = known.get(path)
+			uptodate = i is not None and self.columns["mtime"][i] == stat.st_mtime and self.columns["size"][i] == stat.st_size
+			if writeBinaries and uptodate and self.columns["points"][i] > 0:
+				uptodate = hasFreshBinary(path)
+			if uptodate:
+				rows.append(self.row(i))
+			else:
+				todo.append(path)
+		removed = len(set(known).difference(files))
+		for meta in self.parseFiles(todo, processes, writeBinaries):
+			if meta is not None:
+				rows.append(meta)
+		rows.sort(key = lambda r: r["path"])
+		self.setRows(rows)
+		log.info("Profile library %s: %d parsed, %d removed, %d profiles", self.directory, len(todo), removed, len(self))
+		if save and (len(todo) > 0 or removed > 0):
+			self.save()
+		return len(todo), removed
+
+	def parseFiles(self, paths, processes = None, writeBinaries = False):
+		scan = scanProfileWithBinary if writeBinaries else scanProfile
+		if processes == 1 or len(paths) < ParallelThreshold:
+			return [scan(p) for p in paths]
+		if not canStartWorkers():
+			log.info("No Python interpreter to start the workers, profiles parsed in this process")
+			return [scan(p) for p in paths]
+		try:
+			pool = Pool(processes)
+		except (OSError, ValueError, ImportError):
+			return [scan(p) for p in paths]
+		try:
+			return pool.map(scan, paths, max(1, int(len(paths) / (4 * (processes or cpu_count())))))
+		finally:
+			pool.close()
+			pool.join()
+
+	def query(self, name = None, **ranges):
+		''' Return the rows matching all the criteria, e.g. query(thickness = (9, 11), camber = (None, 2)):
+		ranges are (min, max) bounds included, None for no bound, name is a case insensitive substring. '''
+		mask = self.columns["points"] > 0
+		for col, (low, high) in ranges.items():
+			values = self.columns[col]
+			if low is not None:
+				mask &= values >= low
+			if high is not None:
+				mask &= values <= high
+		if name:
+			mask &= numpy.char.find(numpy.char.lower(self.columns["name"]), name.lower()) >= 0
+		return self.rows(numpy.nonzero(mask)[0])
@@ -0,0 +1,172 @@
+'''Level gated logging of the Wing workbench. Each module has its logger, the messages are
+formatted only when they pass the level of the logger or of the ring buffer, so debug and
+trace calls in hot loops cost one comparison when they are off:
+
+	log = WingLog.getLogger("Wing")
+	log.debug("Pt: %s", Pt)                       # formatted only if Debug is on
+	log.trace(lambda: "points: " + str(pts))      # a callable message is called only if Trace is on
+
+Levels are read from the FreeCAD parameters User parameter:BaseApp/Preferences/Mod/Wing/Log:
+Level (default Info), one string per module name to override it (e.g. Wing = Debug, or Off),
+BufferLevel (default Info) and BufferSize (default 2000) of the ring buffer of the recent
+messages, printed by dump() for post-mortem inspection. Without FreeCAD, defaults are used and
+messages go to the standard output.'''
+
+import sys, time, threading
+from collections import deque
+
+try:
+	import FreeCAD
+except ImportError:
+	FreeCAD = None
+
+Trace, Debug, Info, Warning, Error, Off = 5, 10, 20, 30, 40, 100
+LevelNames = {Trace : "Trace", Debug : "Debug", Info : "Info", Warning : "Warning", Error : "Error", Off : "Off"}
+ParamPath = "User parameter:BaseApp/Preferences/Mod/Wing/Log"
+DefaultLevel = Info
+DefaultBufferLevel = Info
+DefaultBufferSize = 2000
+
+lock = threading.Lock()
+loggers = {}
+settings = {"level" : DefaultLevel, "modules" : {}, "bufferLevel" : DefaultBufferLevel}
+buffer = deque(maxlen = DefaultBufferSize)   # (time, logger name, level, message)
+
+def levelValue(level):
+	'''Level number of a level name or number'''
+	if isinstance(level, int):
+		return level
+	for value, name in LevelNames.items():
+		if name.lower() == str(level).strip().lower():
+			return value
+	raise ValueError("Unknown log level: " + str(level))
+
+def consoleWrite(level, text):
+	if FreeCAD is None:
+		sys.stdout.write(text)
+	elif level >= Error:
+		FreeCAD.Console.PrintError(text)
+	elif level >= Warning:
+		FreeCAD.Console.PrintWarning(text)
+	elif level >= Debug:
+		FreeCAD.Console.PrintMessage(text)
+	else:
+		FreeCAD.Console.PrintLog(text)
+
+
+class Logger:
+	'''Logger of a module, threshold is the lowest of its level and of the buffer level'''
+
+	def __init__(self, name):
+		self.name = name
+		self.update()
+
+	def update(self):
+		self.level = settings["modules"].get(self.name, settings["level"])
+		self.threshold = min(self.level, settings["bufferLevel"])
+
+	def isEnabled(self, level):
+		return level >= self.threshold
+
+	def emit(self, level, message, args):
+		if callable(message):
+			text = message()
+		elif args:
+			text = message % args
+		else:
+			text = message
+		if level >= settings["bufferLevel"]:
+			buffer.append((time.time(), self.name, level, text))
+		if level >= self.level:
+			consoleWrite(level, text + "\n")
+
+	def log(self, level, message, *args):
+		if level >= self.threshold: self.emit(level, message, args)
+
+	def trace(self, message, *args):
+		if Trace >= self.threshold: self.emit(Trace, message, args)
+
+	def debug(self, message, *args):
+		if Debug >= self.threshold: self.emit(Debug, message, args)
+
+	def info(self, message, *args):
+		if Info >= self.threshold: self.emit(Info, message, args)
+
+	def warning(self, message, *args):
+		if Warning >= self.threshold: self.emit(Warning, message, args)
+
+	def error(self, message, *args):
+		if Error >= self.threshold: self.emit(Error, message, args)
+
+def paramLevel(params, name, default):
+	try:
+		level = params.GetString(name, default)
+		return levelValue(level) if level else None
+	except ValueError as e:
+		consoleWrite(Warning, str(e) + ", check " + ParamPath + "\n")
+		return levelValue(default) if default else None
+
+def getLogger(name):
+	with lock:
+		if name not in loggers:
+			if FreeCAD is not None and name not in settings["modules"]:
+				level = paramLevel(FreeCAD.ParamGet(ParamPath), name, "")
+				if level is not None: settings["modules"][name] = level
+			loggers[name] = Logger(name)
+		return loggers[name]
+
+def updateLoggers():
+	with lock:
+		for logger in loggers.values():
+			logger.update()
+
+def configure():
+	'''Read the levels and the buffer size from the FreeCAD parameters'''
+	global buffer
+	if FreeCAD is None:
+		return
+	params = FreeCAD.ParamGet(ParamPath)
+	settings["level"] = paramLevel(params, "Level", LevelNames[DefaultLevel])
+	settings["bufferLevel"] = paramLevel(params, "BufferLevel", LevelNames[DefaultBufferLevel])
+	modules = {}
+	for name in loggers:
+		level = paramLevel(params, name, "")
+		if level is not None: modules[name] = level
+	settings["modules"] = modules
+	size = params.GetInt("BufferSize", DefaultBufferSize)
+	if size != buffer.maxlen:
+		buffer = deque(buffer, maxlen = max(1, size))
+	updateLoggers()
+
+def setLevel(level, module = None, save = False):
+	'''Set the level of a module, or the default level of all modules if module is None.
+	Return the previous level. The parameters are changed too if save.'''
+	level = levelValue(level)
+	if module is None:
+		previous = settings["level"]
+		settings["level"] = level
+	else:
+		previous = settings["modules"].get(module, settings["level"])
+		settings["modules"][module] = level
+	if save and FreeCAD is not None:
+		FreeCAD.ParamGet(ParamPath).SetString("Level" if module is None else module, LevelNames.get(level, str(level)))
+	updateLoggers()
+	return previous
+
+def recent(count = None, level = Trace):
+	'''Lines of the last count buffered messages at level or above'''
+	events = [e for e in list(buffer) if e[2] >= level]
+	if count is not None:
+		events = events[-count:]
+	return [time.strftime("%H:%M:%S", time.localtime(t)) + ".%03d" % int((t % 1) * 1000) + " " + LevelNames.get(lv, str(lv)).ljust(7)
+			+ " " + name + ": " + text for t, name, lv, text in events]
+
+def dump(count = 50, level = Trace):
+	'''Print the last buffered messages in the console'''
+	for line in recent(count, level):
+		consoleWrite(Info, line + "\n")
+
+def clear():
+	buffer.clear()
+
+configure()
@@ -0,0 +1,174 @@
+'''Opt-in instrumentation of the Wing workbench hot paths. enable() wraps the onChanged,
+execute, recompute and update* methods of the Wing.py feature proxies and the main
+WingLib functions, disable() puts the originals back, so nothing is left in the call
+paths when tracing is off. Each call records its wall time, nesting depth, object and,
+for onChanged, the property that triggered it:
+
+	import WingTrace
+	WingTrace.enable()
+	FreeCAD.ActiveDocument.recompute()
+	WingTrace.report()
+	WingTrace.exportChromeTrace("/tmp/wing.json")   # open in chrome://tracing or Perfetto
+	WingTrace.disable()
+'''
+
+import os, sys, time, json, threading
+
+from WingCore import userMsg
+
+clock = getattr(time, "perf_counter", time.time)
+
+TracedMethods = ["onChanged", "execute", "recompute"]
+TracedMethodPrefix = "update"
+TracedFunctions = ["getPoints", "getProfileCoords", "resampleProfile", "fitCST", "evalCST", "wireData", "DiscretizedPoint",
+				"discretizedPoints", "cutWire", "cutPolyline", "makeProfileBSpline", "planeCrossings", "offsetPolyline",
+				"segmentCrossings", "trimLoops", "removeLoops", "DeleteLoop", "intersecLinePlane", "objectFingerprint"]
+TracedModules = ["WingCore", "WingLib", "Wing", "WingDialogs"]
+MaxEvents = 200000   # events kept for the trace export, the statistics go on beyond
+
+
+class Tracer:
+	'''Call statistics and events of the traced functions'''
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.local = threading.local()
+		self.clear()
+
+	def clear(self):
+		with self.lock:
+			self.stats = {}   # name: [calls, total, self time, max depth]
+			self.events = []   # (name, start, duration, depth, thread, object, property)
+			self.dropped = 0
+			self.origin = clock()
+
+	def stack(self):
+		if not hasattr(self.local, "stack"):
+			self.local.stack = []   # time spent in the callees of each running call
+		return self.local.stack
+
+	def record(self, name, start, duration, child, depth, obj, prop):
+		key = name if prop is None else name + "[" + prop + "]"
+		with self.lock:
+			st = self.stats.get(key)
+			if st is None:
+				st = self.stats[key] = [0, 0.0, 0.0, 0]
+			st[0] += 1
+			st[1] += duration
+			st[2] += duration - child
+			st[3] = max(st[3], depth)
+			if len(self.events) < MaxEvents:
+				self.events.append((name, start - self.origin, duration, depth, threading.current_thread().ident, obj, prop))
+			else:
+				self.dropped += 1
+
+	def wrap(self, name, func, isMethod):
+		tracer = self
+
+		def traced(*args, **kwargs):
+			stack = tracer.stack()
+			stack.append(0.0)
+			start = clock()
+			try:
+				return func(*args, **kwargs)
+			finally:
+				duration = clock() - start
+				child = stack.pop()
+				if stack: stack[-1] += duration
+				obj = prop = None
+				if isMethod and len(args) > 1:
+					obj = getattr(args[1], "Name", None)
+					if len(args) > 2 and func.__name__ == "onChanged": prop = str(args[2])
+				tracer.record(name, start, duration, child, len(stack), obj, prop)
+		traced.__name__ = func.__name__
+		traced.__doc__ = func.__doc__
+		traced.wingTraced = func
+		return traced
+
+	def sortedStats(self, key = "total"):
+		column = {"calls" : 0, "total" : 1, "self" : 2, "depth" : 3}[key]
+		with self.lock:
+			items = list(self.stats.items())
+		items.sort(key = lambda kv: kv[1][column], reverse = True)
+		return items
+
+tracer = Tracer()
+patched = []   # (owner, attribute name, original)
+
+def tracedMethods(cls):
+	return [name for name, value in cls.__dict__.items() if callable(value)
+			and (name in TracedMethods or name.startswith(TracedMethodPrefix))]
+
+def enable(functions = TracedFunctions, clear = True):
+	'''Wrap the proxy methods of Wing.py and the functions, in all the loaded workbench modules'''
+	if patched: return
+	if clear: tracer.clear()
+	modules = [sys.modules[m] for m in TracedModules if m in sys.modules]
+	for module in modules:
+		if module.__name__ != "Wing": continue
+		for cname, cls in list(vars(module).items()):
+			if isinstance(cls, type) or type(cls).__name__ == "classobj":
+				if getattr(cls, "__module__", None) != module.__name__ or cname.startswith("ViewProvider"): continue
+				for name in tracedMethods(cls):
+					original = cls.__dict__[name]
+					patched.append((cls, name, original))
+					setattr(cls, name, tracer.wrap(cname + "." + name, original, True))
+	# the functions are imported by name in several modules, each binding is wrapped
+	wrappers = {}
+	for name in functions:
+		for module in modules:
+			original = getattr(module, name, None)
+			if original is None or hasattr(original, "wingTraced"): continue
+			if original not in wrappers:
+				wrappers[original] = tracer.wrap(name, original, False)
+			patched.append((module, name, original))
+			setattr(module, name, wrappers[original])
+	userMsg("Wing tracing enabled: " + str(len(patched)) + " functions wrapped")
+
+def disable():
+	'''Put the original methods and functions back'''
+	while patched:
+		owner, name, original = patched.pop()
+		setattr(owner, name, original)
+
+def enabled():
+	return len(patched) > 0
+
+def reportLines(sort = "total", limit = 40):
+	'''Lines of the statistics sorted by total, self, calls or depth, the first limit ones'''
+	items = tracer.sortedStats(sort)
+	lines = ["%-48s %8s %12s %12s %12s %6s" % ("function", "calls", "total ms", "self ms", "mean ms", "depth")]
+	for key, (calls, total, selftime, depth) in items[:limit]:
+		lines.append("%-48s %8d %12.3f %12.3f %12.4f %6d" % (key, calls, total * 1000, selftime * 1000, total * 1000 / calls, depth))
+	if len(items) > limit:
+		lines.append("... " + str(len(items) - limit) + " more")
+	if tracer.dropped:
+		lines.append(str(tracer.dropped) + " events not kept for the trace export")
+	return lines
+
+def report(sort = "total", limit = 40):
+	'''Print the statistics in the FreeCAD console'''
+	for line in reportLines(sort, limit):
+		userMsg(line)
+
+def chromeTrace():
+	'''Events in the Chrome trace event format: complete events, times in microseconds'''
+	pid = os.getpid()
+	events = []
+	with tracer.lock:
+		recorded = list(tracer.events)
+	for name, start, duration, depth, thread, obj, prop in recorded:
+		args = {"depth" : depth}
+		if obj is not None: args["object"] = obj
+		if prop is not None: args["property"] = prop
+		events.append({"name" : name if prop is None else name + " " + prop, "cat" : name.split(".")[0], "ph" : "X",
+					"ts" : start * 1e6, "dur" : duration * 1e6, "pid" : pid, "tid" : thread, "args" : args})
+	return {"traceEvents" : events, "displayTimeUnit" : "ms"}
+
+def exportChromeTrace(filename):
+	afile = open(filename, "w")
+	try:
+		json.dump(chromeTrace(), afile)
+	finally:
+		afile.close()
+	userMsg("Wing trace written to " + filename)